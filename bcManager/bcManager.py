@@ -7,11 +7,11 @@ from redbot.core import checks
 from .BCConfig import BCConfig
 from teamManager import TeamManager
 from match import Match
+from utilities import job_registry
 
 import random
 import string
 import struct
-import asyncio
 import aiohttp
 from typing import List
 
@@ -56,9 +56,15 @@ class BCManager(commands.Cog):
         self.bot = bot
         self.ballchasing_api = {}
         self.rsc_api = {}
-        self.task = asyncio.create_task(self.pre_load_data())
+        self.task = job_registry.start(
+            self.pre_load_data(), "Load Ballchasing API tokens", self.qualified_name
+        )
         self.ffp = {}  # forfeit processing
 
+    def cog_unload(self):
+        """Clean up when cog shuts down."""
+        job_registry.cancel_owner(self.qualified_name)
+
     # region properties
 
     @property
@@ -2077,15 +2083,7 @@ class BCManager(commands.Cog):
         return home_goals, away_goals
 
     async def update_match_report(self, ctx, tier, match, report):
-        schedule = await self.match_cog._schedule(ctx)
-        match_index = self.match_cog.get_match_index_in_day(schedule, tier, match)
-
-        schedule[tier][match["matchDay"]][match_index]["report"] = report
-
-        await self.match_cog._save_schedule(ctx, schedule)
-
-        match["report"] = report
-        return match
+        return await self.match_cog.set_match_report(ctx, tier, match, report)
 
     async def get_match_report_embed(self, ctx, match):
         report = match["report"]
@@ -1,25 +1,33 @@
 import discord
-import csv
-import os
-import asyncio
 import logging
 
 from redbot.core import commands, Config, checks
-from discord import File
 from discord.ext.commands import Context
 from redbot.core.utils.predicates import ReactionPredicate
 from redbot.core.utils.menus import start_adding_reactions
 
 from dmHelper import DMHelper
 from teamManager import TeamManager
+from utilities import BulkRunner, Job, MemberEdit, MemberIndex, job_registry
 
 from bulkRoleManager.embeds import ErrorEmbed
+from bulkRoleManager.export import (
+    EXPORT_FORMATS,
+    ROLE_SET_OPERATIONS,
+    export_file,
+    member_rows,
+    members_for_roles,
+)
 
-from typing import Optional
+from typing import Dict, List, Optional
 
 log = logging.getLogger("red.RSCBot.bulkRoleManager")
 
-defaults = {"DraftEligibleMessage": None, "PermFAMessage": None}
+defaults = {"DraftEligibleMessage": None, "PermFAMessage": None, "RoleJob": None}
+
+# Bulk role job actions
+ROLE_JOB_ADD = "add"
+ROLE_JOB_REMOVE = "remove"
 
 TROPHY_EMOJI = "\U0001f3c6"  # :trophy:
 GOLD_MEDAL_EMOJI = "\U0001f3c5"  # gold medal
@@ -40,6 +48,15 @@ class BulkRoleManager(commands.Cog):
         )
         self.config.register_guild(**defaults)
         self.discord_bot = bot
+        self._role_jobs: Dict[int, Job] = {}
+        self._role_job_runners: Dict[int, BulkRunner] = {}
+        job_registry.start(
+            self._resume_role_jobs(), "Resume bulk role jobs", self.qualified_name
+        )
+
+    def cog_unload(self):
+        """Stop running jobs. Bulk role job cursors are kept so they resume on load."""
+        job_registry.cancel_owner(self.qualified_name)
 
     # properties
 
@@ -94,15 +111,17 @@ class BulkRoleManager(commands.Cog):
         if message:
             messages.append(message)
 
-        await ctx.send(f"Players with **{role.name}** role:\n")
-        c = 0
-        for msg in messages:
-            if c > 5:
-                await ctx.send("Too many users to display... stopping.")
-                break
-
-            await ctx.send(f"```\n{msg}\n```")
-            c += 1
+        # Large roles are uploaded as a single file instead of many messages
+        if len(messages) > 6:
+            rows = member_rows(role.members, self.get_player_nickname)
+            await ctx.send(
+                f"Players with **{role.name}** role:",
+                file=export_file(rows, f"{role.name}_members"),
+            )
+        else:
+            await ctx.send(f"Players with **{role.name}** role:\n")
+            for msg in messages:
+                await ctx.send(f"```\n{msg}\n```")
 
         await ctx.send(
             f":white_check_mark: {count} player(s) have the {role.name} role"
@@ -114,7 +133,7 @@ class BulkRoleManager(commands.Cog):
         """Displays a list of members with all of the roles provided"""
         log.debug(f"Getting all members with: {roles}")
 
-        matches = list(set.intersection(*map(set, [r.members for r in roles])))
+        matches = members_for_roles(ctx.guild, list(roles)) if roles else []
         log.debug(f"Matches: {matches}")
 
         if not matches:
@@ -128,25 +147,15 @@ class BulkRoleManager(commands.Cog):
 
         # Check for character max being exceeded (6000 total in embed or 1024 per field)
         nicks = "\n".join([f"{p.display_name}" for p in matches])
-        usernames = ("\n".join([f"{p.name}#{p.discriminator}" for p in matches]),)
+        usernames = "\n".join([f"{p.name}#{p.discriminator}" for p in matches])
         ids = "\n".join(str(p.id) for p in matches)
 
         if len(nicks) > 1024 or len(usernames) > 1024 or len(ids) > 1024:
-            msg = "\n".join(
-                [f"{p.display_name}:{p.name}#{p.discriminator}:{p.id}" for p in matches]
+            rows = member_rows(matches, self.get_player_nickname)
+            await ctx.send(
+                f"Found {len(matches)} user(s) in total.",
+                file=export_file(rows, "intersecting_role_members"),
             )
-            if len(msg) > 1900:
-                for idx in range(0, len(matches), 30):
-                    matches_chunk = matches[idx : idx + 30]
-                    msg_chunk = "\n".join(
-                        [
-                            f"{p.display_name}:{p.name}#{p.discriminator}:{p.id}"
-                            for p in matches_chunk
-                        ]
-                    )
-                    await ctx.send(f"```\n{msg_chunk}\n```")
-            else:
-                await ctx.send(f"```\n{msg}\n```")
         else:
             embed = discord.Embed(
                 color=discord.Color.blue(),
@@ -202,36 +211,13 @@ class BulkRoleManager(commands.Cog):
             await ctx.send(embed=noUsersEmbed)
             return
 
-        # Essentially a "loading" embed. Adding role to everyone takes time.
-        working_embed = discord.Embed(
-            title="Working",
-            description="Removing role from all users. This can take a bit...",
-            color=discord.Color.yellow(),
-        )
-        msg = await ctx.reply(embed=working_embed)
-
-        # Create embed before role is altered.
-        removedEmbed = discord.Embed(
-            title="Role Removed",
-            description=f"Removed {role.name} from everyone in the server.",
-            color=discord.Color.blue(),
-        )
-        removedEmbed.set_footer(text=f"{len(role.members)} user(s) had role removed.")
-
-        # Remove role from all members.
-        for member in role.members:
-            await member.remove_roles(role)
-
-        await msg.edit(embed=removedEmbed)
+        await self._start_role_job(ctx, ROLE_JOB_REMOVE, role)
 
     @commands.command()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_roles=True)
     async def addRoleToEveryone(self, ctx: Context, role: discord.Role):
         """Add a role to everyone in the server."""
-        added = 0
-        had = 0
-        failed = 0
         if not ctx.guild:
             return
 
@@ -251,49 +237,13 @@ class BulkRoleManager(commands.Cog):
             )
             return
 
-        # Essentially a "loading" embed. Adding role to everyone takes time.
-        working_embed = discord.Embed(
-            title="Working",
-            description="Adding role to all users. This can take a bit...",
-            color=discord.Color.yellow(),
-        )
-        msg = await ctx.reply(embed=working_embed)
-
-        # Loop through all members of guild and add role.
-        for member in ctx.guild.members:
-            try:
-                if role in member.roles:
-                    had += 1
-                else:
-                    await member.add_roles(role)
-                    added += 1
-            except Exception as exc:
-                log.error(
-                    f"Failed to add {role.name} to {member.id}: {type(exc)} {exc}"
-                )
-                failed += 1
-
-        # Edit "loading" message in place with result.
-        role_embed = discord.Embed(
-            title="Role Added",
-            description=f"Added {role.name} to everyone in {ctx.guild.name}",
-            color=discord.Color.blue(),
-        )
-        role_embed.set_footer(
-            text=f"{(added + had)}/{len(ctx.guild.members)} users had role applied. {failed} failure(s)."
-        )
-        await msg.edit(embed=role_embed)
+        await self._start_role_job(ctx, ROLE_JOB_ADD, role)
 
     @commands.command()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_roles=True)
     async def addRole(self, ctx: Context, role: discord.Role, *userList):
         """Adds the role to every member that can be found from the userList"""
-        added = 0
-        had = 0
-        failed = 0
-        not_found_list = []
-        unknown_error_list = []
         if not ctx.guild:
             return
 
@@ -315,32 +265,18 @@ class BulkRoleManager(commands.Cog):
             )
             return
 
-        # Essentially a "loading" embed. Adding role to everyone takes time.
-        working_embed = discord.Embed(
-            title="Working",
-            description="Adding role to users. This can take a bit...",
-            color=discord.Color.yellow(),
+        resolution = MemberIndex(ctx.guild).resolve_all(userList)
+        not_found_list = resolution.not_found
+        had = sum(1 for m in resolution.found if m.get_role(role.id))
+        to_add = [m for m in resolution.found if not m.get_role(role.id)]
+
+        runner = BulkRunner(ctx, f"Adding {role.name}")
+        results = await runner.run(to_add, lambda member: member.add_roles(role))
+        added = sum(1 for r in results if not r.error)
+        unknown_error_list = [r.item.name for r in results if r.error]
+        failed = (
+            len(not_found_list) + len(resolution.ambiguous) + len(unknown_error_list)
         )
-        msg = await ctx.send(embed=working_embed)
-
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-                if member in ctx.guild.members:
-                    if role not in member.roles:
-                        await member.add_roles(role)
-                        added += 1
-                    else:
-                        had += 1
-            except discord.ext.commands.MemberNotFound:
-                not_found_list.append(user)
-                failed += 1
-            except Exception as exc:
-                log.error(
-                    f"Failed to add {role.name} to {member.id}: {type(exc)} {exc}"
-                )
-                unknown_error_list.append(user)
-                failed += 1
 
         # Update embed in place
         role_embed = discord.Embed(
@@ -352,24 +288,26 @@ class BulkRoleManager(commands.Cog):
             role_embed.add_field(
                 name="Not Found", value="\n".join(not_found_list), inline=True
             )
+        if resolution.ambiguous:
+            role_embed.add_field(
+                name="Ambiguous",
+                value="\n".join(resolution.ambiguous_lines()),
+                inline=True,
+            )
         if len(unknown_error_list) > 0:
             role_embed.add_field(
                 name="Error", value="\n".join(unknown_error_list), inline=True
             )
         role_embed.set_footer(
-            text=f"{(added + had)}/{len(ctx.guild.members)} users had role applied. {failed} failure(s)."
+            text=f"{(added + had)}/{len(userList)} users had role applied. {failed} failure(s)."
         )
-        await msg.edit(embed=role_embed)
+        await runner.finish(role_embed)
 
     @commands.command()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_roles=True)
     async def removeRole(self, ctx: Context, role: discord.Role, *userList):
         """Removes the role from every member that can be found from the userList"""
-        empty = True
-        removed = 0
-        notHave = 0
-        notFound = 0
         message = ""
         if not ctx.guild:
             return
@@ -390,21 +328,24 @@ class BulkRoleManager(commands.Cog):
             )
             return
 
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-                if member in ctx.guild.members:
-                    if role in member.roles:
-                        await member.remove_roles(role)
-                        removed += 1
-                    else:
-                        notHave += 1
-                    empty = False
-            except Exception:
-                if notFound == 0:
-                    message += "Couldn't find:\n"
-                message += f"{user}\n"
-                notFound += 1
+        resolution = MemberIndex(ctx.guild).resolve_all(userList)
+        notFound = len(resolution.not_found)
+        if resolution.not_found:
+            message += "Couldn't find:\n"
+            message += "".join(f"{user}\n" for user in resolution.not_found)
+        if resolution.ambiguous:
+            message += "Matched more than one member:\n"
+            message += "".join(f"{line}\n" for line in resolution.ambiguous_lines())
+        empty = not resolution.found
+        notHave = sum(1 for m in resolution.found if not m.get_role(role.id))
+        to_remove = [m for m in resolution.found if m.get_role(role.id)]
+
+        runner = BulkRunner(ctx, f"Removing {role.name}")
+        results = await runner.run(to_remove, lambda member: member.remove_roles(role))
+        await runner.finish()
+        removed = sum(1 for r in results if not r.error)
+        failed = len(results) - removed
+
         if empty:
             message += f":x: Nobody had the {role.name} role removed"
         else:
@@ -415,44 +356,46 @@ class BulkRoleManager(commands.Cog):
             message += f". {notHave} user(s) didn't have the role"
         if removed > 0:
             message += f". {removed} user(s) had the role removed"
+        if failed > 0:
+            message += f". {failed} user(s) could not be updated"
         await ctx.send(message)
 
     @commands.command()
     @commands.guild_only()
     async def getId(self, ctx, *userList):
-        """Gets the id for any user that can be found from the userList"""
+        """Gets the id for any user that can be found from the userList.
+
+        Prints one line per user in the order given (including repeats), so the
+        output can be pasted next to the original list. Users that could not be
+        resolved keep their line with the reason in place of the id.
+        """
+        index = MemberIndex(ctx.guild)
+        resolution = index.resolve_all(userList)
         found = []
-        notFound = []
         for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-                if member in ctx.guild.members:
-                    nickname = self.get_player_nickname(member)
-                    found.append(
-                        f"{nickname}:{member.name}#{member.discriminator}:{member.id}\n"
-                    )
-            except Exception:
-                notFound.append(user)
-                found.append(None)
-
-        # Double Check not found (search by nickname without prefix):
-        for player in ctx.guild.members:
-            player_nick = self.get_player_nickname(player)
-            if player_nick in notFound:
-                while player_nick in notFound:
-                    notFound.remove(player_nick)
-                match_indicies = [i for i, x in enumerate(userList) if x == player_nick]
-                for match in match_indicies:
-                    found[match] = (
-                        f"{player_nick}:{player.name}#{player.discriminator}:{player.id}\n"
-                    )
+            members = index.candidates(user)
+            if len(members) == 1:
+                m = members[0]
+                found.append(
+                    f"{self.get_player_nickname(m)}:{m.name}#{m.discriminator}:{m.id}\n"
+                )
+            elif members:
+                found.append(f"{user}::ambiguous\n")
+            else:
+                found.append(f"{user}::not found\n")
 
-        if notFound:
+        if resolution.not_found:
             notFoundMessage = ":x: Couldn't find:\n"
-            for user in notFound:
+            for user in resolution.not_found:
                 notFoundMessage += f"{user}\n"
             await ctx.send(notFoundMessage)
 
+        if resolution.ambiguous:
+            ambiguousMessage = ":warning: Matched more than one member:\n"
+            for line in resolution.ambiguous_lines():
+                ambiguousMessage += f"{line}\n"
+            await ctx.send(ambiguousMessage)
+
         messages = []
         if found:
             message = ""
@@ -474,10 +417,6 @@ class BulkRoleManager(commands.Cog):
         self, ctx: Context, currentRole: discord.Role, roleToGive: discord.Role
     ):
         """Gives the roleToGive to every member who already has the currentRole"""
-        count = 0
-        hadRoleCount = 0
-        countGiven = 0
-
         if not (ctx.author and isinstance(ctx.author, discord.Member)):
             await ctx.send(
                 embed=ErrorEmbed(
@@ -494,26 +433,147 @@ class BulkRoleManager(commands.Cog):
             )
             return
 
-        for member in currentRole.members:
-            count += 1
-            if roleToGive in member.roles:
-                hadRoleCount += 1
-            else:
-                await member.add_roles(roleToGive)
-                countGiven += 1
-        if count == 0:
-            message = f":x: Nobody has the {currentRole.name} role"
+        if not currentRole.members:
+            await ctx.send(f":x: Nobody has the {currentRole.name} role")
+            return
+
+        await self._start_role_job(
+            ctx, ROLE_JOB_ADD, roleToGive, source_role=currentRole
+        )
+
+    @commands.group(name="roleJob", aliases=["roleJobs"])
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_roles=True)
+    async def _role_job(self, ctx: Context):
+        """View or cancel the running bulk role job"""
+
+    @_role_job.command(name="status")
+    async def _role_job_status(self, ctx: Context):
+        """Show the progress of the bulk role job in this server"""
+        job = await self.config.guild(ctx.guild).RoleJob()
+        if not job:
+            await ctx.send(
+                embed=discord.Embed(
+                    title="Bulk Role Job",
+                    description="No bulk role job is running.",
+                    color=discord.Color.blue(),
+                )
+            )
+            return
+
+        role = ctx.guild.get_role(job["role_id"])
+        embed = discord.Embed(
+            title="Bulk Role Job",
+            description=self._role_job_title(ctx.guild, job),
+            color=discord.Color.yellow(),
+        )
+        runner = self._role_job_runners.get(ctx.guild.id)
+        if runner:
+            progress = f"{runner.done}/{runner.total}"
+            failed = runner.failed
+        else:
+            progress = f"{job['done']} (waiting to resume)"
+            failed = job["failed"]
+        embed.add_field(name="Role", value=role.mention if role else "Deleted")
+        embed.add_field(name="Progress", value=progress)
+        embed.add_field(name="Failures", value=str(failed))
+        author = ctx.guild.get_member(job["author_id"])
+        if author:
+            embed.set_footer(text=f"Started by {author.display_name}")
+        await ctx.send(embed=embed)
+
+    @_role_job.command(name="cancel", aliases=["stop"])
+    async def _role_job_cancel(self, ctx: Context):
+        """Cancel the bulk role job in this server"""
+        runner = self._role_job_runners.get(ctx.guild.id)
+        if runner:
+            runner.cancel()
+        elif await self.config.guild(ctx.guild).RoleJob():
+            await self.config.guild(ctx.guild).RoleJob.clear()
         else:
-            message = (
-                f":white_check_mark: {count} user(s) had the {currentRole.name} role"
+            await ctx.send(embed=ErrorEmbed(description="No bulk role job is running."))
+            return
+        await ctx.send(
+            embed=discord.Embed(
+                title="Bulk Role Job",
+                description="Bulk role job cancelled.",
+                color=discord.Color.orange(),
             )
-            if hadRoleCount > 0:
-                message += (
-                    f". {hadRoleCount} user(s) already had the {roleToGive.name} role"
+        )
+
+    @commands.group(name="jobs", aliases=["botJobs"])
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def _jobs(self, ctx: Context):
+        """View or cancel long-running bot jobs.
+
+        Lists jobs from every cog (e.g. modLink, match, dmHelper), not only bulk
+        role jobs. These commands live in BulkRoleManager, so it must be loaded
+        to manage jobs started by the other cogs.
+        """
+
+    @_jobs.command(name="list", aliases=["status"])
+    async def _jobs_list(self, ctx: Context):
+        """List running jobs and recent job failures for this server, from every cog"""
+        embed = discord.Embed(title="Bot Jobs", color=discord.Color.blue())
+        running = job_registry.running(guild=ctx.guild)
+        if running:
+            lines = []
+            for job in running:
+                line = f"`#{job.id}` **{job.name}** ({job.owner}) - {int(job.elapsed)}s"
+                if job.progress:
+                    line += f" - {job.progress}"
+                lines.append(line)
+            embed.description = "\n".join(lines)[:4096]
+        else:
+            embed.description = "No jobs are running."
+
+        failures = [
+            job
+            for job in job_registry.finished()
+            if job.error and job.guild_id in (None, ctx.guild.id)
+        ]
+        if failures:
+            value = "\n".join(
+                f"`#{job.id}` {job.name}: {type(job.error).__name__}: {job.error}"
+                for job in failures
+            )
+            embed.add_field(name="Recent Failures", value=value[:1024], inline=False)
+        await ctx.send(embed=embed)
+
+    @_jobs.command(name="cancel", aliases=["stop"])
+    async def _jobs_cancel(self, ctx: Context, job_id: int):
+        """Cancel a running job started by any cog"""
+        job = job_registry.get(job_id)
+        if (
+            not job
+            or job.status != "running"
+            or job.guild_id not in (None, ctx.guild.id)
+        ):
+            await ctx.send(
+                embed=ErrorEmbed(description=f"No running job found with id {job_id}.")
+            )
+            return
+        if job.guild_id is None and not await ctx.bot.is_owner(ctx.author):
+            await ctx.send(
+                embed=ErrorEmbed(
+                    description="Only the bot owner can cancel jobs that are not tied to this server."
                 )
-            if countGiven > 0:
-                message += f". {countGiven} user(s) had the {roleToGive.name} role added to them"
-        await ctx.send(message)
+            )
+            return
+        runner = self._role_job_runners.get(ctx.guild.id)
+        if runner and self._role_jobs.get(ctx.guild.id) is job:
+            # Stop bulk role jobs gracefully so they are not resumed on load
+            runner.cancel()
+        else:
+            job.cancel()
+        await ctx.send(
+            embed=discord.Embed(
+                title="Job Cancelled",
+                description=f"Cancelled job `#{job.id}` **{job.name}**.",
+                color=discord.Color.orange(),
+            )
+        )
 
     # endregion
 
@@ -555,22 +615,8 @@ class BulkRoleManager(commands.Cog):
         messages = []
         message = ""
         if spreadsheet:
-            Outputcsv = "./tmp/Ids.csv"
-            header = ["Nickname", "Name", "Id"]
-            csvwrite = open(Outputcsv, "w", newline="", encoding="utf-8")
-            w = csv.writer(csvwrite, delimiter=",")
-            w.writerow(header)
-            for member in role.members:
-                nickname = self.get_player_nickname(member)
-                newrow = [
-                    f"{nickname}",
-                    f"{member.name}#{member.discriminator}",
-                    f"{member.id}",
-                ]
-                w.writerow(newrow)
-            csvwrite.close()
-            await ctx.send("Done", file=File(Outputcsv))
-            os.remove(Outputcsv)
+            rows = member_rows(role.members, self.get_player_nickname)
+            await ctx.send("Done", file=export_file(rows, "Ids"))
         else:
             for member in role.members:
                 nickname = self.get_player_nickname(member)
@@ -585,6 +631,45 @@ class BulkRoleManager(commands.Cog):
             for msg in messages:
                 await ctx.send(f"```{msg}```")
 
+    @commands.command(aliases=["exportRoles"])
+    @commands.guild_only()
+    async def exportRoleMembers(
+        self, ctx, operation: str, file_format: str, *roles: discord.Role
+    ):
+        """Exports the members matching a combination of roles as a CSV or JSON file
+
+        Operations:
+        - intersection: members with all of the roles
+        - union: members with any of the roles
+        - difference: members with the first role but none of the others
+        """
+        operation = operation.lower()
+        file_format = file_format.lower()
+        if operation not in ROLE_SET_OPERATIONS:
+            await ctx.send(
+                embed=ErrorEmbed(
+                    description=f"Operation must be one of: {', '.join(ROLE_SET_OPERATIONS)}"
+                )
+            )
+            return
+        if file_format not in EXPORT_FORMATS:
+            await ctx.send(
+                embed=ErrorEmbed(
+                    description=f"Format must be one of: {', '.join(EXPORT_FORMATS)}"
+                )
+            )
+            return
+        if not roles:
+            await ctx.send(embed=ErrorEmbed(description="No roles were provided."))
+            return
+
+        members = members_for_roles(ctx.guild, list(roles), operation)
+        rows = member_rows(members, self.get_player_nickname)
+        await ctx.send(
+            f"Found {len(members)} user(s) in total.",
+            file=export_file(rows, f"role_{operation}", file_format),
+        )
+
     # endregion
 
     # region Message Configuration
@@ -710,10 +795,7 @@ class BulkRoleManager(commands.Cog):
     @checks.admin_or_permissions(manage_guild=True)
     async def makeDE(self, ctx, *userList):
         """Adds the Draft Eligible and League roles, removes Spectator role, and adds the DE prefix to every member that can be found from the userList"""
-        empty = True
-        added = 0
         had = 0
-        notFound = 0
         deRole = None
         leagueRole = None
         spectatorRole = None
@@ -745,54 +827,64 @@ class BulkRoleManager(commands.Cog):
             )
             return
 
-        for user in userList:
-            try:
-                # Convert to `discord.Member`
-                member = await commands.MemberConverter().convert(ctx, user)
-            except Exception:
-                message += f"Couldn't find: {user}\n"
-                notFound += 1
-                continue
-            if member in ctx.guild.members:
-                if leagueRole in member.roles:
-                    msg = await ctx.send(
-                        f"{member.mention} already has the league role, are you sure you want to make him a DE?"
-                    )
-                    start_adding_reactions(msg, ReactionPredicate.YES_OR_NO_EMOJIS)
-
-                    pred = ReactionPredicate.yes_or_no(msg, ctx.author)
-                    await ctx.bot.wait_for("reaction_add", check=pred)
-                    if pred.result is False:
-                        await ctx.send(f"{member.name} not made DE.")
-                        had += 1
-                        continue
-                    else:
-                        await ctx.send(
-                            f"You will need to manually remove any team or free agent roles if {member.mention} has any."
-                        )
-
-                await member.add_roles(deRole, leagueRole)
-                added += 1
-                await member.edit(nick=f"DE | {self.get_player_nickname(member)}")
-                await member.remove_roles(spectatorRole, formerPlayerRole)
-                deMessage = await self._draft_eligible_message(ctx.guild)
-                if deMessage:
-                    await self._send_member_message(ctx, member, deMessage)
-
-                empty = False
+        members, not_found, ambiguous = MemberIndex(ctx.guild).resolve_all(userList)
+        for user in not_found:
+            message += f"Couldn't find: {user}\n"
+        for user in ambiguous:
+            message += f"Matched more than one member: {user}\n"
+
+        # Confirm league members up front so the edits can run concurrently
+        to_process = []
+        for member in members:
+            if leagueRole in member.roles:
+                msg = await ctx.send(
+                    f"{member.mention} already has the league role, are you sure you want to make him a DE?"
+                )
+                start_adding_reactions(msg, ReactionPredicate.YES_OR_NO_EMOJIS)
 
-        if empty:
+                pred = ReactionPredicate.yes_or_no(msg, ctx.author)
+                await ctx.bot.wait_for("reaction_add", check=pred)
+                if pred.result is False:
+                    await ctx.send(f"{member.name} not made DE.")
+                    had += 1
+                    continue
+                else:
+                    await ctx.send(
+                        f"You will need to manually remove any team or free agent roles if {member.mention} has any."
+                    )
+            to_process.append(member)
+
+        deMessage = await self._draft_eligible_message(ctx.guild)
+
+        async def make_de(member: discord.Member):
+            edit = MemberEdit(member)
+            edit.add_roles(deRole, leagueRole)
+            edit.remove_roles(spectatorRole, formerPlayerRole)
+            edit.set_nick(f"DE | {self.get_player_nickname(member)}")
+            await edit.apply()
+            if deMessage:
+                await self._send_member_message(ctx, member, deMessage)
+
+        runner = BulkRunner(ctx, "Making Draft Eligible")
+        results = await runner.run(to_process, make_de)
+        await runner.finish()
+        added = sum(1 for r in results if not r.error)
+        failed = len(results) - added
+
+        if not added:
             message += ":x: Nobody was given the Draft Eligible role"
         else:
             message += ":white_check_mark: Draft Eligible role given to everyone that was found from list"
-        if notFound > 0:
-            message += f". {notFound} user(s) were not found"
+        if not_found:
+            message += f". {len(not_found)} user(s) were not found"
         if had > 0:
             message += (
                 f". {had} user(s) already had the role or were already in the league"
             )
         if added > 0:
             message += f". {added} user(s) had the role added to them"
+        if failed > 0:
+            message += f". {failed} user(s) could not be updated"
         await ctx.send(message)
 
     @commands.command()
@@ -824,71 +916,75 @@ class BulkRoleManager(commands.Cog):
             )
             return False
 
-        empty = True
-        notFound = 0
-        had = 0
-        added = 0
         message = ""
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-            except Exception:
-                message += f"Couldn't find: {user}\n"
-                notFound += 1
-                continue
-            if member in ctx.guild.members:
-                empty = False
-                tier_changed = True
-                old_tier_role = None
-                if leagueRole in member.roles:
-                    old_tier_role = await self.team_manager.get_current_tier_role(
-                        ctx, member
+        members, not_found, ambiguous = MemberIndex(ctx.guild).resolve_all(userList)
+        for user in not_found:
+            message += f"Couldn't find: {user}\n"
+        for user in ambiguous:
+            message += f"Matched more than one member: {user}\n"
+
+        tiers = await self.team_manager.tiers(ctx)
+        nick_failed = []
+
+        async def make_perm_fa(member: discord.Member) -> bool:
+            """Returns False if the member was already in this tier"""
+            edit = MemberEdit(member)
+            tier_changed = True
+            old_tier_role = None
+            if leagueRole in member.roles:
+                old_tier_role = next((r for r in member.roles if r.name in tiers), None)
+                if old_tier_role and old_tier_role in roles_to_add:
+                    tier_changed = False
+
+            if tier_changed:
+                action = "assigned"
+                if old_tier_role and old_tier_role not in roles_to_add:
+                    old_tier_fa_role = self.team_manager._find_role_by_name(
+                        ctx, f"{old_tier_role.name}FA"
                     )
-                    if old_tier_role in member.roles and old_tier_role in roles_to_add:
-                        tier_changed = False
-                        had += 1
-                        added -= 1  # remove double count of had/added
-
-                if tier_changed:
-                    action = "assigned"
-                    if old_tier_role and old_tier_role not in roles_to_add:
-                        old_tier_fa_role = self.team_manager._find_role_by_name(
-                            ctx, f"{old_tier_role.name}FA"
-                        )
-                        rm_roles = [old_tier_role, old_tier_fa_role]
-                        await member.remove_roles(*rm_roles)
-                        action = "promoted"
-                    tier_change_msg = f"Congrats! Due to your recent ranks you've been {action} to our {tier} tier! You'll only be allowed to play in that tier or any tier above it for the remainder of this season. If you have any questions please let an admin know. \n\nIf you checked in already for the next match day, please use the commands `[p]co` to check out and then `[p]ci` to check in again for your new tier."
-                    await self._send_member_message(ctx, member, tier_change_msg)
-
-                if self.get_player_nickname(member)[:5] != "FA | ":
-                    try:
-                        await member.edit(
-                            nick=f"FA | {self.get_player_nickname(member)}"
-                        )
-                    except (discord.errors.Forbidden, discord.errors.HTTPException):
-                        await ctx.send(f"Cannot set nickname for {member.name}")
-
-                await member.add_roles(*roles_to_add)
-                # permFAMessage = await self._perm_fa_message(ctx)
-                # if permFAMessage:
-                #     await self._send_member_message(ctx, member, permFAMessage)
-                added += 1
-
-        if len([userList]) and not empty:
-            message = f"{len([userList])} members processed...\n{message}"
-        if empty:
+                    edit.remove_roles(old_tier_role, old_tier_fa_role)
+                    action = "promoted"
+                tier_change_msg = f"Congrats! Due to your recent ranks you've been {action} to our {tier} tier! You'll only be allowed to play in that tier or any tier above it for the remainder of this season. If you have any questions please let an admin know. \n\nIf you checked in already for the next match day, please use the commands `[p]co` to check out and then `[p]ci` to check in again for your new tier."
+                await self._send_member_message(ctx, member, tier_change_msg)
+
+            if self.get_player_nickname(member)[:5] != "FA | ":
+                edit.set_nick(f"FA | {self.get_player_nickname(member)}")
+
+            edit.add_roles(*roles_to_add)
+            await edit.apply()
+            if edit.nick_failed:
+                nick_failed.append(member.name)
+            # permFAMessage = await self._perm_fa_message(ctx)
+            # if permFAMessage:
+            #     await self._send_member_message(ctx, member, permFAMessage)
+            return tier_changed
+
+        runner = BulkRunner(ctx, f"Setting {tier} Permanent FAs")
+        results = await runner.run(members, make_perm_fa)
+        await runner.finish()
+        added = sum(1 for r in results if r.value)
+        had = sum(1 for r in results if r.value is False and not r.error)
+        failed = sum(1 for r in results if r.error)
+
+        for name in nick_failed:
+            message += f"Cannot set nickname for {name}\n"
+
+        if members:
+            message = f"{len(userList)} members processed...\n{message}"
+        if not members:
             message += f":x: Nobody was set as a {tier} permanent FA"
         else:
             message += (
                 f":white_check_mark: All members found are now {tier} permanent FAs."
             )
-        if notFound:
-            message += f". {notFound} user(s) were not found"
+        if not_found:
+            message += f". {len(not_found)} user(s) were not found"
         if had:
             message += f". {had} user(s) were already in this tier."
         if added:
             message += f". {added} user(s) had the role added to them"
+        if failed:
+            message += f". {failed} user(s) could not be updated"
         await ctx.send(message)
 
     @commands.command(aliases=["retirePlayer", "retirePlayers", "setFormerPlayer"])
@@ -896,9 +992,6 @@ class BulkRoleManager(commands.Cog):
     @checks.admin_or_permissions(manage_roles=True)
     async def retire(self, ctx, *userList):
         """Removes league roles and adds 'Former Player' role for every member that can be found from the userList"""
-        empty = True
-        retired = 0
-        notFound = 0
         message = ""
         former_player_str = "Former Player"
         former_player_role = self.team_manager._find_role_by_name(
@@ -917,48 +1010,52 @@ class BulkRoleManager(commands.Cog):
             self.team_manager._find_role_by_name(ctx, self.PERM_FA_ROLE),
         ]
         # remove dev league interest role if it exists in the server
-        dev_league_role = self.team_manager._find_role_by_name(ctx, self.PERM_FA_ROLE)
+        dev_league_role = self.team_manager._find_role_by_name(
+            ctx, self.DEV_LEAGUE_ROLE
+        )
         if dev_league_role:
             roles_to_remove.append(dev_league_role)
 
         tiers = await self.team_manager.tiers(ctx)
         for tier in tiers:
-            tier_role = self.team_manager._get_tier_role(ctx, tier)
-            if tier_role:
-                tier_fa_role = self.team_manager._find_role_by_name(ctx, f"{tier}FA")
-            roles_to_remove.append(tier_role)
-            roles_to_remove.append(tier_fa_role)
+            roles_to_remove.append(self.team_manager._get_tier_role(ctx, tier))
+            roles_to_remove.append(
+                self.team_manager._find_role_by_name(ctx, f"{tier}FA")
+            )
 
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-                if member in ctx.guild.members:
-                    roles_to_remove.append(
-                        self.team_manager.get_current_franchise_role(member)
-                    )
-                    removable_roles = []
-                    for role in roles_to_remove:
-                        if role in member.roles:
-                            removable_roles.append(role)
-                    await member.remove_roles(*removable_roles)
-                    await member.add_roles(former_player_role)
-                    await member.edit(
-                        nick=(self.team_manager.get_player_nickname(member))
-                    )
-                    empty = False
-            except Exception:
-                if notFound == 0:
-                    message += "Couldn't find:\n"
-                message += f"{user}\n"
-                notFound += 1
-        if empty:
+        members, not_found, ambiguous = MemberIndex(ctx.guild).resolve_all(userList)
+        if not_found:
+            message += "Couldn't find:\n"
+            message += "".join(f"{user}\n" for user in not_found)
+        if ambiguous:
+            message += "Matched more than one member:\n"
+            message += "".join(f"{user}\n" for user in ambiguous)
+
+        async def retire_member(member: discord.Member):
+            edit = MemberEdit(member)
+            edit.remove_roles(
+                *roles_to_remove, self.team_manager.get_current_franchise_role(member)
+            )
+            edit.add_roles(former_player_role)
+            edit.set_nick(self.team_manager.get_player_nickname(member))
+            await edit.apply()
+
+        runner = BulkRunner(ctx, "Retiring Players")
+        results = await runner.run(members, retire_member)
+        await runner.finish()
+        retired = sum(1 for r in results if not r.error)
+        failed = len(results) - retired
+
+        if not retired:
             message += ":x: Nobody was set as a former player."
         else:
             message += ":white_check_mark: everyone that was found from list is now a former player"
-        if notFound > 0:
-            message += f". {notFound} user(s) were not found"
+        if not_found:
+            message += f". {len(not_found)} user(s) were not found"
         if retired > 0:
             message += f". {retired} user(s) have been set as former players."
+        if failed > 0:
+            message += f". {failed} user(s) could not be updated"
         await ctx.send(message)
 
     @commands.command(aliases=["updateTierForPlayers"])
@@ -966,10 +1063,15 @@ class BulkRoleManager(commands.Cog):
     @checks.admin_or_permissions(manage_guild=True)
     async def updateTier(self, ctx, tier: discord.Role, *userList):
         """Re-assigns every guild member to the provided tier"""
+        job = job_registry.start(
+            self.update_tiers(ctx, tier, userList),
+            f"Update {tier.name} tier for {len(userList)} user(s)",
+            self.qualified_name,
+            guild=ctx.guild,
+        )
         await ctx.send(
-            f"Processing tier update for {len(userList)} users. This may take some time."
+            f"Processing tier update for {len(userList)} users. This may take some time. (Job #{job.id})"
         )
-        asyncio.create_task(self.update_tiers(ctx, tier, userList))
 
     # endregion
 
@@ -989,10 +1091,138 @@ class BulkRoleManager(commands.Cog):
                 return True
         return False
 
+    async def _start_role_job(
+        self,
+        ctx: Context,
+        action: str,
+        role: discord.Role,
+        source_role: Optional[discord.Role] = None,
+    ):
+        """Persist a bulk role job and run it in the background"""
+        if (
+            ctx.guild.id in self._role_jobs
+            or await self.config.guild(ctx.guild).RoleJob()
+        ):
+            await ctx.send(
+                embed=ErrorEmbed(
+                    description=f"A bulk role job is already running. Use `{ctx.prefix}roleJob status` to view it or `{ctx.prefix}roleJob cancel` to stop it."
+                )
+            )
+            return
+
+        job = {
+            "action": action,
+            "role_id": role.id,
+            "source_role_id": source_role.id if source_role else None,
+            "channel_id": ctx.channel.id,
+            "author_id": ctx.author.id,
+            "cursor": 0,
+            "done": 0,
+            "failed": 0,
+        }
+        await self.config.guild(ctx.guild).RoleJob.set(job)
+        self._launch_role_job(ctx.guild, job)
+
+    def _launch_role_job(self, guild: discord.Guild, job: dict):
+        tracked = job_registry.start(
+            self._run_role_job(guild, job),
+            self._role_job_title(guild, job),
+            self.qualified_name,
+            guild=guild,
+        )
+        self._role_jobs[guild.id] = tracked
+        tracked.task.add_done_callback(lambda _: self._role_jobs.pop(guild.id, None))
+
+    async def _resume_role_jobs(self):
+        await self.discord_bot.wait_until_ready()
+        for guild_id, data in (await self.config.all_guilds()).items():
+            guild = self.discord_bot.get_guild(guild_id)
+            job = data.get("RoleJob")
+            if guild and job and guild.id not in self._role_jobs:
+                log.info(f"Resuming bulk role job in {guild.name}")
+                self._launch_role_job(guild, job)
+
+    def _role_job_title(self, guild: discord.Guild, job: dict) -> str:
+        role = guild.get_role(job["role_id"])
+        role_name = role.name if role else "deleted role"
+        if job["action"] == ROLE_JOB_REMOVE:
+            return f"Removing {role_name} from all members"
+        source_role = guild.get_role(job["source_role_id"] or 0)
+        if source_role:
+            return f"Adding {role_name} to members with {source_role.name}"
+        return f"Adding {role_name} to all members"
+
+    def _role_job_targets(
+        self,
+        guild: discord.Guild,
+        job: dict,
+        role: discord.Role,
+        source_role: Optional[discord.Role],
+    ) -> List[discord.Member]:
+        """Members past the job cursor that still need the change, in id order"""
+        if job["action"] == ROLE_JOB_REMOVE:
+            members = role.members
+        else:
+            pool = source_role.members if source_role else guild.members
+            members = [m for m in pool if not m.get_role(role.id)]
+        return sorted((m for m in members if m.id > job["cursor"]), key=lambda m: m.id)
+
+    async def _run_role_job(self, guild: discord.Guild, job: dict):
+        role = guild.get_role(job["role_id"])
+        source_role = guild.get_role(job["source_role_id"] or 0)
+        channel = guild.get_channel(job["channel_id"])
+        if not role or not channel or (job["source_role_id"] and not source_role):
+            log.warning(
+                f"Dropping bulk role job in {guild.name}. Role or channel missing."
+            )
+            await self.config.guild(guild).RoleJob.clear()
+            return
+
+        title = self._role_job_title(guild, job)
+        targets = self._role_job_targets(guild, job, role, source_role)
+        runner = BulkRunner(channel, title)
+        self._role_job_runners[guild.id] = runner
+
+        async def apply(member: discord.Member):
+            if job["action"] == ROLE_JOB_REMOVE:
+                await member.remove_roles(role, reason=title)
+            else:
+                await member.add_roles(role, reason=title)
+
+        async def checkpoint(chunk: List[discord.Member]):
+            job["cursor"] = chunk[-1].id
+            job["done"] = runner.done
+            job["failed"] = runner.failed
+            await self.config.guild(guild).RoleJob.set(job)
+
+        try:
+            await runner.run(
+                targets,
+                apply,
+                checkpoint=checkpoint,
+                already_done=job["done"],
+                already_failed=job["failed"],
+            )
+        finally:
+            self._role_job_runners.pop(guild.id, None)
+
+        # Only reached when the job finished or was cancelled by command
+        await self.config.guild(guild).RoleJob.clear()
+        if job["action"] == ROLE_JOB_REMOVE:
+            result_title = "Role Removed"
+        else:
+            result_title = "Role Added"
+        result_embed = discord.Embed(
+            title=f"{result_title} (Cancelled)" if runner.cancelled else result_title,
+            description=title,
+            color=discord.Color.orange() if runner.cancelled else discord.Color.blue(),
+        )
+        result_embed.set_footer(
+            text=f"{runner.done - runner.failed}/{runner.total} user(s) updated. {runner.failed} failure(s)."
+        )
+        await runner.finish(result_embed)
+
     async def update_tiers(self, ctx, tier_assignment, userList):
-        empty = True
-        updated = 0
-        notFound = 0
         message = ""
         fa_role = self.team_manager._find_role_by_name(ctx, "Free Agent")
 
@@ -1017,44 +1247,40 @@ class BulkRoleManager(commands.Cog):
         roles_to_remove.remove(tier_assignment)
         roles_to_remove.remove(tier_assign_fa_role)
 
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-
-                # For each user in guild
-                if member in ctx.guild.members:
-                    # prep roles to remove
-                    removable_roles = []
-                    for role in roles_to_remove:
-                        if role in member.roles:
-                            removable_roles.append(role)
-
-                    # prep roles to add
-                    add_roles = [tier_assignment]
-                    if fa_role in member.roles:
-                        add_roles.append(tier_assign_fa_role)
-
-                    # performs role updates
-                    await member.remove_roles(*removable_roles)
-                    await member.add_roles(*add_roles)
-
-                    empty = False
-            except Exception as e:
-                await ctx.send(f"Error: {e}")
-                if notFound == 0:
-                    message += "Couldn't find:\n"
-                message += f"{user}\n"
-                notFound += 1
-        if empty:
+        members, not_found, ambiguous = MemberIndex(ctx.guild).resolve_all(userList)
+        if not_found:
+            message += "Couldn't find:\n"
+            message += "".join(f"{user}\n" for user in not_found)
+        if ambiguous:
+            message += "Matched more than one member:\n"
+            message += "".join(f"{user}\n" for user in ambiguous)
+
+        async def update_tier(member: discord.Member):
+            edit = MemberEdit(member)
+            edit.remove_roles(*roles_to_remove)
+            edit.add_roles(tier_assignment)
+            if fa_role in member.roles:
+                edit.add_roles(tier_assign_fa_role)
+            await edit.apply()
+
+        runner = BulkRunner(ctx, f"Updating {tier_assignment.name} Tier")
+        results = await runner.run(members, update_tier)
+        await runner.finish()
+        updated = sum(1 for r in results if not r.error)
+        failed = len(results) - updated
+
+        if not updated:
             message += (
                 f":x: Nobody was assigned to the **{tier_assignment.name}** tier."
             )
         else:
             message += f":white_check_mark: everyone that was found from list is now registered to the **{tier_assignment.name}** tier."
-        if notFound > 0:
-            message += f". {notFound} user(s) were not found"
+        if not_found:
+            message += f". {len(not_found)} user(s) were not found"
         if updated > 0:
             message += f". {updated} user(s) have been assigned to the **{tier_assignment.name}** tier."
+        if failed > 0:
+            message += f". {failed} user(s) could not be updated"
         await ctx.send(message)
 
     def get_player_nickname(self, user: discord.Member):
@@ -0,0 +1,60 @@
+import csv
+import discord
+import io
+import json
+
+from typing import Callable, Iterable, List
+
+EXPORT_FORMATS = ("csv", "json")
+ROLE_SET_OPERATIONS = ("intersection", "union", "difference")
+EXPORT_FIELDS = ["Nickname", "Name", "Id"]
+
+
+def members_for_roles(
+    guild: discord.Guild, roles: List[discord.Role], operation: str = "intersection"
+) -> List[discord.Member]:
+    """Combine role memberships in a single pass over the guild members.
+
+    `difference` returns members of the first role without any of the others.
+    """
+    role_ids = [role.id for role in roles]
+    first, others = role_ids[0], role_ids[1:]
+    members = []
+    for member in guild.members:
+        if operation == "union":
+            matched = any(member.get_role(r) for r in role_ids)
+        elif operation == "difference":
+            matched = bool(member.get_role(first)) and not any(
+                member.get_role(r) for r in others
+            )
+        else:
+            matched = all(member.get_role(r) for r in role_ids)
+        if matched:
+            members.append(member)
+    return members
+
+
+def member_rows(
+    members: Iterable[discord.Member], nickname: Callable[[discord.Member], str]
+) -> List[dict]:
+    return [
+        {
+            "Nickname": nickname(member),
+            "Name": f"{member.name}#{member.discriminator}",
+            "Id": str(member.id),
+        }
+        for member in members
+    ]
+
+
+def export_file(rows: List[dict], filename: str, fmt: str = "csv") -> discord.File:
+    """Serialize rows to an in-memory CSV/JSON attachment"""
+    buffer = io.StringIO()
+    if fmt == "json":
+        json.dump(rows, buffer, indent=2, ensure_ascii=False)
+    else:
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    data = io.BytesIO(buffer.getvalue().encode("utf-8"))
+    return discord.File(data, filename=f"{filename}.{fmt}")
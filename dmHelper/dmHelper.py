@@ -1,16 +1,31 @@
 import discord
 from redbot.core import commands, Config, checks
+from redbot.core.data_manager import cog_data_path
 
 import asyncio
+import itertools
 import logging
+import time
+
+from utilities import job_registry, mutual_guild_cache
+
+from .store import DMStore, load_embed
 
 log: logging.Logger = logging.getLogger("red.RSCBot.dmHelper")
 
+# Pacing between DMs adapts to rate limits: it starts at dm_sleep_time, backs
+# off when a send is held up by a rate limit and recovers after quick sends.
 dm_sleep_time = 0.5
+dm_min_sleep_time = 0.05
+dm_max_sleep_time = 10.0
+# A send slower than this was held back by discord.py's rate limiter
+dm_rate_limited_time = 1.0
 verify_timeout = 30
 
+PRIORITY_DM = 0
+NORMAL_DM = 1
+
 # role for "Needs to DM Bot"
-global_defaults = {"FailedUserMessages": {}}
 guild_defaults = {
     "DMNotifyChannel": None,
     "DMNotifyRole": None,
@@ -20,7 +35,6 @@ guild_defaults = {
 DONE = "Done"
 
 # TODO: Changes/additions
-# Send previously failed messages
 # Sync roles on server join
 
 
@@ -31,17 +45,28 @@ class DMHelper(commands.Cog):
         self.config = Config.get_conf(
             self, identifier=1234567895, force_registration=True
         )
-        self.config.register_global(**global_defaults)
         self.config.register_guild(**guild_defaults)
 
         self.bot = bot
-        self.message_queue: list = []
-        self.priority_message_queue: list = []
-        self.errored_message_queue: list = []  # used to store DMs that were unable to be delivered
-        self.actively_sending = False
+        self.dm_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.dm_sleep_time = dm_sleep_time
+        self._dm_order = itertools.count()
+        self.store = DMStore(cog_data_path(self) / "dm_queue.db")
+        self.failed_dm_users: set[int] = set()
+        # Cached "Needs to DM Bot" role id per guild, and every user holding one
+        self.needs_dm_roles: dict[int, int | None] = {}
+        self.locked_users: set[int] = set()
+        self.locked_users_loaded = False
         self.auto_assign_dmbr = {}
         asyncio.create_task(self._pre_load_data())
-        # self.task = asyncio.create_task(self.process_dm_queues())  # TODO: protect queue from bot crashes -- json?
+        self.dispatcher = job_registry.start(
+            self._dispatch_dms(), "Send queued DMs", self.qualified_name
+        )
+
+    def cog_unload(self):
+        """Stop sending; queued DMs stay journaled for the next load"""
+        job_registry.cancel_owner(self.qualified_name)
+        asyncio.create_task(self.store.close())
 
     # region Admin config commands
     # CHANNEL
@@ -144,12 +169,68 @@ class DMHelper(commands.Cog):
         self.auto_assign_dmbr = {}
         for guild in self.bot.guilds:
             self.auto_assign_dmbr[guild] = await self._get_auto_assign_dmbr(guild)
+            self.needs_dm_roles[guild.id] = await self.config.guild(
+                guild
+            ).DMNotifyRole()
+        self._rebuild_locked_users()
+        await self._restore_dm_queue()
+
+    def _rebuild_locked_users(self):
+        """Collect every member holding a "Needs to DM Bot" role"""
+        self.locked_users = set()
+        for guild in self.bot.guilds:
+            role = guild.get_role(self.needs_dm_roles.get(guild.id) or 0)
+            if role:
+                self.locked_users.update(m.id for m in role.members)
+        self.locked_users_loaded = True
+
+    def _refresh_locked_user(self, user_id: int):
+        """Re-check one user after they lost the role in some guild"""
+        for guild_id, role_id in self.needs_dm_roles.items():
+            guild = self.bot.get_guild(guild_id)
+            member = guild.get_member(user_id) if guild and role_id else None
+            if member and member.get_role(role_id):
+                self.locked_users.add(user_id)
+                return
+        self.locked_users.discard(user_id)
+
+    async def _restore_dm_queue(self):
+        """Requeue DMs journaled before the last shutdown"""
+        self.failed_dm_users = set(await self.store.failed_user_ids())
+        pending = await self.store.pending()
+        for row in pending:
+            guild = self.bot.get_guild(row["guild_id"]) if row["guild_id"] else None
+            recipient = guild.get_member(row["user_id"]) if guild else None
+            if not recipient:
+                try:
+                    recipient = await self.bot.fetch_user(row["user_id"])
+                except discord.HTTPException:
+                    await self.store.failed(row["id"])
+                    self.failed_dm_users.add(row["user_id"])
+                    continue
+            embed = load_embed(row)
+            self._put_dm(
+                {
+                    "send_to": recipient,
+                    "content": row["content"],
+                    "embed": discord.Embed.from_dict(embed) if embed else None,
+                    "request_ctx": None,
+                    "guild": guild,
+                    "priority": row["priority"] == PRIORITY_DM,
+                    "queue_id": row["id"],
+                    "receipt": asyncio.get_running_loop().create_future(),
+                }
+            )
+        if pending:
+            log.info(f"Restored {len(pending)} queued DM(s).")
 
     # endregion
 
     # region Listeners
     @commands.Cog.listener("on_member_join")
     async def on_member_join(self, member: discord.Member):
+        mutual_guild_cache.invalidate(member.id)
+
         # ignore bots
         if member.bot:
             return
@@ -162,6 +243,28 @@ class DMHelper(commands.Cog):
         if dm_bot_role:
             await member.add_roles(dm_bot_role)
 
+    @commands.Cog.listener("on_member_remove")
+    async def on_member_remove(self, member: discord.Member):
+        mutual_guild_cache.invalidate(member.id)
+        if member.id in self.locked_users:
+            self._refresh_locked_user(member.id)
+
+    @commands.Cog.listener("on_member_update")
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        role_id = self.needs_dm_roles.get(after.guild.id)
+        if not role_id:
+            return
+        had_role = before.get_role(role_id)
+        has_role = after.get_role(role_id)
+        if has_role and not had_role:
+            self.locked_users.add(after.id)
+        elif had_role and not has_role:
+            self._refresh_locked_user(after.id)
+
+    @commands.Cog.listener("on_guild_join")
+    async def on_guild_join(self, guild: discord.Guild):
+        mutual_guild_cache.invalidate()
+
     @commands.Cog.listener("on_message_without_command")
     async def _message_listener(self, message: discord.Message):
         # ignore non-dms
@@ -179,9 +282,29 @@ class DMHelper(commands.Cog):
     # region Helper functions - open to external cogs
     async def add_message_players_to_dm_queue(
         self, members: list, content: str, ctx=None
-    ):
-        for member in members:
-            await self.add_to_dm_queue(member, content=content, ctx=ctx)
+    ) -> list[asyncio.Future]:
+        """Queue the same DM for every member, journaling them in one commit"""
+        batch = [self._dm_data(member, content=content, ctx=ctx) for member in members]
+        try:
+            queue_ids = await self.store.enqueue_many(
+                NORMAL_DM,
+                [
+                    (
+                        msg_data["send_to"].id,
+                        msg_data["guild"].id if msg_data["guild"] else None,
+                        content,
+                        None,
+                    )
+                    for msg_data in batch
+                ],
+            )
+        except Exception as exc:
+            log.error(f"Unable to journal {len(batch)} DMs: {type(exc)} {exc}")
+            queue_ids = [None] * len(batch)
+        for msg_data, queue_id in zip(batch, queue_ids):
+            msg_data["queue_id"] = queue_id
+            self._put_dm(msg_data)
+        return [msg_data["receipt"] for msg_data in batch]
 
     async def add_to_dm_queue(
         self,
@@ -190,105 +313,155 @@ class DMHelper(commands.Cog):
         embed: discord.Embed | None = None,
         ctx: commands.Context | None = None,
         priority: bool = False,
-    ):
+    ) -> asyncio.Future:
+        """Queue a DM and return right away.
+
+        The returned future resolves to whether the DM was delivered, for
+        callers that want to wait for it.
+        """
+        msg_data = self._dm_data(member, content, embed, ctx, priority)
+        guild = msg_data["guild"]
+        # Journal the DM first so it survives a restart before it is sent
+        try:
+            msg_data["queue_id"] = await self.store.enqueue(
+                PRIORITY_DM if priority else NORMAL_DM,
+                member.id,
+                guild.id if guild else None,
+                content,
+                embed.to_dict() if embed else None,
+            )
+        except Exception as exc:
+            log.error(f"Unable to journal DM to {member.id}: {type(exc)} {exc}")
+        self._put_dm(msg_data)
+        return msg_data["receipt"]
+
+    def _dm_data(
+        self,
+        member: discord.Member,
+        content: str | None = None,
+        embed: discord.Embed | None = None,
+        ctx: commands.Context | None = None,
+        priority: bool = False,
+    ) -> dict:
         # Message Data:
-        msg_data = {
+        return {
             "send_to": member,
             "content": content,
             "embed": embed,
             "request_ctx": ctx,
+            "guild": ctx.guild if ctx else getattr(member, "guild", None),
+            "priority": priority,
+            "queue_id": None,
+            "receipt": asyncio.get_running_loop().create_future(),
         }
-        if priority:
-            self.priority_message_queue.append(msg_data)
-        else:
-            self.message_queue.append(msg_data)
 
-        if not self.actively_sending:
-            self.actively_sending = True
-            await self._process_dm_queues()
+    def _put_dm(self, msg_data: dict):
+        order = PRIORITY_DM if msg_data["priority"] else NORMAL_DM
+        self.dm_queue.put_nowait((order, next(self._dm_order), msg_data))
 
     # region Automated Processes
-    async def _process_dm_queues(self) -> None:
-        # Message Data:
-        # {
-        #   send_to: <member>,
-        #   content: <string>,
-        #   embed: <embed | None>,
-        #   request_ctx: ctx
-        #   priority: <bool>
-        # }
+    async def _dispatch_dms(self) -> None:
+        """Background worker that sends queued DMs one at a time"""
         failed_msg_buffer = []
-        while self.priority_message_queue or self.message_queue:
-            # Grab next message
-            if self.priority_message_queue:
-                message_data = self.priority_message_queue.pop(0)
-            elif self.message_queue:
-                message_data = self.message_queue.pop(0)
-
-            # Grabs next message
+        while True:
+            _, _, message_data = await self.dm_queue.get()
             try:
-                recipient: discord.User = message_data[
-                    "send_to"
-                ]  # TODO: is there any way to strongly type as member and user (union)?
-                content: str = message_data.get("content", None)
-                embed: discord.Embed = message_data.get("embed", None)
-                req_ctx: commands.Context = message_data.get("request_ctx")
-            except Exception as e:
-                message_data["exception"] = e
-                log.debug(
-                    f"Parsing message data failed due to an exception. Message Data: {message_data}"
-                )
+                sent = await self._send_dm(message_data)
+            except Exception as exc:
+                log.exception(f"Unexpected error sending DM: {exc}")
+                sent = False
+            finally:
+                self.dm_queue.task_done()
+
+            if sent is None:
+                continue  # requeued after a rate limit
+            await self._record_dm_result(message_data, sent)
+            if not message_data["receipt"].done():
+                message_data["receipt"].set_result(sent)
+            if not sent and message_data.get("request_ctx"):
                 failed_msg_buffer.append(message_data)
-                req_ctx: commands.Context = message_data.get("request_ctx")
-                if req_ctx:
-                    await req_ctx.reply(
-                        f"Direct Message to {recipient.mention} has failed."
-                    )
 
-            # Sends next message
-            if content or embed:
+            # Report failures once the queue has drained
+            if failed_msg_buffer and self.dm_queue.empty():
                 try:
-                    await recipient.send(content=content, embed=embed)
-                    log.debug(f"DM sent to {recipient.name}#{recipient.discriminator}")
-                    # TODO: add code to remove needs DM role if member has it
-                    try:
-                        guild: discord.Guild = message_data.get("request_ctx").guild
-                        dm_bot_role = await self._get_needs_to_dm_role(guild)
-                        member: discord.Member = guild.get_member(recipient.id)
-                        if dm_bot_role in member.roles:
-                            await member.remove_roles(dm_bot_role)
-                    except Exception:
-                        pass
-                except Exception as e:
-                    message_data["exception"] = e
-                    failed_msg_buffer.append(message_data)
-                    log.debug(
-                        f'DM to recipient "{recipient.name}{recipient.discriminator}" failed due to Exception: {e}'
-                    )
+                    await self._send_failed_msg_report(failed_msg_buffer)
+                except discord.HTTPException as exc:
+                    log.warning(f"Unable to send failed DM report: {exc}")
+                failed_msg_buffer = []
 
-                    # add needs to dm bot where applicable
-                    for guild in recipient.mutual_guilds:
-                        guild: discord.Guild
-                        # 1. apply the "needs to dm bot role"
-                        needs_dm_role: discord.Role = await self._get_needs_to_dm_role(
-                            guild
-                        )
+            await asyncio.sleep(self.dm_sleep_time)
 
-                        if needs_dm_role:
-                            recipient_as_member: discord.Member = guild.get_member(
-                                recipient.id
-                            )
-                            await recipient_as_member.add_roles(needs_dm_role)
+    async def _send_dm(self, message_data: dict) -> bool | None:
+        """Send one queued DM, returning whether it was delivered (None if requeued)"""
+        recipient: discord.Member = message_data["send_to"]
+        content: str | None = message_data.get("content")
+        embed: discord.Embed | None = message_data.get("embed")
+        if not content and not embed:
+            return False
 
-                        # 3. Move DM to a "long queue" waiting for DM
-                        # self.errored_message_queue.append(message_data) # INSTEAD:
-                        # TODO: await self._save_failed_message(member, content, embed)
+        try:
+            started = time.monotonic()
+            await recipient.send(content=content, embed=embed)
+            self._adapt_pacing(time.monotonic() - started)
+        except discord.RateLimited as exc:
+            # Held back longer than discord.py is willing to wait: slow down and retry
+            self._adapt_pacing(exc.retry_after)
+            await asyncio.sleep(exc.retry_after)
+            self._put_dm(message_data)
+            return None
+        except Exception as e:
+            message_data["exception"] = e
+            log.debug(
+                f'DM to recipient "{recipient.name}{recipient.discriminator}" failed due to Exception: {e}'
+            )
 
-            await asyncio.sleep(dm_sleep_time)
+            # add needs to dm bot where applicable
+            for guild in mutual_guild_cache.guilds(self.bot, recipient.id):
+                guild: discord.Guild
+                # 1. apply the "needs to dm bot role"
+                needs_dm_role: discord.Role = await self._get_needs_to_dm_role(guild)
 
-        self.actively_sending = False
-        if failed_msg_buffer:
-            await self._send_failed_msg_report(failed_msg_buffer)
+                if needs_dm_role:
+                    recipient_as_member: discord.Member = guild.get_member(recipient.id)
+                    await recipient_as_member.add_roles(needs_dm_role)
+
+            # 2. The DM is kept and replayed once the member unlocks DMs
+            return False
+
+        log.debug(f"DM sent to {recipient.name}#{recipient.discriminator}")
+        # Remove needs DM role if member has it
+        try:
+            guild: discord.Guild = message_data["guild"]
+            dm_bot_role = await self._get_needs_to_dm_role(guild)
+            member: discord.Member = guild.get_member(recipient.id)
+            if dm_bot_role in member.roles:
+                await member.remove_roles(dm_bot_role)
+        except Exception:
+            pass
+        return True
+
+    async def _record_dm_result(self, message_data: dict, sent: bool):
+        """Clear a DM from the journal, or keep it for replay if it failed"""
+        queue_id = message_data.get("queue_id")
+        if not queue_id:
+            return
+        try:
+            if sent:
+                await self.store.delivered(queue_id)
+            elif message_data.get("content") or message_data.get("embed"):
+                await self.store.failed(queue_id)
+                self.failed_dm_users.add(message_data["send_to"].id)
+            else:
+                await self.store.delivered(queue_id)
+        except Exception as exc:
+            log.error(f"Unable to update DM journal: {type(exc)} {exc}")
+
+    def _adapt_pacing(self, send_time: float):
+        """Back off after rate limited sends, speed up again after quick ones"""
+        if send_time >= dm_rate_limited_time:
+            self.dm_sleep_time = min(self.dm_sleep_time * 2, dm_max_sleep_time)
+        else:
+            self.dm_sleep_time = max(self.dm_sleep_time * 0.8, dm_min_sleep_time)
 
     async def _send_failed_msg_report(self, failed_msg_buffer: list[dict]) -> None:
         # organize reports based on shared channel, ping sender - Feedback
@@ -356,42 +529,52 @@ class DMHelper(commands.Cog):
     async def _process_dms_unlocked(self, dm: discord.Message):
         user: discord.User = dm.author
 
+        # Most DMs come from users who were never locked
+        if (
+            self.locked_users_loaded
+            and user.id not in self.locked_users
+            and user.id not in self.failed_dm_users
+        ):
+            return None
+
         # Remove role from mutual servers where applicable
         was_locked = False
-        for guild in user.mutual_guilds:
+        for guild in mutual_guild_cache.guilds(self.bot, user.id):
             needs_to_dm_bot_role: discord.Role = await self._get_needs_to_dm_role(guild)
             if not needs_to_dm_bot_role:
                 continue
             member: discord.Member = guild.get_member(user.id)
-            if needs_to_dm_bot_role in member.roles:
+            if member.get_role(needs_to_dm_bot_role.id):
                 await member.remove_roles(needs_to_dm_bot_role)
                 was_locked = True
 
-        if not was_locked:
-            return None
+        if was_locked:
+            unlock_msg = (
+                f"Hi {member.name}. Thanks for sending us a DM! The bot can now send you DMs! "
+                "If you run into any further issues, please open a ModMail!"
+            )
+            await self.add_to_dm_queue(member, content=unlock_msg, priority=True)
 
         # Sends old failed messages
-        unlock_msg = (
-            f"Hi {member.name}. Thanks for sending us a DM! The bot can now send you DMs! "
-            "If you run into any further issues, please open a ModMail!"
-        )
-        await self.add_to_dm_queue(member, content=unlock_msg)
+        if user.id in self.failed_dm_users:
+            await self._replay_failed_dms(user)
 
-        # TODO: Code here is GOOD, but saving failed messages is not yet supported
-        # failed_messages = await self._pop_failed_user_messages(user)
-
-        # if not failed_messages:
-        #     return None
+    async def _replay_failed_dms(self, user: discord.User):
+        self.failed_dm_users.discard(user.id)
+        failed_messages = await self.store.pop_failed(user.id)
+        if not failed_messages:
+            return
 
-        # msg = "It looks like you have some old failed DMs. Here's what you've missed..."
-        # await self.add_message_players_to_dm_queue(member, msg)
-        # for failed_message in failed_messages:
-        #     await self.add_message_players_to_dm_queue(
-        #         member,
-        #         content=failed_message.get("content"),
-        #         embed=failed_message.get("embed"),
-        #         ctx=failed_message.get("req_ctx")
-        #     )
+        msg = "It looks like you have some old failed DMs. Here's what you've missed..."
+        await self.add_to_dm_queue(user, content=msg, priority=True)
+        for failed_message in failed_messages:
+            embed = load_embed(failed_message)
+            await self.add_to_dm_queue(
+                user,
+                content=failed_message["content"],
+                embed=discord.Embed.from_dict(embed) if embed else None,
+                priority=True,
+            )
 
     # endregion
 
@@ -405,7 +588,12 @@ class DMHelper(commands.Cog):
     # region json
     # GET
     async def _get_needs_to_dm_role(self, guild: discord.Guild):
-        return guild.get_role(await self.config.guild(guild).DMNotifyRole())
+        if guild.id not in self.needs_dm_roles:
+            self.needs_dm_roles[guild.id] = await self.config.guild(
+                guild
+            ).DMNotifyRole()
+        role_id = self.needs_dm_roles[guild.id]
+        return guild.get_role(role_id) if role_id else None
 
     async def _get_needs_to_dm_channel(self, guild: discord.Guild):
         return guild.get_channel(await self.config.guild(guild).DMNotifyChannel())
@@ -414,14 +602,6 @@ class DMHelper(commands.Cog):
         return await self.config.guild(guild).AutoAssignDMBotRole()
 
     # BOTH
-    async def _pop_failed_user_messages(self, user: discord.User):
-        failed_messages = await self.config.FailedUserMessages()
-        failed_user_messages = failed_messages.get(user)
-        if failed_user_messages:
-            del failed_messages[user]
-            await self._save_failed_user_messages(failed_messages)
-            return failed_user_messages
-
     async def _toggle_auto_assign_dmbr(self, guild: discord.Guild):
         auto_assign_dmbr = not (await self._get_auto_assign_dmbr(guild))
         await self.config.guild(guild).AutoAssignDMBotRole.set(auto_assign_dmbr)
@@ -429,16 +609,18 @@ class DMHelper(commands.Cog):
         return auto_assign_dmbr
 
     # SAVE
-    async def _save_needs_to_dm_role(self, guild: discord.Guild, role: discord.Role):
-        await self.config.guild(guild).DMNotifyRole.set(role.id)
+    async def _save_needs_to_dm_role(
+        self, guild: discord.Guild, role: discord.Role | None
+    ):
+        await self.config.guild(guild).DMNotifyRole.set(role.id if role else None)
+        self.needs_dm_roles[guild.id] = role.id if role else None
+        if self.locked_users_loaded:
+            self._rebuild_locked_users()
 
     async def _save_needs_to_dm_channel(
         self, guild: discord.Guild, channel: discord.TextChannel
     ):
         await self.config.guild(guild).DMNotifyChannel.set(channel.id)
 
-    async def _save_failed_user_messages(self, failed_messages: dict):
-        await self.config.FailedUserMessages.set(failed_messages)
-
 
 # endregion
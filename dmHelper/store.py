@@ -0,0 +1,203 @@
+import asyncio
+import aiosqlite
+import datetime
+import json
+import logging
+
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+log = logging.getLogger("red.RSCBot.dmHelper.store")
+
+# Undelivered DMs kept per user; older ones are dropped first
+failed_dm_limit = 25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dm_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    guild_id INTEGER,
+    content TEXT,
+    embed TEXT
+);
+CREATE TABLE IF NOT EXISTS failed_dms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    guild_id INTEGER,
+    content TEXT,
+    embed TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_failed_dms_user ON failed_dms (user_id, id);
+"""
+
+
+class DMStore:
+    """SQLite journal of queued and undelivered DMs.
+
+    Every queued DM is written before it is sent and removed once it has been
+    delivered, so DMs still queued when the bot stops are sent after a
+    restart. DMs that could not be delivered are moved to a per-user store
+    and replayed, in order, once the user unlocks their DMs.
+
+    Embeds are stored as `discord.Embed.to_dict()` JSON.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._db: Optional[aiosqlite.Connection] = None
+        # Newest queue id journaled before this store was opened
+        self._restore_up_to = 0
+        self._lock = asyncio.Lock()
+        # Held while inserting into dm_queue, so a batch's ids can be read back
+        self._enqueue_lock = asyncio.Lock()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        async with self._lock:
+            if self._db is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = await aiosqlite.connect(self.path)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.executescript(SCHEMA)
+                await db.commit()
+                db.row_factory = aiosqlite.Row
+                async with db.execute("SELECT MAX(id) FROM dm_queue") as cursor:
+                    (self._restore_up_to,) = await cursor.fetchone()
+                self._restore_up_to = self._restore_up_to or 0
+                self._db = db
+            return self._db
+
+    async def close(self):
+        async with self._lock:
+            if self._db is not None:
+                await self._db.close()
+                self._db = None
+
+    async def enqueue(
+        self,
+        priority: int,
+        user_id: int,
+        guild_id: Optional[int],
+        content: Optional[str],
+        embed: Optional[dict],
+    ) -> int:
+        """Journal a DM, returning its queue id"""
+        db = await self._connection()
+        async with self._enqueue_lock:
+            cursor = await db.execute(
+                "INSERT INTO dm_queue (created_at, priority, user_id, guild_id, content, embed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    _now(),
+                    priority,
+                    user_id,
+                    guild_id,
+                    content,
+                    json.dumps(embed) if embed else None,
+                ),
+            )
+            await db.commit()
+        return cursor.lastrowid
+
+    async def enqueue_many(
+        self,
+        priority: int,
+        messages: List[Tuple[int, Optional[int], Optional[str], Optional[dict]]],
+    ) -> List[int]:
+        """Journal (user_id, guild_id, content, embed) DMs in one commit, returning their queue ids"""
+        if not messages:
+            return []
+        created_at = _now()
+        db = await self._connection()
+        async with self._enqueue_lock:
+            await db.executemany(
+                "INSERT INTO dm_queue (created_at, priority, user_id, guild_id, content, embed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        created_at,
+                        priority,
+                        user_id,
+                        guild_id,
+                        content,
+                        json.dumps(embed) if embed else None,
+                    )
+                    for user_id, guild_id, content, embed in messages
+                ],
+            )
+            await db.commit()
+            # The batch was inserted with consecutive ids ending at the newest one
+            async with db.execute("SELECT MAX(id) FROM dm_queue") as cursor:
+                (last_id,) = await cursor.fetchone()
+        return list(range(last_id - len(messages) + 1, last_id + 1))
+
+    async def pending(self) -> List[aiosqlite.Row]:
+        """DMs queued before this store was opened but never sent, oldest first.
+
+        DMs journaled since then are already queued in this process, so they
+        are left out to avoid sending them twice.
+        """
+        db = await self._connection()
+        async with db.execute(
+            "SELECT * FROM dm_queue WHERE id <= ? ORDER BY id", (self._restore_up_to,)
+        ) as cursor:
+            return await cursor.fetchall()
+
+    async def delivered(self, queue_id: int):
+        db = await self._connection()
+        await db.execute("DELETE FROM dm_queue WHERE id = ?", (queue_id,))
+        await db.commit()
+
+    async def failed(self, queue_id: int):
+        """Move a queued DM to the failed store of its recipient"""
+        db = await self._connection()
+        async with db.execute(
+            "SELECT user_id FROM dm_queue WHERE id = ?", (queue_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return
+        await db.execute(
+            "INSERT INTO failed_dms (created_at, user_id, guild_id, content, embed)"
+            " SELECT created_at, user_id, guild_id, content, embed FROM dm_queue"
+            " WHERE id = ?",
+            (queue_id,),
+        )
+        await db.execute("DELETE FROM dm_queue WHERE id = ?", (queue_id,))
+        await db.execute(
+            "DELETE FROM failed_dms WHERE user_id = ? AND id NOT IN"
+            " (SELECT id FROM failed_dms WHERE user_id = ? ORDER BY id DESC LIMIT ?)",
+            (row["user_id"], row["user_id"], failed_dm_limit),
+        )
+        await db.commit()
+
+    async def failed_user_ids(self) -> List[int]:
+        """Users with undelivered DMs waiting for them"""
+        db = await self._connection()
+        async with db.execute("SELECT DISTINCT user_id FROM failed_dms") as cursor:
+            return [row["user_id"] for row in await cursor.fetchall()]
+
+    async def pop_failed(self, user_id: int) -> List[aiosqlite.Row]:
+        """Remove and return a user's undelivered DMs, oldest first"""
+        db = await self._connection()
+        async with db.execute(
+            "SELECT * FROM failed_dms WHERE user_id = ? ORDER BY id", (user_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        if rows:
+            await db.execute(
+                "DELETE FROM failed_dms WHERE user_id = ? AND id <= ?",
+                (user_id, rows[-1]["id"]),
+            )
+            await db.commit()
+        return rows
+
+
+def load_embed(row: aiosqlite.Row) -> Optional[dict]:
+    return json.loads(row["embed"]) if row["embed"] else None
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,128 @@
+import gzip
+import json
+import logging
+import os
+import threading
+
+from pathlib import Path
+from typing import Dict, List
+
+log = logging.getLogger("red.RSCBot.match.archive")
+
+
+class ScheduleArchive:
+    """Append-only archive of finalized match days for one guild and season.
+
+    Each archived (tier, match day) is written as its own gzip member at the end
+    of the data file. A small JSON index maps tier -> match day -> (offset, size)
+    so a single match day can be read back without decompressing the season.
+    Rewriting a match day appends a new member and repoints the index at it.
+
+    Decoded match days are cached per tier, so repeated season lookups only
+    decompress each match day once. Every method does blocking file I/O and is
+    meant to be run through `asyncio.to_thread`.
+    """
+
+    def __init__(self, directory: Path, season: str):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.data_path = directory / f"season_{season}.jsonl.gz"
+        self.index_path = directory / f"season_{season}.index.json"
+        self.index: Dict[str, Dict[str, List[int]]] = {}
+        self._decoded: Dict[str, Dict[str, List[dict]]] = {}
+        self._lock = threading.Lock()
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def __contains__(self, key) -> bool:
+        tier, match_day = key
+        return str(match_day) in self.index.get(tier, {})
+
+    def append(self, tier: str, match_day: str, matches: List[dict]):
+        """Write a match day (replacing any archived copy) and persist the updated index"""
+        with self._lock:
+            self._write(tier, str(match_day), matches)
+
+    def merge(self, tier: str, match_day: str, matches: List[dict]):
+        """Write a match day, keeping matches archived earlier for it.
+
+        Matches already archived for the day are replaced by the copy in
+        `matches` (e.g. to pick up a changed report) and any others are kept,
+        so archiving a day again after a makeup match was added loses nothing.
+        """
+        with self._lock:
+            merged = merge_matches(self._read(tier, str(match_day)), matches)
+            self._write(tier, str(match_day), merged)
+
+    def match_day(self, tier: str, match_day: str) -> List[dict]:
+        """Read back the matches of an archived match day ([] if not archived)"""
+        with self._lock:
+            matches = self._read(tier, str(match_day))
+        return [dict(match) for match in matches]
+
+    def tier_match_days(self, tier: str) -> Dict[str, List[dict]]:
+        """Read back every archived match day for a tier"""
+        with self._lock:
+            decoded = self._decoded.get(tier)
+            if decoded is None:
+                decoded = {
+                    match_day: self._read(tier, match_day)
+                    for match_day in self.index.get(tier, {})
+                }
+                self._decoded[tier] = decoded
+            return {
+                match_day: [dict(match) for match in matches]
+                for match_day, matches in decoded.items()
+            }
+
+    def tier_matches(self, tier: str) -> List[dict]:
+        """Read back every archived match for a tier"""
+        matches = []
+        for day_matches in self.tier_match_days(tier).values():
+            matches += day_matches
+        return matches
+
+    def _write(self, tier: str, match_day: str, matches: List[dict]):
+        record = json.dumps({"tier": tier, "matchDay": match_day, "matches": matches})
+        member = gzip.compress(record.encode("utf-8"))
+        with self.data_path.open("ab") as f:
+            offset = f.tell()
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.index.setdefault(tier, {})[match_day] = [offset, len(member)]
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+        decoded = self._decoded.get(tier)
+        if decoded is not None:
+            decoded[match_day] = json.loads(record)["matches"]
+
+    def _read(self, tier: str, match_day: str) -> List[dict]:
+        decoded = self._decoded.get(tier)
+        if decoded is not None and match_day in decoded:
+            return decoded[match_day]
+        location = self.index.get(tier, {}).get(match_day)
+        if not location:
+            return []
+        offset, size = location
+        with self.data_path.open("rb") as f:
+            f.seek(offset)
+            record = json.loads(gzip.decompress(f.read(size)))
+        return record["matches"]
+
+
+def merge_matches(archived: List[dict], active: List[dict]) -> List[dict]:
+    """Combine the archived and active matches of one match day, preferring active copies"""
+    merged = {_match_key(match): match for match in archived}
+    merged.update((_match_key(match), match) for match in active)
+    return list(merged.values())
+
+
+def _match_key(match: dict) -> tuple:
+    return tuple(
+        match.get(key) for key in ("home", "away", "matchDate", "roomName", "roomPass")
+    )
@@ -1,12 +1,20 @@
 import ast
+import asyncio
+import csv
+import io
+import itertools
 import random
 from datetime import datetime
 import json
 import discord
 import logging
+from pytz import all_timezones_set, timezone
+
+from .archive import ScheduleArchive, merge_matches
 from .config import config
 
 from redbot.core import Config, commands, checks
+from redbot.core.data_manager import cog_data_path
 
 from teamManager import TeamManager
 
@@ -20,8 +28,28 @@ defaults = {
     "Game": "Rocket League",
     "GameTeamSize": 3,
     "LobbyHashes": {},
+    "Season": None,
+    "AutoAdvanceMatchDay": False,
+    "TimeZone": "America/New_York",
 }
 
+archive_interval = 3600  # 1 hour
+match_day_check_interval = 300  # 5 minutes
+dm_concurrency = 5
+max_embeds_per_message = 10
+max_embed_chars_per_message = 6000
+
+import_columns = [
+    "matchDay",
+    "matchDate",
+    "home",
+    "away",
+    "matchType",
+    "matchFormat",
+    "roomName",
+    "roomPass",
+]
+
 
 class Match(commands.Cog):
     """Used to get the match information"""
@@ -35,9 +63,20 @@ class Match(commands.Cog):
         )
         self.config.register_guild(**defaults)
         self.bot = bot
+        self._archives = {}
+        self._match_days = {}
+        self._tonight = {}
+        self._match_channels = {}
+        self.archive_task = asyncio.create_task(self._archive_loop())
+        self.match_day_task = asyncio.create_task(self._match_day_loop())
 
         # TODO: Data Setup on startup - guild[field] = x -> match dates, time zone, gameTeamSize, SeriesType
 
+    def cog_unload(self):
+        """Clean up when cog shuts down."""
+        self.archive_task.cancel()
+        self.match_day_task.cancel()
+
     # Properties
 
     @property
@@ -92,6 +131,57 @@ class Match(commands.Cog):
         finally:
             await ctx.send("Added {0} match(es).".format(addedCount))
 
+    @commands.command(aliases=["importSchedule"])
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def importMatches(self, ctx: commands.Context):
+        """Add a full schedule from an attached CSV or JSON file.
+
+        Each row must contain, in order:
+
+        matchDay, matchDate, home, away, matchType, matchFormat[, roomName, roomPass]
+
+        CSV files may start with a header row using those names. JSON files must
+        hold a list of rows or objects with those keys. The room name and
+        password are optional and will be generated if absent.
+
+        All rows are validated before anything is saved. Valid matches are
+        saved at once and rejected rows are listed in a report file.
+
+        Example:
+        [p]importMatches  (with schedule.csv attached)
+        """
+        if not ctx.message.attachments:
+            await ctx.send(":x: Please attach a CSV or JSON file.")
+            return
+
+        attachment = ctx.message.attachments[0]
+        try:
+            rows = self._parse_match_import(
+                attachment.filename, await attachment.read()
+            )
+        except (ValueError, UnicodeDecodeError) as exc:
+            await ctx.send(
+                ":x: Unable to read **{0}**: {1}".format(attachment.filename, exc)
+            )
+            return
+
+        async with ctx.typing():
+            added, rejected = await self._import_matches(ctx, rows)
+
+        embed = discord.Embed(
+            title="Schedule Imported",
+            description=f"Added: **{added}**\nRejected: **{len(rejected)}**",
+            color=discord.Color.red() if rejected else discord.Color.blue(),
+        )
+        report_file = None
+        if rejected:
+            report_file = discord.File(
+                io.BytesIO("\n".join(rejected).encode("utf-8")),
+                filename="schedule_import_rejects.txt",
+            )
+        await ctx.send(embed=embed, file=report_file)
+
     @commands.command()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_guild=True)
@@ -128,6 +218,56 @@ class Match(commands.Cog):
         await self._save_schedule(ctx, {})
         await ctx.send("Done.")
 
+    @commands.command()
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def toggleAutoMatchDay(self, ctx):
+        """Toggle automatically advancing the match day from the schedule's match dates.
+
+        When enabled, the match day is advanced to the latest match day whose
+        match date has been reached in the guild's time zone.
+        """
+        auto_advance = not await self.config.guild(ctx.guild).AutoAdvanceMatchDay()
+        await self.config.guild(ctx.guild).AutoAdvanceMatchDay.set(auto_advance)
+        action = "will" if auto_advance else "will not"
+        await ctx.send(f"The match day **{action}** be advanced automatically.")
+        if auto_advance:
+            await self._advance_match_day(ctx.guild)
+
+    @commands.command()
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def setMatchTimeZone(self, ctx, time_zone: str):
+        """Sets the time zone used to advance the match day (Default: America/New_York)
+
+        Reference the following wikipedia page: https://en.wikipedia.org/wiki/List_of_tz_database_time_zones
+        """
+        if time_zone not in all_timezones_set:
+            await ctx.send(f":x: **{time_zone}** is not a valid time zone code.")
+            return
+        await self.config.guild(ctx.guild).TimeZone.set(time_zone)
+        await ctx.send("Done")
+
+    @commands.command()
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def setSeason(self, ctx, season: str):
+        """Sets the current season. Archived match days are stored per season."""
+        await self.config.guild(ctx.guild).Season.set(season)
+        await ctx.send("Done")
+
+    @commands.command()
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def archiveSchedule(self, ctx):
+        """Move finalized match days out of the active schedule into the season archive.
+
+        A match day is finalized once it is before the current match day and
+        every match in it has been reported. This also runs automatically every hour.
+        """
+        archived = await self._archive_finalized_match_days(ctx.guild)
+        await ctx.send("Archived {0} tier match day(s).".format(archived))
+
     # region match settings
     @commands.command()
     @commands.guild_only()
@@ -252,6 +392,8 @@ class Match(commands.Cog):
         )
         send_to_channel = await self.get_franchise_match_channel(franchise_role)
 
+        embeds = []
+        no_matches = []
         for team_name in teams:
             try:
                 team_matches = await self.get_team_matches(
@@ -268,14 +410,22 @@ class Match(commands.Cog):
                 return
 
             for match in team_matches:
-                embed = await self._format_match_embed(ctx, match, team_name)
-                await send_to_channel.send(ctx.author.mention, embed=embed)
+                embeds.append(await self._format_match_embed(ctx, match, team_name))
 
             if not team_matches:
-                # await ctx.message.author.send("No matches on day {0} for {1}".format(match_day, team_name))
-                await send_to_channel.send(
-                    f"{ctx.author.mention}, No matches on day {match_day} for {team_name}"
-                )
+                no_matches.append(team_name)
+
+        content = ctx.author.mention
+        if no_matches:
+            content += ", No matches on day {0} for {1}".format(
+                match_day, ", ".join(no_matches)
+            )
+
+        # Bundle embeds into as few messages as Discord allows
+        batches = self._batch_embeds(embeds)
+        for batch in batches or [[]]:
+            await send_to_channel.send(content, embeds=batch)
+            content = None
 
         await ctx.message.delete()
 
@@ -336,13 +486,59 @@ class Match(commands.Cog):
             description=message,
         )
 
-        for opponent in opposing_roster:
-            if not self.team_manager.is_subbed_out(opponent):
-                await opponent.send(embed=embed)
+        recipients = [
+            opponent
+            for opponent in opposing_roster
+            if not self.team_manager.is_subbed_out(opponent)
+        ]
+        failed = await self._send_concurrently(recipients, embed=embed)
 
+        if failed:
+            await ctx.send(
+                ":x: Unable to DM lobby info to: {0}".format(
+                    ", ".join(member.display_name for member in failed)
+                )
+            )
         await ctx.message.add_reaction("\U00002705")
 
     # Helper Functions
+    def _batch_embeds(self, embeds: list) -> list:
+        """Split embeds into groups that fit in a single Discord message"""
+        batches = []
+        batch = []
+        batch_size = 0
+        for embed in embeds:
+            if batch and (
+                len(batch) == max_embeds_per_message
+                or batch_size + len(embed) > max_embed_chars_per_message
+            ):
+                batches.append(batch)
+                batch = []
+                batch_size = 0
+            batch.append(embed)
+            batch_size += len(embed)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _send_concurrently(self, recipients: list, **kwargs) -> list:
+        """DM every recipient with bounded concurrency. Returns recipients that failed."""
+        semaphore = asyncio.Semaphore(dm_concurrency)
+
+        async def send(recipient):
+            async with semaphore:
+                await recipient.send(**kwargs)
+
+        results = await asyncio.gather(
+            *(send(recipient) for recipient in recipients), return_exceptions=True
+        )
+        failed = []
+        for recipient, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                log.debug(f"DM to {recipient} failed: {result}")
+                failed.append(recipient)
+        return failed
+
     async def _add_match(
         self, ctx, match_day, match_date, home, away, match_type, match_format
     ):
@@ -424,6 +620,133 @@ class Match(commands.Cog):
         result["away"] = away
         return result
 
+    def _parse_match_import(self, filename: str, data: bytes):
+        """Parse an import attachment into (row number, match dict) tuples"""
+        text = data.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            entries = json.loads(text)
+            if not isinstance(entries, list):
+                raise ValueError("JSON file must contain a list of matches.")
+        else:
+            entries = list(csv.reader(io.StringIO(text)))
+            if entries and entries[0] and entries[0][0].strip() == import_columns[0]:
+                entries = entries[1:]
+
+        rows = []
+        for number, entry in enumerate(entries, start=1):
+            if isinstance(entry, (dict, list)):
+                if not entry:
+                    continue
+                if isinstance(entry, list):
+                    entry = dict(zip(import_columns, entry))
+            else:
+                # Scalar JSON entries have none of the fields, so every one is reported missing
+                entry = {}
+            rows.append(
+                (
+                    number,
+                    {
+                        key: str(entry[key]).strip() if entry.get(key) else ""
+                        for key in import_columns
+                    },
+                )
+            )
+        return rows
+
+    def _lobby_pool(self, used: set):
+        """Shuffled room name/password pairs that are not already in use"""
+        pool = [
+            pair
+            for pair in itertools.product(config.room_pass, repeat=2)
+            if pair not in used
+        ]
+        random.shuffle(pool)
+        return pool
+
+    async def _import_matches(self, ctx, rows):
+        """Validate and save imported matches with a single config write.
+
+        Returns the number of matches added and a list of rejected rows.
+        """
+        # Resolve every team to its tier once instead of per match
+        team_manager = self.team_manager
+        team_roles = await team_manager._team_roles(ctx)
+        team_tiers = {}
+        for team in await team_manager._teams(ctx):
+            tier_role = ctx.guild.get_role(
+                team_roles.get(team, {}).get(team_manager.TIER_ROLE_KEY, 0)
+            )
+            if tier_role:
+                team_tiers[team.lower()] = (team, tier_role.name)
+
+        valid = []
+        rejected = []
+        for number, match in rows:
+            errors = []
+            if not match["matchDay"]:
+                errors.append("match day not found")
+            try:
+                datetime.strptime(match["matchDate"], "%B %d, %Y")
+            except ValueError:
+                errors.append(f"date not valid ({match['matchDate']})")
+            home = team_tiers.get(match["home"].lower())
+            away = team_tiers.get(match["away"].lower())
+            if not home:
+                errors.append(f"home team not found ({match['home']})")
+            if not away:
+                errors.append(f"away team not found ({match['away']})")
+            if home and away and home[1] != away[1]:
+                errors.append(f"teams are in different tiers ({home[1]}, {away[1]})")
+            if home and away and home[0] == away[0]:
+                errors.append("home and away are the same team")
+            if not self.is_valid_match_format(match["matchFormat"] or "4-gs"):
+                errors.append(f"match format not valid ({match['matchFormat']})")
+            if errors:
+                rejected.append(
+                    "row {0} ({1} vs {2}): {3}".format(
+                        number, match["home"], match["away"], ", ".join(errors)
+                    )
+                )
+                continue
+
+            match["home"] = home[0]
+            match["away"] = away[0]
+            valid.append((home[1], match))
+
+        async with self.config.guild(ctx.guild).all() as data:
+            schedule = data["Schedules"]
+            lobby_hashes = data["LobbyHashes"]
+
+            # Lobby pairs already used on each match day across all tiers
+            used = {}
+            for tier_schedule in schedule.values():
+                for match_day, matches in tier_schedule.items():
+                    used.setdefault(match_day, set()).update(
+                        (m["roomName"], m["roomPass"]) for m in matches
+                    )
+
+            pools = {}
+            for tier, match in valid:
+                match_day = match["matchDay"]
+                day_used = used.setdefault(match_day, set())
+                room = (match.pop("roomName"), match.pop("roomPass"))
+                if not all(room) or room in day_used:
+                    pool = pools.get(match_day)
+                    if pool is None:
+                        pool = pools[match_day] = self._lobby_pool(day_used)
+                    room = pool.pop()
+                    while room in day_used:
+                        room = pool.pop()
+                day_used.add(room)
+
+                match["roomName"], match["roomPass"] = room
+                match["matchFormat"] = match["matchFormat"] or "4-gs"
+                lobby_hashes.setdefault(match_day, []).append(hash("-".join(room)))
+                schedule.setdefault(tier, {}).setdefault(match_day, []).append(match)
+
+        self._invalidate_tonight(ctx.guild)
+        return len(valid), rejected
+
     async def _format_match_embed(self, ctx, match, user_team_name):
         # Match format:
         # match = {
@@ -449,19 +772,42 @@ class Match(commands.Cog):
         return await self._create_normal_match_embed(ctx, embed, match, user_team_name)
 
     async def get_team_matches(self, ctx, team_name, match_day=None):
+        if match_day:
+            tonight = await self._get_tonight(ctx.guild)
+            if tonight["match_day"] == str(match_day):
+                team_matches = tonight["team_matches"].get(team_name.lower())
+                if team_matches is not None:
+                    return [dict(match) for match in team_matches]
+
         franchise_role, tier_role = await self.team_manager._roles_for_team(
             ctx, team_name
         )
         schedule = await self._schedule(ctx)
 
         tier_schedule = schedule.setdefault(tier_role.name, {})
+        archive = await self._archive(ctx.guild)
 
+        # Days can be both archived and active, e.g. after a makeup match was
+        # added to an archived day; the active copy of a match wins
         if match_day:
-            tier_matches = tier_schedule.setdefault(str(match_day), [])
+            tier_matches = tier_schedule.get(str(match_day), [])
+            if (tier_role.name, str(match_day)) in archive:
+                archived = await asyncio.to_thread(
+                    archive.match_day, tier_role.name, str(match_day)
+                )
+                tier_matches = merge_matches(archived, tier_matches)
         else:
-            tier_matches = []
+            match_days = await asyncio.to_thread(
+                archive.tier_match_days, tier_role.name
+            )
             for match_day, matches in tier_schedule.items():
-                tier_matches += matches
+                if isinstance(matches, list):
+                    match_days[match_day] = merge_matches(
+                        match_days.get(match_day, []), matches
+                    )
+            tier_matches = [
+                match for matches in match_days.values() for match in matches
+            ]
 
         team_matches = []
         for match in tier_matches:
@@ -630,6 +976,10 @@ class Match(commands.Cog):
         franchise_channel_name = franchise_name.replace(" ", "-").lower()
         CAT_NAME = "Match Info"
 
+        cached = guild.get_channel(self._match_channels.get(franchise_role.id, 0))
+        if cached and cached.name == franchise_channel_name:
+            return cached
+
         match_cat = None
         for cat in guild.categories:
             if cat.name == CAT_NAME:
@@ -641,6 +991,7 @@ class Match(commands.Cog):
 
         for team_channel in match_cat.channels:
             if team_channel.name == franchise_channel_name:
+                self._match_channels[franchise_role.id] = team_channel.id
                 return team_channel
 
         overwrites = {
@@ -648,9 +999,11 @@ class Match(commands.Cog):
             franchise_role: discord.PermissionOverwrite(view_channel=True),
         }
 
-        return await match_cat.create_text_channel(
+        team_channel = await match_cat.create_text_channel(
             franchise_channel_name, overwrites=overwrites
         )
+        self._match_channels[franchise_role.id] = team_channel.id
+        return team_channel
 
     def get_match_index_in_day(self, schedule, tier, match):
         matches = schedule.get(tier, {}).get(str(match["matchDay"]), [])
@@ -680,12 +1033,193 @@ class Match(commands.Cog):
                         missing_matches[tier] = missing_tier_matches
         return missing_matches
 
+    async def _archive_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            for guild in self.bot.guilds:
+                try:
+                    await self._archive_finalized_match_days(guild)
+                except Exception as exc:
+                    log.exception(f"[{guild.name}] Schedule archival failed: {exc}")
+            await asyncio.sleep(archive_interval)
+
+    async def _match_day_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            for guild in self.bot.guilds:
+                try:
+                    await self._advance_match_day(guild)
+                except Exception as exc:
+                    log.exception(f"[{guild.name}] Match day advance failed: {exc}")
+            await asyncio.sleep(match_day_check_interval)
+
+    async def _advance_match_day(self, guild: discord.Guild):
+        """Advance the match day to the latest one whose match date has arrived"""
+        if not await self.config.guild(guild).AutoAdvanceMatchDay():
+            return None
+
+        today = datetime.now(timezone(await self.config.guild(guild).TimeZone()))
+        schedule = await self.config.guild(guild).Schedules()
+
+        # Earliest match date for every match day across all tiers
+        start_dates = {}
+        for tier_schedule in schedule.values():
+            for match_day, matches in tier_schedule.items():
+                if not (match_day.isdigit() and isinstance(matches, list)):
+                    continue
+                for match in matches:
+                    try:
+                        date = datetime.strptime(match["matchDate"], "%B %d, %Y")
+                    except (KeyError, ValueError):
+                        continue
+                    if match_day not in start_dates or date < start_dates[match_day]:
+                        start_dates[match_day] = date
+
+        started = [
+            match_day
+            for match_day, date in start_dates.items()
+            if date.date() <= today.date()
+        ]
+        if not started:
+            return None
+
+        latest = max(started, key=int)
+        current = str(await self._get_match_day(guild))
+        if current.isdigit() and int(latest) <= int(current):
+            return None
+
+        await self._set_match_day(guild, latest)
+        await self._build_tonight(guild)
+        log.info(f"[{guild.name}] Match day advanced to {latest}")
+        return latest
+
+    async def _get_tonight(self, guild: discord.Guild) -> dict:
+        """Current match day snapshot, rebuilt if the schedule or match day changed"""
+        tonight = self._tonight.get(guild.id)
+        if tonight is None or tonight["match_day"] != str(
+            await self._get_match_day(guild)
+        ):
+            tonight = await self._build_tonight(guild)
+        return tonight
+
+    async def _build_tonight(self, guild: discord.Guild) -> dict:
+        """Precompute every team's matches for the current match day.
+
+        Rosters are intentionally not included since subs and transactions can
+        change them during match night.
+        """
+        match_day = str(await self._get_match_day(guild))
+        teams = await self.team_manager.config.guild(guild).Teams()
+        schedule = await self.config.guild(guild).Schedules()
+
+        team_matches = {team.lower(): [] for team in teams}
+        for tier_schedule in schedule.values():
+            matches = tier_schedule.get(match_day, [])
+            if not isinstance(matches, list):
+                continue
+            for match in matches:
+                for side in ("home", "away"):
+                    if match[side].lower() in team_matches:
+                        team_matches[match[side].lower()].append(match)
+
+        tonight = {"match_day": match_day, "team_matches": team_matches}
+        self._tonight[guild.id] = tonight
+        return tonight
+
+    def _invalidate_tonight(self, guild: discord.Guild):
+        self._tonight.pop(guild.id, None)
+
+    async def _archive(self, guild: discord.Guild) -> ScheduleArchive:
+        season = str(await self.config.guild(guild).Season() or "current")
+        key = (guild.id, season)
+        if key not in self._archives:
+            directory = cog_data_path(self) / "archive" / str(guild.id)
+            self._archives[key] = ScheduleArchive(directory, season)
+        return self._archives[key]
+
+    async def _archive_finalized_match_days(self, guild: discord.Guild) -> int:
+        """Move reported match days before the current match day into the archive"""
+        current_day = str(await self.config.guild(guild).MatchDay())
+        if not current_day.isdigit():
+            return 0
+
+        archive = await self._archive(guild)
+        schedule = await self.config.guild(guild).Schedules()
+        finalized = []
+        for tier, tier_schedule in schedule.items():
+            for match_day, matches in tier_schedule.items():
+                if not (match_day.isdigit() and int(match_day) < int(current_day)):
+                    continue
+                if not all(match.get("report") for match in matches):
+                    continue
+                finalized.append((tier, match_day, matches))
+
+        # Write the archive before touching the schedule, so a failed write
+        # leaves the match days in the active schedule. Days that are already
+        # archived (e.g. a makeup match was added later) are merged.
+        rearchived_days = {
+            match_day
+            for tier, match_day, _ in finalized
+            if (tier, match_day) in archive
+        }
+        for tier, match_day, matches in finalized:
+            await asyncio.to_thread(archive.merge, tier, match_day, matches)
+
+        archived = 0
+        async with self.config.guild(guild).all() as data:
+            schedule = data["Schedules"]
+            for tier, match_day, matches in finalized:
+                # A report may have changed while the archive was being written
+                if schedule.get(tier, {}).get(match_day) != matches:
+                    continue
+                del schedule[tier][match_day]
+                archived += 1
+
+            # Lobby hashes only need to be unique within the active match days,
+            # and within days that got makeup matches after being archived
+            active_days = {
+                match_day
+                for tier_schedule in schedule.values()
+                for match_day in tier_schedule
+            }
+            for match_day in list(data["LobbyHashes"].keys()):
+                if match_day not in active_days | rearchived_days:
+                    del data["LobbyHashes"][match_day]
+
+        self._invalidate_tonight(guild)
+        if archived:
+            log.info(f"[{guild.name}] Archived {archived} tier match day(s)")
+        return archived
+
+    async def set_match_report(self, ctx, tier, match, report):
+        """Save a match report, whether its match day is active or archived"""
+        schedule = await self._schedule(ctx)
+        match_day = str(match["matchDay"])
+        match_index = self.get_match_index_in_day(schedule, tier, match)
+        if match_index is not None:
+            schedule[tier][match_day][match_index]["report"] = report
+            await self._save_schedule(ctx, schedule)
+        else:
+            archive = await self._archive(ctx.guild)
+            matches = await asyncio.to_thread(archive.match_day, tier, match_day)
+            match_index = self.get_match_index_in_day(
+                {tier: {match_day: matches}}, tier, match
+            )
+            if match_index is None:
+                raise KeyError(f"{match['home']} vs {match['away']} ({match_day})")
+            matches[match_index]["report"] = report
+            await asyncio.to_thread(archive.append, tier, match_day, matches)
+
+        match["report"] = report
+        return match
+
     # json
     async def _schedule(self, ctx):
         return await self.config.guild(ctx.guild).Schedules()
 
     async def _save_schedule(self, ctx, schedules):
         await self.config.guild(ctx.guild).Schedules.set(schedules)
+        self._invalidate_tonight(ctx.guild)
 
     async def _matches(self, ctx):
         schedule = await self._schedule(ctx)
@@ -697,10 +1231,20 @@ class Match(commands.Cog):
         await self._save_schedule(ctx, schedule)
 
     async def _match_day(self, ctx):
-        return await self.config.guild(ctx.guild).MatchDay()
+        return await self._get_match_day(ctx.guild)
+
+    async def _get_match_day(self, guild):
+        if guild.id not in self._match_days:
+            self._match_days[guild.id] = await self.config.guild(guild).MatchDay()
+        return self._match_days[guild.id]
 
     async def _save_match_day(self, ctx, match_day):
-        await self.config.guild(ctx.guild).MatchDay.set(match_day)
+        await self._set_match_day(ctx.guild, match_day)
+
+    async def _set_match_day(self, guild, match_day):
+        await self.config.guild(guild).MatchDay.set(match_day)
+        self._match_days[guild.id] = match_day
+        self._invalidate_tonight(guild)
 
     async def _save_game_team_size(self, guild, team_size):
         await self.config.guild(guild).GameTeamSize.set(team_size)
@@ -0,0 +1,59 @@
+import re
+import time
+
+from collections import deque
+from typing import Deque, Iterable, Optional
+
+
+class NameBlacklist:
+    """Compiled matcher for blacklisted name fragments.
+
+    All fragments are combined into one regular expression, so a member name
+    is checked against the whole blacklist in a single pass. Build a new
+    instance whenever the blacklist changes.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        # Longest first, so the reported match is the most specific fragment
+        self.names = sorted({n.lower() for n in names if n}, key=len, reverse=True)
+        self._pattern = (
+            re.compile("|".join(re.escape(n) for n in self.names))
+            if self.names
+            else None
+        )
+
+    def match(self, name: str) -> Optional[str]:
+        """The blacklisted fragment found in `name`, if any"""
+        if not self._pattern:
+            return None
+        found = self._pattern.search(name.lower())
+        return found.group(0) if found else None
+
+
+class RaidMonitor:
+    """Join rate tracker for one guild.
+
+    The guild is in raid mode once `threshold` members join within `window`
+    seconds, and stays in it until `cooldown` seconds after the last join
+    that kept the rate above the threshold.
+    """
+
+    def __init__(self, threshold: int, window: float, cooldown: float):
+        self.window = window
+        self.cooldown = cooldown
+        self.raid_until = 0.0
+        self._joins: Deque[float] = deque(maxlen=threshold)
+
+    @property
+    def active(self) -> bool:
+        return time.monotonic() < self.raid_until
+
+    def record_join(self) -> bool:
+        """Record a join, returning whether it started raid mode"""
+        now = time.monotonic()
+        self._joins.append(now)
+        if len(self._joins) < self._joins.maxlen or now - self._joins[0] > self.window:
+            return False
+        started = not self.active
+        self.raid_until = now + self.cooldown
+        return started
@@ -0,0 +1,64 @@
+import discord
+import time
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class JoinTracker:
+    """Names of members who recently joined one guild.
+
+    A name expires `ttl` seconds after the last new member joined under it.
+    The ttl is the same for every name, so keeping names ordered by their
+    last refresh also keeps them ordered by expiry: expiring is popping from
+    the front and refreshing is a move to the back, both O(1). At most
+    `max_names` names are tracked; the oldest are dropped first, so a join
+    raid cannot grow memory without bound.
+    """
+
+    def __init__(self, ttl: float, max_names: int):
+        self.ttl = ttl
+        self.max_names = max_names
+        self._expires: OrderedDict[str, float] = OrderedDict()
+        self._members: Dict[str, Dict[int, discord.Member]] = {}
+
+    def track(self, member: discord.Member) -> bool:
+        """Track a join, returning whether another member recently joined with the same name"""
+        self.expire()
+        members = self._members.setdefault(member.name, {})
+
+        # cover case where member leaves, rejoins
+        if member.id in members:
+            return len(members) > 1
+
+        members[member.id] = member
+        self._expires[member.name] = time.monotonic() + self.ttl
+        self._expires.move_to_end(member.name)
+        while len(self._expires) > self.max_names:
+            name, _ = self._expires.popitem(last=False)
+            del self._members[name]
+        return len(members) > 1
+
+    def members(self, name: str) -> List[discord.Member]:
+        """Members tracked under a name, in join order"""
+        return list(self._members.get(name, {}).values())
+
+    def counts(self) -> List[Tuple[str, int]]:
+        """Tracked names with the number of members that joined under each"""
+        self.expire()
+        return [(name, len(self._members[name])) for name in self._expires]
+
+    def expire(self) -> Optional[float]:
+        """Drop expired names, returning when the next one expires"""
+        now = time.monotonic()
+        while self._expires:
+            name, expires = next(iter(self._expires.items()))
+            if expires > now:
+                return expires
+            del self._expires[name]
+            del self._members[name]
+        return None
+
+    def clear(self):
+        self._expires.clear()
+        self._members.clear()
@@ -1,11 +1,26 @@
 import asyncio
 import discord
 import logging
+import time
 from redbot.core import Config
 from redbot.core import commands
 from redbot.core import checks
 
-from typing import Union, Optional, List
+from typing import Dict, Union, Optional, List, Tuple
+
+from utilities import (
+    BulkRunner,
+    MemberIndex,
+    apply_nicknames,
+    audit_log_cache,
+    job_registry,
+    mutual_guild_cache,
+    plan_nicknames,
+)
+
+from .bot_detection import NameBlacklist, RaidMonitor
+from .join_tracker import JoinTracker
+from .shared_roles import SharedRoleMap
 
 log = logging.getLogger("red.RSCBot.modLink")
 
@@ -13,6 +28,15 @@ log = logging.getLogger("red.RSCBot.modLink")
 SPAM_JOIN_BT = "spam join"
 SUS_NEW_ACC_BT = "suspicious new account"
 NEW_MEMBER_JOIN_TIME = 300  # 5 minutes
+MAX_TRACKED_JOIN_NAMES = 1000  # per guild
+BOT_INVITE_REUSE_TIME = 3600  # 1 hour
+
+# Raid Mode: flagged members are removed in batches while joins spike
+RAID_JOIN_THRESHOLD = 10  # joins...
+RAID_JOIN_WINDOW = 30  # ...within this many seconds
+RAID_MODE_COOLDOWN = 300  # 5 minutes
+RAID_BATCH_DELAY = 2
+RAID_CONCURRENCY = 5
 ACC_AGE_THRESHOLD = 86400  # 1 day
 DISABLE_BOT_INVITES = False
 
@@ -47,12 +71,24 @@ class ModeratorLink(commands.Cog):
         ]
         self.whitelist = []
         self.bot_detection = {}
-        self.recently_joined_members = {}
-        asyncio.create_task(self._pre_load_data())
+        self.recently_joined_members: Dict[discord.Guild, JoinTracker] = {}
+        self.name_blacklists: Dict[int, NameBlacklist] = {}
+        self.raid_monitors: Dict[int, RaidMonitor] = {}
+        self.raid_actions: Dict[int, List[Tuple[discord.Member, str, bool]]] = {}
+        self.bot_invites: Dict[int, Tuple[float, discord.Invite]] = {}
+        self.shared_roles = SharedRoleMap()
+        self.event_log_channels: Dict[int, Optional[int]] = {}
+        job_registry.start(
+            self._pre_load_data(), "Load bot detection settings", self.qualified_name
+        )
+        job_registry.start(
+            self._expire_recent_joins(), "Expire recent joins", self.qualified_name
+        )
 
     def cog_unload(self):
         """Clean up when cog shuts down."""
-        self.cancel_all_tasks()
+        self.clear_recent_joins()
+        job_registry.cancel_owner(self.qualified_name)
 
     # Mod Role
 
@@ -158,7 +194,7 @@ class ModeratorLink(commands.Cog):
         if bd:
             await self._pre_load_data()
         else:
-            self.cancel_all_tasks(ctx.guild)
+            self.clear_recent_joins(ctx.guild)
 
         await ctx.send(
             embed=discord.Embed(
@@ -321,8 +357,7 @@ class ModeratorLink(commands.Cog):
             return
         recent_joins = "__Recent Member Joins:__"
         tracked_joins = 0
-        for name, join_data in self.recently_joined_members[ctx.guild].items():
-            num_joins = len(join_data["members"])
+        for name, num_joins in self._join_tracker(ctx.guild).counts():
             recent_joins += f"\n - {name} ({num_joins})"
             tracked_joins += num_joins
 
@@ -381,10 +416,18 @@ class ModeratorLink(commands.Cog):
         """Removes a star from each user passed in the userList"""
         if not await self.has_perms(ctx.author):
             return
-        for user in userList:
-            new_name = user.nick.replace(self.STAR_EMOJI, "")
-            await user.edit(nick=new_name)
-        await ctx.send(f"Removed stars from **{len(userList)} player(s)**.")
+        changes = plan_nicknames(
+            userList, lambda member: self._remove_award(member, self.STAR_EMOJI)
+        )
+        runner = BulkRunner(ctx, "Removing Stars")
+        updated, failed = await apply_nicknames(runner, changes)
+        await runner.finish()
+        message = f"Removed stars from **{len(updated)} player(s)**."
+        if failed:
+            message += (
+                f"\n:x: Nicknames could not be changed for {len(failed)} members."
+            )
+        await ctx.send(message)
 
     @commands.guild_only()
     @commands.command(aliases=["assignMedal", "awardMedal"])
@@ -399,21 +442,16 @@ class ModeratorLink(commands.Cog):
     @checks.admin_or_permissions(manage_guild=True)
     async def removeAllStars(self, ctx):
         """Removes the Star Emoji from all discord members who have it."""
-        all_stars = []
-        for member in ctx.guild.members:
-            if member.nick:
-                if self.STAR_EMOJI in member.nick:
-                    all_stars.append(member)
-
+        changes = plan_nicknames(
+            ctx.guild.members,
+            lambda member: self._remove_award(member, self.STAR_EMOJI),
+        )
         successes = []
         failures = []
-        for member in all_stars:
-            try:
-                new_name = member.nick.replace(self.STAR_EMOJI, "")
-                await member.edit(nick=new_name)
-                successes.append(member)
-            except Exception:
-                failures.append(member)
+        if changes:
+            runner = BulkRunner(ctx, "Removing Stars")
+            successes, failures = await apply_nicknames(runner, changes)
+            await runner.finish()
 
         msg = ""
         if successes:
@@ -462,25 +500,62 @@ class ModeratorLink(commands.Cog):
     @commands.Cog.listener("on_member_update")
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         """Processes updates for roles or nicknames, and shares them across the guild network."""
+        # Most updates (avatars, boosts, unshared roles) are irrelevant here, so
+        # only cached lookups run before deciding whether there is work to do.
+        if not await self._event_log_channel(before.guild):
+            return
 
-        # If roles updated:
-        if before.roles != after.roles:
-            await self._process_role_update(before, after)
+        await self._ensure_shared_roles(before.guild)
+        added_roles = []
+        removed_roles = []
+        for role_id in self.shared_roles.shared_role_ids(before.guild):
+            had_role = before.get_role(role_id)
+            has_role = after.get_role(role_id)
+            if has_role and not had_role:
+                added_roles.append(has_role)
+            elif had_role and not has_role:
+                removed_roles.append(had_role)
+        if added_roles or removed_roles:
+            await self._process_role_update(before, added_roles, removed_roles)
 
         # If nickname changed:
-        try:
-            before_name = before.nick
-        except Exception:
-            before_name = before.name
-        try:
-            after_name = after.nick
-        except Exception:
-            after_name = after.name
-
-        seconds_in_server = (discord.utils.utcnow() - before.joined_at).seconds
-        if before_name != after_name and seconds_in_server > 120:
+        if before.nick == after.nick or not before.joined_at:
+            return
+        seconds_in_server = (discord.utils.utcnow() - before.joined_at).total_seconds()
+        if seconds_in_server > 120:
             await self._process_nickname_update(before, after)
 
+    @commands.Cog.listener("on_guild_role_create")
+    async def on_guild_role_create(self, role: discord.Role):
+        if self.shared_roles.is_tracked_name(role.name):
+            self.shared_roles.index_guild(role.guild)
+
+    @commands.Cog.listener("on_guild_role_update")
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name and (
+            self.shared_roles.is_tracked_name(before.name)
+            or self.shared_roles.is_tracked_name(after.name)
+        ):
+            self.shared_roles.index_guild(after.guild)
+
+    @commands.Cog.listener("on_guild_role_delete")
+    async def on_guild_role_delete(self, role: discord.Role):
+        if self.shared_roles.is_tracked_name(role.name):
+            self.shared_roles.index_guild(role.guild)
+
+    @commands.Cog.listener("on_guild_join")
+    async def on_guild_join(self, guild: discord.Guild):
+        self.event_log_channels.pop(guild.id, None)
+        mutual_guild_cache.invalidate()
+        await self._ensure_shared_roles(guild)
+        self.shared_roles.index_guild(guild)
+
+    @commands.Cog.listener("on_guild_remove")
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.event_log_channels.pop(guild.id, None)
+        self.shared_roles.forget_guild(guild)
+        mutual_guild_cache.invalidate()
+
     @commands.Cog.listener("on_member_ban")
     async def on_member_ban(
         self, guild: discord.Guild, user: Union[discord.Member, discord.User]
@@ -489,8 +564,16 @@ class ModeratorLink(commands.Cog):
         if not await self._event_log_channel(guild):
             return
 
+        # Bans propagated by this cog are not propagated again
+        entry = await audit_log_cache.lookup(guild, user.id, discord.AuditLogAction.ban)
+        if self._is_propagated_action(entry):
+            return
+        banned_by = f" by **{entry.user.name}**" if entry and entry.user else ""
+
         # Iterate RSC related servers and take the same action.
         for linked_guild in self.bot.guilds:
+            if linked_guild == guild:
+                continue
             # Check guild is available and if we have ban permissions.
             if (
                 linked_guild.unavailable
@@ -502,20 +585,14 @@ class ModeratorLink(commands.Cog):
                 continue
 
             linked_guild_log = await self._event_log_channel(linked_guild)
-            is_banned = False
-            async for ban in linked_guild.bans():
-                if ban.user == user:
-                    is_banned = True
-                    break
-
-            if linked_guild_log and not is_banned:
+            if linked_guild_log and not await self._is_banned(linked_guild, user):
                 await linked_guild.ban(
                     user,
                     reason=f"Banned from {guild.name}.",
                     delete_message_seconds=0,
                 )
                 await linked_guild_log.send(
-                    f"**{user.name}** (id: {user.id}) has been banned. [initiated from **{guild.name}**]"
+                    f"**{user.name}** (id: {user.id}) has been banned{banned_by}. [initiated from **{guild.name}**]"
                 )
 
     @commands.Cog.listener("on_member_unban")
@@ -526,8 +603,18 @@ class ModeratorLink(commands.Cog):
         if not await self._event_log_channel(guild):
             return
 
+        # Unbans propagated by this cog are not propagated again
+        entry = await audit_log_cache.lookup(
+            guild, user.id, discord.AuditLogAction.unban
+        )
+        if self._is_propagated_action(entry):
+            return
+        unbanned_by = f" by **{entry.user.name}**" if entry and entry.user else ""
+
         # Iterate RSC related servers and take the same action.
         for linked_guild in self.bot.guilds:
+            if linked_guild == guild:
+                continue
             # Check guild is available and if we have ban permissions.
             if (
                 linked_guild.unavailable
@@ -539,22 +626,33 @@ class ModeratorLink(commands.Cog):
                 continue
 
             linked_guild_log = await self._event_log_channel(linked_guild)
-            is_banned = False
-            async for ban in linked_guild.bans():
-                if ban.user == user:
-                    is_banned = True
-                    break
-
-            if linked_guild_log and is_banned:
+            if linked_guild_log and await self._is_banned(linked_guild, user):
                 await linked_guild.unban(user, reason=f"Unbanned from {guild.name}.")
                 await linked_guild_log.send(
-                    f"**{user.mention}** (id: {user.id}) has been unbanned. [initiated from **{guild.name}**]"
+                    f"**{user.mention}** (id: {user.id}) has been unbanned{unbanned_by}. [initiated from **{guild.name}**]"
                 )
 
+    def _is_propagated_action(self, entry: Optional[discord.AuditLogEntry]) -> bool:
+        """Whether an audit log entry is a ban/unban this cog propagated itself"""
+        if not entry or not entry.user or entry.user.id != self.bot.user.id:
+            return False
+        reason = entry.reason or ""
+        return reason.startswith(("Banned from ", "Unbanned from "))
+
+    async def _is_banned(
+        self, guild: discord.Guild, user: Union[discord.Member, discord.User]
+    ) -> bool:
+        try:
+            await guild.fetch_ban(user)
+        except discord.NotFound:
+            return False
+        return True
+
     @commands.Cog.listener("on_member_join")
     async def on_member_join(self, member: discord.Member):
         """Processes events for when a member joins the guild such as welcome messages and
         nickname standardization, and bot purging."""
+        mutual_guild_cache.invalidate(member.id)
 
         # Run bot detection if enabled
         if self.bot_detection[member.guild]:
@@ -569,16 +667,19 @@ class ModeratorLink(commands.Cog):
         # Send welcome message if one exists
         await self.maybe_send_welcome_message(member)
 
+    @commands.Cog.listener("on_member_remove")
+    async def on_member_remove(self, member: discord.Member):
+        mutual_guild_cache.invalidate(member.id)
+
     # Helper Functions
     async def process_member_standardization(self, member):
         mutual_guilds = await self._member_mutual_guilds(member)
-        shared_role_names = await self._get_shared_role_names(member.guild)
+        await self._ensure_shared_roles(member.guild)
         event_log_channel = await self._event_log_channel(member.guild)
-        mutual_guilds.remove(member.guild)
         for guild in mutual_guilds:
             guild_event_log_channel = await self._event_log_channel(guild)
             if guild_event_log_channel:
-                guild_member = await self._guild_member_from_id(guild, member.id)
+                guild_member = guild.get_member(member.id)
                 guild_prefix, guild_nick, guild_awards = self._get_name_components(
                     guild_member
                 )
@@ -589,12 +690,12 @@ class ModeratorLink(commands.Cog):
                         f"{member.mention} (**{member.name}**, id: {member.id}) has had their nickname set to **{guild_nick}** upon joining the server [discovered from **{guild.name}**]"
                     )
 
-                if shared_role_names:
+                if self.shared_roles.names.get(member.guild.id):
                     # if member has shared role
                     member_shared_roles = []
                     for guild_member_role in guild_member.roles:
-                        if guild_member_role.name in shared_role_names:
-                            sis_role = await self._guild_sister_role(
+                        if self.shared_roles.is_shared(member.guild, guild_member_role):
+                            sis_role = self.shared_roles.sister_role(
                                 member.guild, guild_member_role
                             )
                             if sis_role:
@@ -652,18 +753,22 @@ class ModeratorLink(commands.Cog):
         if member.id in self.whitelist:
             return False
 
+        # RAID MODE
+        if self._raid_monitor(member.guild).record_join():
+            event_log_channel = await self._event_log_channel(member.guild)
+            if event_log_channel:
+                await event_log_channel.send(
+                    f"**Raid mode enabled:** {RAID_JOIN_THRESHOLD} or more members joined within {RAID_JOIN_WINDOW} seconds. Flagged bot accounts will be removed in batches."
+                )
+
         # SPAM JOIN PREVENTION
-        repeat_recent_name = self.track_member_join(member)
+        join_tracker = self._join_tracker(member.guild)
+        repeat_recent_name = join_tracker.track(member)
+        same_name_members = join_tracker.members(member.name)
 
         ## Kick/Ban first member when subsequent member flagged as bot
-        if (
-            repeat_recent_name
-            and len(self.recently_joined_members[member.guild][member.name]["members"])
-            == 2
-        ):
-            first_member = self.recently_joined_members[member.guild][member.name][
-                "members"
-            ][0]
+        if repeat_recent_name and len(same_name_members) == 2:
+            first_member = same_name_members[0]
             await self.process_bot_member_kick(
                 first_member, reason=(SPAM_JOIN_BT + " - catch first")
             )
@@ -675,72 +780,109 @@ class ModeratorLink(commands.Cog):
             return True
 
         # SUSPICIOUS NEW ACCOUNTS
-        for blacklist_name in await self._get_blacklisted_names(
-            member.guild
-        ):  # await self._get_name_blacklist():
-            account_age = (discord.utils.utcnow() - member.created_at).seconds
-            if (
-                blacklist_name in member.name.lower()
-                and account_age <= ACC_AGE_THRESHOLD + 10
-            ):
+        account_age = (discord.utils.utcnow() - member.created_at).total_seconds()
+        if account_age <= ACC_AGE_THRESHOLD + 10:
+            blacklist = await self._name_blacklist(member.guild)
+            if blacklist.match(member.name):
                 await self.process_bot_member_kick(member, reason=SUS_NEW_ACC_BT)
                 return True
         return False
 
+    def _raid_monitor(self, guild: discord.Guild) -> RaidMonitor:
+        monitor = self.raid_monitors.get(guild.id)
+        if monitor is None:
+            monitor = RaidMonitor(
+                RAID_JOIN_THRESHOLD, RAID_JOIN_WINDOW, RAID_MODE_COOLDOWN
+            )
+            self.raid_monitors[guild.id] = monitor
+        return monitor
+
+    async def _name_blacklist(self, guild: discord.Guild) -> NameBlacklist:
+        blacklist = self.name_blacklists.get(guild.id)
+        if blacklist is None:
+            blacklist = NameBlacklist(await self._get_blacklisted_names(guild))
+            self.name_blacklists[guild.id] = blacklist
+        return blacklist
+
+    async def _bot_invite(self, guild: discord.Guild) -> Optional[discord.Invite]:
+        """Invite sent to flagged members, reused instead of created per member"""
+        cached = self.bot_invites.get(guild.id)
+        if cached and time.monotonic() - cached[0] < BOT_INVITE_REUSE_TIME:
+            return cached[1]
+        if not guild.system_channel:
+            return None
+        invite = await self.create_invite(guild.system_channel)
+        if invite:
+            self.bot_invites[guild.id] = (time.monotonic(), invite)
+        return invite
+
     async def _pre_load_data(self):
         await self.bot.wait_until_ready()
         self.whitelist = []
         self.bot_detection = {}
         self.recently_joined_members = {}
         for guild in self.bot.guilds:
-            self.recently_joined_members[guild] = {}
+            self._join_tracker(guild)
             self.bot_detection[guild] = await self._get_bot_detection(guild)
+        await self._load_link_settings()
 
-    def track_member_join(self, member: discord.Member):
-        member_join_data = self.recently_joined_members[member.guild].setdefault(
-            member.name, {"members": [], "timeout": None}
-        )
-
-        # cover case where member leaves, rejoins
-        repeat_member = member.id in [m.id for m in member_join_data["members"]]
-        if repeat_member:
-            if len(member_join_data["members"]) == 1:
-                return False
-            return True
-
-        # add member to recent joins
-        member_join_data["members"].append(member)
-        if member_join_data["timeout"]:
-            member_join_data["timeout"].cancel()
-
-        member_join_data["timeout"] = asyncio.create_task(
-            self.schedule_new_member_name_clear(member)
-        )
-        self.recently_joined_members[member.guild][member.name] = member_join_data
-        repeat_recent_name = len(member_join_data["members"]) > 1
-
-        return repeat_recent_name
-
-    async def schedule_new_member_name_clear(
-        self, member: discord.Member, time_sec: int | None = None
-    ):
-        if not time_sec:
-            time_sec = NEW_MEMBER_JOIN_TIME
-        await asyncio.sleep(time_sec)
-        self.recently_joined_members[member.guild][member.name]["timeout"].cancel()
-        del self.recently_joined_members[member.guild][member.name]
+    async def _load_link_settings(self):
+        """Cache event log channels and index shared roles for every guild"""
+        guild_data = await self.config.all_guilds()
+        for guild in self.bot.guilds:
+            data = guild_data.get(guild.id, defaults)
+            self.event_log_channels[guild.id] = data["EventLogChannel"]
+            self.shared_roles.set_names(guild, data["SharedRoles"])
+        for guild in self.bot.guilds:
+            self.shared_roles.index_guild(guild)
+
+    def _join_tracker(self, guild: discord.Guild) -> JoinTracker:
+        tracker = self.recently_joined_members.get(guild)
+        if tracker is None:
+            tracker = JoinTracker(NEW_MEMBER_JOIN_TIME, MAX_TRACKED_JOIN_NAMES)
+            self.recently_joined_members[guild] = tracker
+        return tracker
+
+    async def _expire_recent_joins(self):
+        """Single loop expiring tracked join names for every guild"""
+        while True:
+            next_expiry = None
+            for tracker in list(self.recently_joined_members.values()):
+                expiry = tracker.expire()
+                if expiry and (not next_expiry or expiry < next_expiry):
+                    next_expiry = expiry
+            # New names expire a full NEW_MEMBER_JOIN_TIME from now, so they
+            # never expire before the earliest name already tracked.
+            delay = next_expiry - time.monotonic() if next_expiry else None
+            await asyncio.sleep(max(delay or NEW_MEMBER_JOIN_TIME, 1))
 
     async def process_bot_member_kick(
         self, member: discord.Member, reason=None, ban=False
     ):
-        guild = member.guild
-        channel = guild.system_channel
-        _owner = guild.owner
-        if channel:
-            invite = await self.create_invite(channel)
-        else:
-            invite = None
+        # During a raid, flagged members are removed together
+        if self._raid_monitor(member.guild).active:
+            self._queue_raid_action(member, reason, ban)
+            return
+
+        invite = await self._bot_invite(member.guild)
+        removed = await self._remove_flagged_member(member, invite, reason, ban)
+
+        # Log if even log channel is set
+        event_log_channel = await self._event_log_channel(member.guild)
+        if event_log_channel:
+            await event_log_channel.send(
+                self._flagged_member_log(member, reason, ban, removed)
+            )
 
+    async def _remove_flagged_member(
+        self,
+        member: discord.Member,
+        invite: Optional[discord.Invite],
+        reason=None,
+        ban=False,
+    ) -> bool:
+        """Message a flagged member and kick or ban them, returning whether that succeeded"""
+        guild = member.guild
         action = "banned" if ban else "kicked"
         message = (
             "You have been flagged as a bot account and **{}** from **{}**. "
@@ -771,77 +913,108 @@ class ModeratorLink(commands.Cog):
         if reason:
             reason_note += f": {reason}"
 
-        # Kick or Ban members, log if even log channel is set
-        event_log_channel = await self._event_log_channel(member.guild)
         try:
             if ban:
                 await member.ban(reason=reason_note, delete_message_seconds=7 * 86400)
             else:
                 await member.kick(reason=reason_note)
-            if event_log_channel:
-                await event_log_channel.send(
-                    f"**{member.name}** (id: {member.id}) has been flagged as a bot account and **{action}** from the server (Reason: {reason})."
-                )
-        except Exception:
-            if event_log_channel:
-                await event_log_channel.send(
-                    f"**{member.name}** (id: {member.id}) has been flagged as a bot account, but an error occurred when **{action}ing** from the server (Reason: {reason})."
-                )
+        except Exception as exc:
+            log.warning(f"Unable to remove flagged member {member.id}: {exc}")
+            return False
+        return True
 
-    def cancel_all_tasks(self, guild=None):
-        guilds = [guild] if guild else self.bot.guilds
-        for guild in guilds:
-            for name, join_data in self.recently_joined_members[guild].items():
-                join_data["timeout"].cancel()
-            self.recently_joined_members[guild] = {}
+    def _flagged_member_log(
+        self, member: discord.Member, reason, ban: bool, removed: bool
+    ) -> str:
+        action = "banned" if ban else "kicked"
+        if removed:
+            return f"**{member.name}** (id: {member.id}) has been flagged as a bot account and **{action}** from the server (Reason: {reason})."
+        return f"**{member.name}** (id: {member.id}) has been flagged as a bot account, but an error occurred when **{action[:-2]}ing** from the server (Reason: {reason})."
+
+    def _queue_raid_action(self, member: discord.Member, reason, ban: bool):
+        pending = self.raid_actions.setdefault(member.guild.id, [])
+        pending.append((member, reason, ban))
+        if len(pending) == 1:
+            job_registry.start(
+                self._process_raid_actions(member.guild),
+                "Remove flagged raid members",
+                self.qualified_name,
+                guild=member.guild,
+            )
 
-    # endregion bot detection
+    async def _process_raid_actions(self, guild: discord.Guild):
+        """Remove every member flagged during the batch delay at once"""
+        await asyncio.sleep(RAID_BATCH_DELAY)
+        pending = self.raid_actions.pop(guild.id, [])
+        invite = await self._bot_invite(guild)
+        semaphore = asyncio.Semaphore(RAID_CONCURRENCY)
 
-    # region general helpers
-    async def _process_role_update(self, before: discord.Member, after: discord.Member):
-        event_log_channel = await self._event_log_channel(before.guild)
+        async def remove(action: Tuple[discord.Member, str, bool]) -> bool:
+            async with semaphore:
+                return await self._remove_flagged_member(action[0], invite, *action[1:])
+
+        results = await asyncio.gather(*(remove(action) for action in pending))
 
+        event_log_channel = await self._event_log_channel(guild)
         if not event_log_channel:
-            return False
+            return
+        message = f"**Raid mode:** removed {sum(results)}/{len(results)} flagged bot account(s)."
+        for (member, reason, ban), removed in zip(pending, results):
+            line = "\n" + self._flagged_member_log(member, reason, ban, removed)
+            if len(message) + len(line) > 2000:
+                await event_log_channel.send(message)
+                message = line.lstrip("\n")
+            else:
+                message += line
+        await event_log_channel.send(message)
 
-        removed_roles = list(set(before.roles) - set(after.roles))
-        added_roles = list(set(after.roles) - set(before.roles))
+    def clear_recent_joins(self, guild=None):
+        guilds = [guild] if guild else list(self.recently_joined_members)
+        for guild in guilds:
+            self._join_tracker(guild).clear()
 
-        other_guilds = before.mutual_guilds
-        other_guilds.remove(before.guild)
+    # endregion bot detection
 
-        if not removed_roles and not added_roles:
-            return
-        elif added_roles:
+    # region general helpers
+    async def _process_role_update(
+        self,
+        before: discord.Member,
+        added_roles: List[discord.Role],
+        removed_roles: List[discord.Role],
+    ):
+        other_guilds = await self._member_mutual_guilds(before)
+
+        if added_roles:
             await self._process_role_addition(added_roles, other_guilds, before)
-        elif removed_roles:
+        if removed_roles:
             await self._process_role_removal(removed_roles, other_guilds, before)
 
     async def _process_role_addition(
         self, added_roles, other_guilds, before: discord.Member
     ):
-        # # this will try to add a role from one guild to another. TODO: get matching role from each guild as well.
-        shared_role_names = await self._get_shared_role_names(before.guild)
+        await self._ensure_shared_roles(before.guild)
 
         log.debug("Processing shared role addition.")
-        log.debug(f"Shared Roles: {shared_role_names}")
         log.debug(f"Added Roles: {added_roles}")
 
         # Process Role Additions
         role_assign_msg = "Shared role {} added to {} [initiated from **{}**]"
 
         for role in added_roles:
-            if role.name in shared_role_names:
+            if self.shared_roles.is_shared(before.guild, role):
                 log.debug(f"Role {role.name} is a shared role")
                 for guild in other_guilds:
                     log.debug(f"Adding role {role.name} in guild {guild}")
-                    guild_role = await self._guild_sister_role(guild, role)
-                    guild_member = await self._guild_member_from_id(guild, before.id)
-                    channel = await self._event_log_channel(guild_member.guild)
-                    if guild_role and guild_role not in guild_member.roles and channel:
-                        await guild_member.add_roles(
-                            guild_role
-                        )  # This was sometimes None? added 'guild_role and' to condition
+                    guild_role = self.shared_roles.sister_role(guild, role)
+                    guild_member = guild.get_member(before.id)
+                    channel = await self._event_log_channel(guild)
+                    if (
+                        guild_role
+                        and guild_member
+                        and channel
+                        and not guild_member.get_role(guild_role.id)
+                    ):
+                        await guild_member.add_roles(guild_role)
                         await channel.send(
                             role_assign_msg.format(
                                 guild_role.mention,
@@ -853,25 +1026,28 @@ class ModeratorLink(commands.Cog):
     async def _process_role_removal(
         self, removed_roles, other_guilds, before: discord.Member
     ):
-        # # this will try to add a role from one guild to another. TODO: get matching role from each guild as well.
-        shared_role_names = await self._get_shared_role_names(before.guild)
+        await self._ensure_shared_roles(before.guild)
 
         log.debug("Processing shared role removal.")
-        log.debug(f"Shared Roles: {shared_role_names}")
         log.debug(f"Removed Roles: {removed_roles}")
 
         # Process Role Removals
         role_removal_msg = "Shared role {} removed from **{}** [initiated from **{}**]"
 
         for role in removed_roles:
-            if role.name in shared_role_names:
+            if self.shared_roles.is_shared(before.guild, role):
                 log.debug(f"Role {role.name} is a shared role")
                 for guild in other_guilds:
                     log.debug(f"Removing role {role.name} in guild {guild}")
-                    guild_role = await self._guild_sister_role(guild, role)
-                    guild_member = await self._guild_member_from_id(guild, before.id)
-                    channel = await self._event_log_channel(guild_member.guild)
-                    if guild_role in guild_member.roles and channel:
+                    guild_role = self.shared_roles.sister_role(guild, role)
+                    guild_member = guild.get_member(before.id)
+                    channel = await self._event_log_channel(guild)
+                    if (
+                        guild_role
+                        and guild_member
+                        and channel
+                        and guild_member.get_role(guild_role.id)
+                    ):
                         await guild_member.remove_roles(guild_role)
                         await channel.send(
                             role_removal_msg.format(
@@ -881,52 +1057,42 @@ class ModeratorLink(commands.Cog):
                             )
                         )
 
-    async def _guild_member_from_id(self, guild, member_id):
-        return guild.get_member(member_id)
-
     def _guild_role_from_name(self, guild, role_name):
         for role in guild.roles:
             if role.name == role_name:
                 return role
 
     async def _member_mutual_guilds(self, member: discord.Member):
-        mutual_guilds = []
-        for guild in self.bot.guilds:
-            if member in guild.members:
-                mutual_guilds.append(guild)
-        return mutual_guilds
+        """Guilds other than the member's own that the member is also in"""
+        return [
+            guild
+            for guild in mutual_guild_cache.guilds(self.bot, member.id)
+            if guild != member.guild
+        ]
 
-    async def _guild_sister_role(self, guild, sister_role):
-        for role in guild.roles:
-            if role.name == sister_role.name and role != sister_role:
-                return role
-        return None
+    async def _ensure_shared_roles(self, guild: discord.Guild):
+        """Load a guild's shared role names if the map has not seen it yet"""
+        if not self.shared_roles.is_loaded(guild):
+            names = await self._get_shared_role_names(guild)
+            self.shared_roles.set_names(guild, names, guilds=self.bot.guilds)
 
     # endregion general helpers
 
     # region nickname mgmt
     async def award_players(self, ctx, award, userList):
-        found = []
-        notFound = []
-        success_count = 0
-        failed = 0
-        for user in userList:
-            try:
-                member = await commands.MemberConverter().convert(ctx, user)
-                if member in ctx.guild.members:
-                    found.append(member)
-            except Exception:
-                notFound.append(user)
+        found, notFound, ambiguous = MemberIndex(ctx.guild).resolve_all(userList)
 
-        for player in found:
+        def add_award(player: discord.Member) -> str:
             prefix, nick, awards = self._get_name_components(player)
-            awards += award
-            new_name = self._generate_new_name(prefix, nick, awards)
-            try:
-                await player.edit(nick=new_name)
-                success_count += 1
-            except Exception:
-                failed += 1
+            return self._generate_new_name(prefix, nick, awards + award)
+
+        runner = BulkRunner(ctx, "Adding Awards")
+        updated, failures = await apply_nicknames(
+            runner, plan_nicknames(found, add_award)
+        )
+        await runner.finish()
+        success_count = len(updated)
+        failed = len(failures)
 
         message = ""
         if success_count:
@@ -935,6 +1101,9 @@ class ModeratorLink(commands.Cog):
         if notFound:
             message += f"\n:x: {len(notFound)} members could not be found."
 
+        if ambiguous:
+            message += f"\n:x: {len(ambiguous)} names matched more than one member."
+
         if failed:
             message += f"\n:x: Nicknames could not be changed for {failed} members."
 
@@ -953,15 +1122,12 @@ class ModeratorLink(commands.Cog):
         if b_nick == a_nick or not event_log_channel:
             return
 
-        mutual_guilds = await self._member_mutual_guilds(
-            before
-        )  # before.mutual_guilds not working
-        mutual_guilds.remove(before.guild)
+        mutual_guilds = await self._member_mutual_guilds(before)
 
         for guild in mutual_guilds:
             channel = await self._event_log_channel(guild)
             if channel:
-                guild_member = await self._guild_member_from_id(guild, before.id)
+                guild_member = guild.get_member(before.id)
                 guild_prefix, guild_nick, guild_awards = self._get_name_components(
                     guild_member
                 )
@@ -996,6 +1162,13 @@ class ModeratorLink(commands.Cog):
 
         return prefix.strip(), player_name.strip(), awards.strip()
 
+    def _remove_award(self, member: discord.Member, award: str) -> Optional[str]:
+        """Member nickname without any of the given award emoji"""
+        prefix, nick, awards = self._get_name_components(member)
+        if award not in awards:
+            return member.nick
+        return self._generate_new_name(prefix, nick, awards.replace(award, ""))
+
     def _generate_new_name(self, prefix, name, awards):
         new_name = f"{prefix} | {name}" if prefix else name
         if awards:
@@ -1023,15 +1196,21 @@ class ModeratorLink(commands.Cog):
 
     async def _save_blacklisted_names(self, guild: discord.Guild, name: str):
         await self.config.guild(guild).BlacklistedNames.set(name)
+        self.name_blacklists[guild.id] = NameBlacklist(name)
 
     async def _save_event_log_channel(self, guild: discord.Guild, event_channel: int):
         await self.config.guild(guild).EventLogChannel.set(event_channel)
-        # await self.config.guild(ctx.guild).TransChannel.set(trans_channel)
+        self.event_log_channels[guild.id] = event_channel
 
     async def _event_log_channel(
         self, guild: discord.Guild
     ) -> Optional[discord.TextChannel]:
-        return guild.get_channel(await self.config.guild(guild).EventLogChannel())
+        if guild.id not in self.event_log_channels:
+            self.event_log_channels[guild.id] = await self.config.guild(
+                guild
+            ).EventLogChannel()
+        channel_id = self.event_log_channels[guild.id]
+        return guild.get_channel(channel_id) if channel_id else None
 
     async def _save_mod_role(self, guild: discord.Guild, mod_role: int):
         await self.config.guild(guild).ModeratorRole.set(mod_role)
@@ -1043,6 +1222,7 @@ class ModeratorLink(commands.Cog):
         self, guild: discord.Guild, shared_role_names: List[str]
     ):
         await self.config.guild(guild).SharedRoles.set(shared_role_names)
+        self.shared_roles.set_names(guild, shared_role_names, guilds=self.bot.guilds)
 
     async def _get_shared_role_names(self, guild: discord.Guild) -> List[str]:
         return await self.config.guild(guild).SharedRoles()
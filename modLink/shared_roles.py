@@ -0,0 +1,75 @@
+import discord
+import logging
+
+from typing import Dict, Iterable, Optional, Set
+
+log = logging.getLogger("red.RSCBot.modLink.shared_roles")
+
+
+class SharedRoleMap:
+    """Shared role name -> {guild id: role id} across the guild network.
+
+    Each guild configures the names of the roles it shares. Every guild the
+    bot is in is indexed for the union of those names, so finding the sister
+    role of a shared role in another guild is a dictionary lookup instead of a
+    scan of that guild's roles. Keep it current by calling `index_guild` when
+    a guild's roles change and `set_names` when a guild's settings change.
+    """
+
+    def __init__(self):
+        self.names: Dict[int, Set[str]] = {}
+        self.roles: Dict[str, Dict[int, int]] = {}
+        self.shared_ids: Dict[int, Set[int]] = {}
+        self._all_names: Set[str] = set()
+
+    def set_names(self, guild: discord.Guild, names: Iterable[str], guilds=()):
+        """Update the shared role names of a guild and reindex `guilds`"""
+        self.names[guild.id] = set(names)
+        self._all_names = set().union(*self.names.values())
+        for indexed in guilds:
+            self.index_guild(indexed)
+        self._index_shared_ids(guild)
+
+    def forget_guild(self, guild: discord.Guild):
+        self.names.pop(guild.id, None)
+        self.shared_ids.pop(guild.id, None)
+        self._all_names = set().union(*self.names.values())
+        for by_guild in self.roles.values():
+            by_guild.pop(guild.id, None)
+
+    def index_guild(self, guild: discord.Guild):
+        for by_guild in self.roles.values():
+            by_guild.pop(guild.id, None)
+        # guild.roles is ordered by position, the lowest role of a name wins
+        for role in guild.roles:
+            if role.name in self._all_names:
+                self.roles.setdefault(role.name, {}).setdefault(guild.id, role.id)
+        self._index_shared_ids(guild)
+
+    def _index_shared_ids(self, guild: discord.Guild):
+        names = self.names.get(guild.id, ())
+        self.shared_ids[guild.id] = {r.id for r in guild.roles if r.name in names}
+
+    def is_loaded(self, guild: discord.Guild) -> bool:
+        return guild.id in self.names
+
+    def is_tracked_name(self, name: str) -> bool:
+        """Whether any guild shares a role with this name"""
+        return name in self._all_names
+
+    def shared_role_ids(self, guild: discord.Guild) -> Set[int]:
+        """Ids of every role `guild` shares, for filtering member updates"""
+        return self.shared_ids.get(guild.id, set())
+
+    def is_shared(self, guild: discord.Guild, role: discord.Role) -> bool:
+        """Whether `guild` shares `role` with the rest of the network"""
+        return role.name in self.names.get(guild.id, ())
+
+    def sister_role(
+        self, guild: discord.Guild, role: discord.Role
+    ) -> Optional[discord.Role]:
+        """The role with the same name as `role` in `guild`"""
+        role_id = self.roles.get(role.name, {}).get(guild.id)
+        if not role_id or role_id == role.id:
+            return None
+        return guild.get_role(role_id)
@@ -10,6 +10,8 @@ from redbot.core import checks
 
 from prefixManager.views import ClearPlayerPrefixView
 
+from utilities import BulkRunner, apply_nicknames, plan_nicknames
+
 log = logging.getLogger("red.RSCBot.prefixManager")
 
 defaults = {"Prefixes": {}}
@@ -142,18 +144,24 @@ class PrefixManager(commands.Cog):
         log.info(
             f"[{ctx.guild.name}] Clearing prefix from {len(league_role.members)} players"
         )
-        for member in league_role.members:
-            player_name = self.get_player_nickname(member)
-            await member.edit(nick=player_name)
+        changes = plan_nicknames(league_role.members, self.get_player_nickname)
+        runner = BulkRunner(ctx, "Clearing Player Prefixes")
+        updated, failed = await apply_nicknames(runner, changes)
+        await runner.finish()
 
         log.info(
-            f"[{ctx.guild.name}] Finished removing prefixes from {len(league_role.members)} players"
+            f"[{ctx.guild.name}] Finished removing prefixes from {len(updated)} players"
         )
         done_embed = discord.Embed(
             title="Player Prefixes Cleared",
-            description=f"Successfully cleared the franchise prefix from **{len(league_role.members)}** players.",
+            description=f"Successfully cleared the franchise prefix from **{len(updated)}** players.",
             color=discord.Color.blue(),
         )
+        if failed:
+            done_embed.add_field(
+                name="Failed",
+                value=f"Nicknames could not be changed for {len(failed)} players.",
+            )
         await clear_view.msg.edit(embed=done_embed, view=None)
 
     @commands.command()
@@ -287,3 +295,4 @@ class PrefixManager(commands.Cog):
 
     async def _save_prefixes(self, ctx, prefixes):
         await self.config.guild(ctx.guild).Prefixes.set(prefixes)
+        ctx.bot.dispatch("prefixes_update", ctx.guild)
@@ -0,0 +1,123 @@
+import discord
+import logging
+import re
+
+from rapidfuzz import fuzz, process
+
+from typing import Dict, List, Optional, Tuple, Union
+
+log = logging.getLogger("red.RSCBot.teamManager.resolver")
+
+TEAM_CUTOFF = 60.0
+TIER_CUTOFF = 75.0
+
+
+def normalize(name: str) -> str:
+    """Casefold and collapse whitespace so lookups ignore case and spacing"""
+    return " ".join(name.casefold().split())
+
+
+class TeamResolver:
+    """Prebuilt fuzzy lookup index for the teams and tiers of a single guild.
+
+    Every alias (team name, franchise name, franchise prefix, GM name combined
+    with a tier) is normalized once when the index is built so lookups only
+    pay for the rapidfuzz scorer.
+    """
+
+    def __init__(
+        self,
+        guild: discord.Guild,
+        teams: List[str],
+        tiers: List[str],
+        team_roles: Dict[str, dict],
+        franchise_roles: List[discord.Role],
+        prefixes: Dict[str, str],
+    ):
+        self.teams = list(teams)
+        self.tiers = list(tiers)
+
+        # normalized alias -> canonical team name
+        self.team_index: Dict[str, str] = {}
+        # normalized tier -> canonical tier name
+        self.tier_index: Dict[str, str] = {normalize(t): t for t in self.tiers}
+
+        for team in self.teams:
+            self.team_index[normalize(team)] = team
+
+        franchise_aliases = self._franchise_aliases(franchise_roles, prefixes)
+        for team in self.teams:
+            team_data = team_roles.get(team, {})
+            aliases = franchise_aliases.get(team_data.get("Franchise Role"), [])
+            tier_role = guild.get_role(team_data.get("Tier Role", 0))
+            if not tier_role:
+                continue
+            tier_name = tier_role.name
+            for alias in aliases:
+                # Team names always win over generated aliases
+                self.team_index.setdefault(normalize(f"{alias} {tier_name}"), team)
+
+        self._team_choices = list(self.team_index.keys())
+        self._tier_choices = list(self.tier_index.keys())
+
+    def _franchise_aliases(
+        self, franchise_roles: List[discord.Role], prefixes: Dict[str, str]
+    ) -> Dict[int, List[str]]:
+        lower_prefixes = {gm.casefold(): prefix for gm, prefix in prefixes.items()}
+        aliases = {}
+        for role in franchise_roles:
+            gm_match = re.findall(r"(?<=\().*(?=\))", role.name)
+            name_match = re.findall(r".+?(?= \()", role.name)
+            role_aliases = []
+            if name_match:
+                role_aliases.append(name_match[0])
+            if gm_match:
+                role_aliases.append(gm_match[0])
+                prefix = lower_prefixes.get(gm_match[0].casefold())
+                if prefix:
+                    role_aliases.append(prefix)
+            aliases[role.id] = role_aliases
+        return aliases
+
+    def match_team(
+        self, query: str, limit: int = 3
+    ) -> Tuple[Union[str, List[str]], bool]:
+        """Resolve a team from user input.
+
+        Returns ``(team, True)`` on an exact (normalized) match, otherwise the
+        best ranked suggestions and ``False``.
+        """
+        key = normalize(query)
+        team = self.team_index.get(key)
+        if team:
+            return team, True
+
+        results = process.extract(
+            key,
+            self._team_choices,
+            scorer=fuzz.WRatio,
+            limit=limit * 3,
+            score_cutoff=TEAM_CUTOFF,
+        )
+        suggestions = []
+        for choice, _, _ in results:
+            team = self.team_index[choice]
+            if team not in suggestions:
+                suggestions.append(team)
+            if len(suggestions) >= limit:
+                break
+        return suggestions, False
+
+    def match_tier(self, query: str) -> Optional[str]:
+        """Resolve a tier from user input, returning None if nothing is close"""
+        key = normalize(query)
+        tier = self.tier_index.get(key)
+        if tier:
+            return tier
+
+        result = process.extractOne(
+            key, self._tier_choices, scorer=fuzz.WRatio, score_cutoff=TIER_CUTOFF
+        )
+        if result:
+            return self.tier_index[result[0]]
+        return None
@@ -3,9 +3,11 @@ import discord
 import re
 import ast
 import asyncio
-import difflib
+import csv
+import io
+import json
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from redbot.core import Config
 from redbot.core import commands
@@ -13,7 +15,10 @@ from redbot.core import checks
 from redbot.core.utils.predicates import ReactionPredicate
 from redbot.core.utils.menus import start_adding_reactions
 
+from utilities import mutual_guild_cache
+
 from teamManager.embeds import ErrorEmbed
+from teamManager.resolver import TeamResolver
 from teamManager.views import (
     AddFranchiseView,
     RemoveFranchiseView,
@@ -29,6 +34,7 @@ log = logging.getLogger("red.RSCBot.teamManager")
 
 defaults = {"Tiers": [], "Teams": [], "Team_Roles": {}}
 verify_timeout = 30
+import_role_concurrency = 5
 
 
 class TeamManager(commands.Cog):
@@ -51,6 +57,8 @@ class TeamManager(commands.Cog):
             self, identifier=1234567892, force_registration=True
         )
         self.config.register_guild(**defaults)
+        self._resolvers = {}
+        self._embed_cache = {}
 
     @property
     def prefix_cog(self) -> "PrefixManager":
@@ -317,6 +325,65 @@ class TeamManager(commands.Cog):
         )
         await ctx.send(embed=add_embed)
 
+    @commands.command(aliases=["bulkAddTeams"])
+    @commands.guild_only()
+    @checks.admin_or_permissions(manage_guild=True)
+    async def importTeams(self, ctx: commands.Context):
+        """Add or update teams in bulk from an attached CSV or JSON file.
+
+        Each row needs a team name, GM name and tier. CSV files may start with a
+        `team_name,gm_name,tier` header. JSON files must hold a list of
+        `["<team_name>", "<gm_name>", "<tier>"]` lists or objects with those keys.
+
+        Every row is validated before anything is saved. Missing tiers are
+        created along with their FA role, and all team data is saved at once.
+
+        Examples:
+        ```
+        [p]importTeams  (with teams.csv attached)
+        ```
+        """
+        if not ctx.message.attachments:
+            await ctx.send(
+                embed=ErrorEmbed(description="Please attach a CSV or JSON file.")
+            )
+            return
+
+        attachment = ctx.message.attachments[0]
+        try:
+            rows = self._parse_team_import(attachment.filename, await attachment.read())
+        except (ValueError, UnicodeDecodeError) as exc:
+            await ctx.send(
+                embed=ErrorEmbed(
+                    description=f"Unable to read **{attachment.filename}**: {exc}"
+                )
+            )
+            return
+
+        async with ctx.typing():
+            added, updated, unchanged, rejected = await self._import_teams(ctx, rows)
+
+        report = []
+        report.extend(f"+ {line}" for line in added)
+        report.extend(f"~ {line}" for line in updated)
+        report.extend(f"x {line}" for line in rejected)
+
+        import_embed = discord.Embed(
+            title="Teams Imported",
+            description=f"Added: **{len(added)}**\n"
+            f"Updated: **{len(updated)}**\n"
+            f"Unchanged: **{len(unchanged)}**\n"
+            f"Rejected: **{len(rejected)}**",
+            color=discord.Color.red() if rejected else discord.Color.blue(),
+        )
+        report_file = None
+        if report:
+            report_file = discord.File(
+                io.BytesIO("\n".join(report).encode("utf-8")),
+                filename="team_import_report.txt",
+            )
+        await ctx.send(embed=import_embed, file=report_file)
+
     @commands.command()
     @commands.guild_only()
     @checks.admin_or_permissions(manage_guild=True)
@@ -742,6 +809,53 @@ class TeamManager(commands.Cog):
             embed = discord.Embed(title=title, description=output, color=de_role.color)
             await ctx.send(embed=embed)
 
+    # Listeners
+    @commands.Cog.listener("on_guild_role_create")
+    @commands.Cog.listener("on_guild_role_delete")
+    async def _on_role_created_or_deleted(self, role: discord.Role):
+        self._invalidate_team_caches(role.guild)
+
+    @commands.Cog.listener("on_guild_role_update")
+    async def _on_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            self._invalidate_team_caches(after.guild)
+        elif before.color != after.color:
+            self._invalidate_embed_cache(after.guild)
+
+    @commands.Cog.listener("on_member_update")
+    async def _on_member_update(self, before: discord.Member, after: discord.Member):
+        # Only franchise members can show up in rendered rosters or captain lists
+        if not (
+            self.get_current_franchise_role(before)
+            or self.get_current_franchise_role(after)
+        ):
+            return
+        if before.roles != after.roles or before.display_name != after.display_name:
+            self._invalidate_embed_cache(after.guild)
+
+    @commands.Cog.listener("on_user_update")
+    async def _on_user_update(self, before: discord.User, after: discord.User):
+        # Username and global display name changes do not fire on_member_update
+        if before.name == after.name and before.global_name == after.global_name:
+            return
+        for guild in mutual_guild_cache.guilds(self.bot, after.id):
+            member = guild.get_member(after.id)
+            if member and self.get_current_franchise_role(member):
+                self._invalidate_embed_cache(guild)
+
+    @commands.Cog.listener("on_member_remove")
+    async def _on_member_remove(self, member: discord.Member):
+        if self.get_current_franchise_role(member):
+            self._invalidate_embed_cache(member.guild)
+
+    @commands.Cog.listener("on_guild_emojis_update")
+    async def _on_emojis_update(self, guild: discord.Guild, before, after):
+        self._invalidate_embed_cache(guild)
+
+    @commands.Cog.listener("on_prefixes_update")
+    async def _on_prefixes_update(self, guild: discord.Guild):
+        self._invalidate_team_caches(guild)
+
     # Helper Functions
 
     async def _react_prompt(self, ctx, prompt, if_not_msg=None):
@@ -862,6 +976,11 @@ class TeamManager(commands.Cog):
         return team_members
 
     async def create_roster_embed(self, ctx, team_name):
+        cache_key = ("roster", team_name)
+        embed = self._cached_embed(ctx.guild, cache_key)
+        if embed:
+            return embed
+
         franchise_role, tier_role = await self._roles_for_team(ctx, team_name)
         message = await self.format_roster_info(ctx, team_name)
 
@@ -871,7 +990,7 @@ class TeamManager(commands.Cog):
             embed.set_thumbnail(url=emoji.url)
         else:
             embed.set_thumbnail(url=ctx.guild.icon.url)
-        return embed
+        return self._cache_embed(ctx.guild, cache_key, embed)
 
     async def format_roster_info(self, ctx, team_name: str):
         franchise_role, tier_role = await self._roles_for_team(ctx, team_name)
@@ -901,6 +1020,11 @@ class TeamManager(commands.Cog):
         return message
 
     async def _format_franchise_captains(self, ctx, franchise_role: discord.Role):
+        cache_key = ("franchise_captains", franchise_role.id)
+        embed = self._cached_embed(ctx.guild, cache_key)
+        if embed:
+            return embed
+
         teams = await self._find_teams_for_franchise(ctx, franchise_role)
         captains_username = []
         team_names = []
@@ -947,9 +1071,14 @@ class TeamManager(commands.Cog):
             embed.set_thumbnail(url=emoji.url)
         else:
             embed.set_thumbnail(url=ctx.guild.icon.url)
-        return embed
+        return self._cache_embed(ctx.guild, cache_key, embed)
 
     async def _format_tier_captains(self, ctx, tier: str):
+        cache_key = ("tier_captains", tier.lower())
+        embed = self._cached_embed(ctx.guild, cache_key)
+        if embed:
+            return embed
+
         tier_role = self._get_tier_role(ctx, tier)
         teams = await self._find_teams_for_tier(ctx, tier)
         captains = []
@@ -995,7 +1124,7 @@ class TeamManager(commands.Cog):
             value="{}\n".format("\n".join(captains_formatted)),
             inline=True,
         )  # name="Username"
-        return embed
+        return self._cache_embed(ctx.guild, cache_key, embed)
 
     async def _get_team_captain(
         self, ctx, franchise_role: discord.Role, tier_role: discord.Role
@@ -1125,6 +1254,7 @@ class TeamManager(commands.Cog):
 
     async def _save_tiers(self, ctx, tiers):
         await self.config.guild(ctx.guild).Tiers.set(tiers)
+        self._invalidate_team_caches(ctx.guild)
 
     def _extract_tier_from_role(self, team_role):
         tier_matches = re.findall(r"\w*\b(?=\))", team_role.name)
@@ -1183,6 +1313,152 @@ class TeamManager(commands.Cog):
         await self._save_team_roles(ctx, team_roles)
         return True
 
+    def _parse_team_import(self, filename: str, data: bytes):
+        """Parse an import attachment into (row number, team, gm, tier) tuples"""
+        text = data.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            entries = json.loads(text)
+            if not isinstance(entries, list):
+                raise ValueError("JSON file must contain a list of teams.")
+        else:
+            entries = list(csv.reader(io.StringIO(text)))
+            if entries and [col.strip().lower() for col in entries[0]] == [
+                "team_name",
+                "gm_name",
+                "tier",
+            ]:
+                entries = entries[1:]
+
+        rows = []
+        for number, entry in enumerate(entries, start=1):
+            if not isinstance(entry, (dict, list)):
+                raise ValueError(f"Entry {number} must be a list or an object.")
+            if isinstance(entry, dict):
+                entry = [entry.get(k) for k in ("team_name", "gm_name", "tier")]
+            if not entry:
+                continue
+            values = [str(value).strip() if value else "" for value in entry]
+            values += [""] * (3 - len(values))
+            rows.append((number, *values[:3]))
+        return rows
+
+    async def _import_teams(self, ctx, rows):
+        """Validate and save imported teams with a single config write.
+
+        Returns lists of added, updated, unchanged and rejected team descriptions.
+        """
+        guild_data = await self.config.guild(ctx.guild).all()
+        tier_names = {tier.lower(): tier for tier in guild_data["Tiers"]}
+        existing_teams = {team.lower(): team for team in guild_data["Teams"]}
+        roles_by_name = {role.name.lower(): role for role in ctx.guild.roles}
+        franchise_roles = {}
+        for role in self._get_all_franchise_roles(ctx):
+            gm_name = re.findall(r"(?<=\().*(?=\))", role.name)[0]
+            franchise_roles[gm_name.lower()] = role
+
+        # Validate everything before touching the guild or config
+        valid = []
+        rejected = []
+        new_tiers = {}
+        seen = set()
+        for number, team_name, gm_name, tier in rows:
+            errors = []
+            if not team_name:
+                errors.append("team name not found")
+            elif team_name.lower() in seen:
+                errors.append("duplicate team in file")
+            if not gm_name:
+                errors.append("GM name not found")
+            elif gm_name.lower() not in franchise_roles:
+                errors.append(f"franchise role not found for GM {gm_name}")
+            if not tier:
+                errors.append("tier not found")
+            if errors:
+                rejected.append(
+                    f"row {number} ({team_name or '-'}): {', '.join(errors)}"
+                )
+                continue
+
+            seen.add(team_name.lower())
+            if tier.lower() not in tier_names:
+                new_tiers.setdefault(tier.lower(), tier)
+            valid.append((team_name, franchise_roles[gm_name.lower()], tier.lower()))
+
+        # Create roles for new tiers concurrently
+        missing_roles = []
+        for tier_key, tier in new_tiers.items():
+            for role_name in (tier, f"{tier}FA"):
+                if role_name.lower() not in roles_by_name:
+                    missing_roles.append((tier_key, role_name))
+
+        semaphore = asyncio.Semaphore(import_role_concurrency)
+
+        async def create_role(role_name: str):
+            async with semaphore:
+                return await ctx.guild.create_role(name=role_name)
+
+        results = await asyncio.gather(
+            *(create_role(role_name) for _, role_name in missing_roles),
+            return_exceptions=True,
+        )
+        created = {}
+        failed_tiers = set()
+        for (tier_key, role_name), result in zip(missing_roles, results):
+            if isinstance(result, Exception):
+                failed_tiers.add(tier_key)
+                rejected.append(f"{role_name}: unable to create role ({result})")
+            else:
+                created.setdefault(tier_key, []).append(result)
+
+        # A tier is only added with both of its roles; undo partially created ones
+        for tier_key, roles in created.items():
+            if tier_key in failed_tiers:
+                for role in roles:
+                    try:
+                        await role.delete()
+                    except discord.HTTPException as exc:
+                        rejected.append(f"{role.name}: unable to remove role ({exc})")
+                continue
+            for role in roles:
+                roles_by_name[role.name.lower()] = role
+        for tier_key in failed_tiers:
+            del new_tiers[tier_key]
+        for team_name, _, tier_key in valid:
+            if tier_key in failed_tiers:
+                rejected.append(f"{team_name}: tier roles could not be created")
+        valid = [team for team in valid if team[2] not in failed_tiers]
+
+        added = []
+        updated = []
+        unchanged = []
+        async with self.config.guild(ctx.guild).all() as data:
+            data["Tiers"].extend(new_tiers.values())
+            for team_name, franchise_role, tier_key in valid:
+                tier_role = roles_by_name.get(tier_key)
+                if not tier_role:
+                    rejected.append(f"{team_name}: tier role not found")
+                    continue
+                summary = f"{team_name} ({franchise_role.name} - {tier_role.name})"
+                team_data = {
+                    self.FRANCHISE_ROLE_KEY: franchise_role.id,
+                    self.TIER_ROLE_KEY: tier_role.id,
+                }
+
+                existing = existing_teams.get(team_name.lower())
+                if existing is None:
+                    data["Teams"].append(team_name)
+                    added.append(summary)
+                elif data["Team_Roles"].get(existing) == team_data:
+                    unchanged.append(summary)
+                    continue
+                else:
+                    updated.append(summary)
+                    team_name = existing
+                data["Team_Roles"][team_name] = team_data
+
+        self._invalidate_team_caches(ctx.guild)
+        return added, updated, unchanged, rejected
+
     async def _remove_team(self, ctx, team_name: str) -> bool:
         try:
             franchise_role, tier_role = await self._roles_for_team(ctx, team_name)
@@ -1208,12 +1484,14 @@ class TeamManager(commands.Cog):
 
     async def _save_teams(self, ctx, teams):
         await self.config.guild(ctx.guild).Teams.set(teams)
+        self._invalidate_team_caches(ctx.guild)
 
     async def _team_roles(self, ctx):
         return await self.config.guild(ctx.guild).Team_Roles()
 
     async def _save_team_roles(self, ctx, team_roles):
         await self.config.guild(ctx.guild).Team_Roles.set(team_roles)
+        self._invalidate_team_caches(ctx.guild)
 
     def _find_role(self, ctx, role_id):
         for role in ctx.guild.roles:
@@ -1355,22 +1633,50 @@ class TeamManager(commands.Cog):
         end_of_name = franchise_role.name.rindex("(") - 1
         return franchise_role.name[0:end_of_name]
 
+    async def _resolver(self, ctx) -> TeamResolver:
+        """Return the guild's team/tier resolver, building it if it was invalidated"""
+        resolver = self._resolvers.get(ctx.guild.id)
+        if resolver is None:
+            resolver = TeamResolver(
+                ctx.guild,
+                await self._teams(ctx),
+                await self.tiers(ctx),
+                await self._team_roles(ctx),
+                self._get_all_franchise_roles(ctx),
+                await self.prefix_cog._prefixes(ctx) if self.prefix_cog else {},
+            )
+            self._resolvers[ctx.guild.id] = resolver
+        return resolver
+
+    def _invalidate_resolver(self, guild: discord.Guild):
+        self._resolvers.pop(guild.id, None)
+
+    def _cached_embed(self, guild: discord.Guild, key) -> Optional[discord.Embed]:
+        """Copy of a rendered embed, so callers can't change the cached one"""
+        embed = self._embed_cache.get(guild.id, {}).get(key)
+        return embed.copy() if embed else None
+
+    def _cache_embed(
+        self, guild: discord.Guild, key, embed: discord.Embed
+    ) -> discord.Embed:
+        self._embed_cache.setdefault(guild.id, {})[key] = embed
+        return embed.copy()
+
+    def _invalidate_embed_cache(self, guild: discord.Guild):
+        self._embed_cache.pop(guild.id, None)
+
+    def _invalidate_team_caches(self, guild: discord.Guild):
+        """Drop everything derived from team config or role names"""
+        self._invalidate_resolver(guild)
+        self._invalidate_embed_cache(guild)
+
     async def _match_team_name(self, ctx, team_name):
-        teams = await self._teams(ctx)
-        for team in teams:
-            if team_name.lower() == team.lower():
-                return team, True
-        return difflib.get_close_matches(team_name, teams, n=3, cutoff=0.4), False
+        resolver = await self._resolver(ctx)
+        return resolver.match_team(team_name)
 
     async def _match_tier_name(self, ctx, tier_name):
-        tiers = await self.tiers(ctx)
-        for tier in tiers:
-            if tier_name.lower() == tier.lower():
-                return tier
-        close_match = difflib.get_close_matches(tier_name, tiers, n=1, cutoff=0.6)
-        if len(close_match) > 0:
-            return close_match[0]
-        return None
+        resolver = await self._resolver(ctx)
+        return resolver.match_tier(tier_name)
 
     async def _find_teams_for_tier(self, ctx, tier):
         teams_in_tier = []
@@ -0,0 +1,99 @@
+import asyncio
+import discord
+import logging
+import time
+
+from typing import Dict, List, Optional
+
+log = logging.getLogger("red.RSCBot.transactions.announcer")
+
+# Seconds to wait for more transactions before posting a batch
+flush_delay = 2.0
+# Seconds after the first queued line by which a batch is posted regardless
+max_flush_delay = 10.0
+message_max_length = 2000
+
+
+class TransactionAnnouncer:
+    """Batches transaction announcements per channel.
+
+    Lines are queued with `announce` and posted together once no new line has
+    been queued for `flush_delay` seconds, once `max_flush_delay` seconds have
+    passed since the first line of the batch, or immediately with `flush`. Each
+    post packs as many lines as fit in a single message.
+    """
+
+    def __init__(self, delay: float = flush_delay, max_delay: float = max_flush_delay):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending: Dict[int, List[str]] = {}
+        self._started: Dict[int, float] = {}
+        self._channels: Dict[int, discord.TextChannel] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def announce(self, channel: discord.TextChannel, line: str):
+        """Queue a line for the channel and (re)start its flush timer"""
+        now = time.monotonic()
+        self._channels[channel.id] = channel
+        self._pending.setdefault(channel.id, []).append(line)
+        started = self._started.setdefault(channel.id, now)
+        delay = max(0.0, min(self.delay, started + self.max_delay - now))
+        timer = self._timers.get(channel.id)
+        if timer:
+            timer.cancel()
+        self._timers[channel.id] = asyncio.create_task(
+            self._flush_later(channel.id, delay)
+        )
+
+    async def flush(self, channel: Optional[discord.TextChannel] = None):
+        """Post everything queued for the channel (or every channel) now"""
+        channel_ids = [channel.id] if channel else list(self._pending)
+        for channel_id in channel_ids:
+            timer = self._timers.pop(channel_id, None)
+            if timer:
+                timer.cancel()
+            await self._send_pending(channel_id)
+
+    def close(self):
+        """Post anything still queued without waiting for the timers"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        if self._pending:
+            asyncio.create_task(self.flush())
+
+    async def _flush_later(self, channel_id: int, delay: float):
+        await asyncio.sleep(delay)
+        self._timers.pop(channel_id, None)
+        await self._send_pending(channel_id)
+
+    async def _send_pending(self, channel_id: int):
+        lock = self._locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            lines = self._pending.pop(channel_id, [])
+            self._started.pop(channel_id, None)
+            channel = self._channels.get(channel_id)
+            if not lines or not channel:
+                return
+            for content in self._pack(lines):
+                try:
+                    await channel.send(content)
+                except discord.HTTPException as exc:
+                    log.error(
+                        f"Failed to post transactions to {channel.name}: {type(exc)} {exc}"
+                    )
+
+    @staticmethod
+    def _pack(lines: List[str]) -> List[str]:
+        messages = []
+        message = ""
+        for line in lines:
+            line = line[:message_max_length]
+            if message and len(message) + len(line) + 1 > message_max_length:
+                messages.append(message)
+                message = ""
+            message = f"{message}\n{line}" if message else line
+        if message:
+            messages.append(message)
+        return messages
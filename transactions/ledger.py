@@ -0,0 +1,158 @@
+import asyncio
+import aiosqlite
+import datetime
+import logging
+
+from pathlib import Path
+from typing import List, Optional
+
+log = logging.getLogger("red.RSCBot.transactions.ledger")
+
+# Rows returned by a query unless a different limit is passed
+ledger_query_limit = 500
+
+LEDGER_COLUMNS = [
+    "id",
+    "created_at",
+    "action",
+    "player_id",
+    "player_name",
+    "team",
+    "franchise",
+    "tier",
+    "details",
+    "actor_id",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    action TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    team TEXT,
+    franchise TEXT COLLATE NOCASE,
+    tier TEXT COLLATE NOCASE,
+    details TEXT,
+    actor_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_player
+    ON transactions (guild_id, player_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_franchise
+    ON transactions (guild_id, franchise, created_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_tier
+    ON transactions (guild_id, tier, created_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_date
+    ON transactions (guild_id, created_at);
+"""
+
+
+class TransactionLedger:
+    """Append-only SQLite record of every roster transaction.
+
+    Rows are never updated or deleted. Timestamps are stored as ISO-8601 UTC
+    strings so they sort and compare correctly as text.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def _connection(self) -> aiosqlite.Connection:
+        async with self._lock:
+            if self._db is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = await aiosqlite.connect(self.path)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.executescript(SCHEMA)
+                await db.commit()
+                db.row_factory = aiosqlite.Row
+                self._db = db
+            return self._db
+
+    async def close(self):
+        async with self._lock:
+            if self._db is not None:
+                await self._db.close()
+                self._db = None
+
+    async def record(
+        self,
+        guild_id: int,
+        action: str,
+        player_id: int,
+        player_name: str,
+        team: Optional[str] = None,
+        franchise: Optional[str] = None,
+        tier: Optional[str] = None,
+        details: Optional[str] = None,
+        actor_id: Optional[int] = None,
+    ):
+        db = await self._connection()
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        )
+        await db.execute(
+            "INSERT INTO transactions (guild_id, created_at, action, player_id,"
+            " player_name, team, franchise, tier, details, actor_id)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                guild_id,
+                created_at,
+                action,
+                player_id,
+                player_name,
+                team,
+                franchise,
+                tier,
+                details,
+                actor_id,
+            ),
+        )
+        await db.commit()
+
+    async def query(
+        self,
+        guild_id: int,
+        player_id: Optional[int] = None,
+        franchise: Optional[str] = None,
+        tier: Optional[str] = None,
+        action: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        limit: Optional[int] = ledger_query_limit,
+    ) -> List[aiosqlite.Row]:
+        """Return matching rows, newest first (all of them if `limit` is None)"""
+        clauses = ["guild_id = ?"]
+        params = [guild_id]
+        if player_id is not None:
+            clauses.append("player_id = ?")
+            params.append(player_id)
+        if franchise:
+            clauses.append("franchise = ?")
+            params.append(franchise)
+        if tier:
+            clauses.append("tier = ?")
+            params.append(tier)
+        if action:
+            clauses.append("action = ?")
+            params.append(action.lower())
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(
+                since.astimezone(datetime.timezone.utc).isoformat(timespec="seconds")
+            )
+
+        sql = (
+            f"SELECT {', '.join(LEDGER_COLUMNS)} FROM transactions"
+            f" WHERE {' AND '.join(clauses)} ORDER BY created_at DESC, id DESC"
+        )
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        db = await self._connection()
+        async with db.execute(sql, params) as cursor:
+            return await cursor.fetchall()
@@ -1,4 +1,7 @@
+import asyncio
+import csv
 import discord
+import io
 import logging
 import datetime
 import re
@@ -6,11 +9,15 @@ import re
 from redbot.core import Config
 from redbot.core import commands
 from redbot.core import checks
+from redbot.core.data_manager import cog_data_path
 
+from .announcer import TransactionAnnouncer
+from .ledger import LEDGER_COLUMNS, TransactionLedger, ledger_query_limit
 from .transStringTemplates import TransactionsStringsTemplates as stringTemplates
 from teamManager import TeamManager
 from prefixManager import PrefixManager
 from dmHelper import DMHelper
+from utilities import BulkRunner, MemberEdit, MemberIndex, audit_log_cache
 
 from transactions.embeds import ErrorEmbed
 
@@ -28,6 +35,9 @@ defaults = {
     "TransRole": None,
 }
 
+# Rows shown by the ledger query commands
+ledger_display_limit = 25
+
 
 class Transactions(commands.Cog):
     """Used to set franchise and role prefixes and give to members in those franchises or with those roles"""
@@ -48,6 +58,13 @@ class Transactions(commands.Cog):
             self, identifier=1234567895, force_registration=True
         )
         self.config.register_guild(**defaults)
+        self.announcer = TransactionAnnouncer()
+        self.ledger = TransactionLedger(cog_data_path(self) / "ledger.db")
+
+    def cog_unload(self):
+        """Post any queued transaction announcements and close the ledger"""
+        self.announcer.close()
+        asyncio.create_task(self.ledger.close())
 
     # region properties
     @property
@@ -82,7 +99,6 @@ class Transactions(commands.Cog):
         """Displays each member that can be found from the userList a Free Agent in their respective tier"""
         if not ctx.guild:
             return
-        empty = True
         fa_role = self.team_manager_cog._find_role_by_name(ctx, "Free Agent")
         league_role = self.team_manager_cog._find_role_by_name(ctx, "League")
 
@@ -98,87 +114,79 @@ class Transactions(commands.Cog):
             title="Expire Contract Results", colour=discord.Colour.blue()
         )
 
-        not_found_list = []
+        # Resolve every user before touching anyone
+        members, not_found_list, ambiguous = MemberIndex(ctx.guild).resolve_all(
+            userList
+        )
+        for user in not_found_list:
+            log.debug(f"{user} not found... skipping.")
+
         no_franchise_list = []
+        franchise_members = []
+        for member in members:
+            if self.team_manager_cog.get_current_franchise_role(member):
+                franchise_members.append(member)
+            else:
+                log.debug(f"{member} has no franchise role... skipping.")
+                no_franchise_list.append(member.display_name)
 
-        for user in userList:
-            try:
-                member: discord.Member = await commands.MemberConverter().convert(
-                    ctx, user
+        # Role lookups shared by every member
+        tiers = await self.team_manager_cog.tiers(ctx)
+        tier_fa_roles = {
+            tier.lower(): self.team_manager_cog._find_role_by_name(ctx, f"{tier}FA")
+            for tier in tiers
+        }
+        gms = {}
+        no_tier_list = []
+        nick_forbidden_list = []
+
+        async def expire(member: discord.Member) -> bool:
+            franchise_role = self.team_manager_cog.get_current_franchise_role(member)
+            tier_role = next((r for r in member.roles if r.name in tiers), None)
+            if not tier_role:
+                log.debug(f"{member} has no tier role... skipping.")
+                no_tier_list.append(member.display_name)
+                return False
+
+            # get team/franchise info before role removal
+            teams = await self.team_manager_cog.teams_for_user(ctx, member)
+            if len(teams) <= 0:
+                return False
+            team = teams[0]
+            if franchise_role.id not in gms:
+                gms[franchise_role.id] = await self.team_manager_cog._get_gm(
+                    franchise_role
                 )
-            except Exception:
-                log.debug(f"{user} not found... skipping.")
-                not_found_list.append(user)
-                continue
+            gm: discord.Member = gms[franchise_role.id]
+
+            # performs role and name updates in a single edit
+            prefix, name, awards = self._get_name_components(member)
+            edit = MemberEdit(member)
+            edit.remove_roles(franchise_role, *roles_to_remove)
+            edit.add_roles(
+                league_role, fa_role, tier_fa_roles.get(tier_role.name.lower())
+            )
+            edit.set_nick(self._generate_new_name("FA", name, awards))
+            # Reported once in the result embed instead of once per member
+            await edit.apply()
+            if edit.nick_failed:
+                nick_forbidden_list.append(member.display_name)
 
-            # Process Contract expiration
-            # For each user in guild
-            if member in ctx.guild.members:
-                # prep roles to remove
-                franchise_role = self.team_manager_cog.get_current_franchise_role(
-                    member
-                )
-                # Skip if player does not have a franchise role.
-                if not franchise_role:
-                    log.debug(f"{member} has no franchise role... skipping.")
-                    no_franchise_list.append(member.display_name)
-                    continue
-                removable_roles = [franchise_role] if franchise_role else []
-                for role in roles_to_remove:
-                    if role in member.roles:
-                        removable_roles.append(role)
-
-                # prep roles to add
-                tier_role = await self.team_manager_cog.get_current_tier_role(
-                    ctx, member
-                )
+            transaction_msg = f"Contract with {member.mention} and {team} has expired ({gm.mention} - {tier_role.name})"
+
+            self.announcer.announce(trans_channel, transaction_msg)
+            await self._record_transaction(
+                ctx, "expire", member, team, franchise_role, tier_role
+            )
+            # await self.send_player_expire_contract_message(ctx, member, franchise_role, team, gm)
+            return True
+
+        runner = BulkRunner(ctx, "Expiring Contracts")
+        results = await runner.run(franchise_members, expire)
+        await self.announcer.flush(trans_channel)
+        expireCount = sum(1 for r in results if r.value)
+        failed_list = [r.item.display_name for r in results if r.error]
 
-                if tier_role:
-                    tier_fa_role: discord.Role = (
-                        self.team_manager_cog._find_role_by_name(
-                            ctx, tier_role.name + "FA"
-                        )
-                    )
-                    add_roles = [league_role, fa_role, tier_fa_role]
-                else:
-                    add_roles = [league_role, fa_role]
-
-                # get team/franchise info before role removal
-                try:
-                    teams = await self.team_manager_cog.teams_for_user(ctx, member)
-                except Exception as exc:
-                    log.error(f"Error fetching teams for {member}. {type(exc)} {exc}")
-                    continue
-                if len(teams) <= 0:
-                    continue
-                team = teams[0]
-                # gm_name = await self.team_manager_cog._get_gm_name(franchise_role)
-                # franchise_name = self.team_manager_cog.get_franchise_name_from_role(franchise_role)
-                # gm: discord.Member = self.team_manager_cog._find_member_by_name(ctx, gm_name)
-                gm: discord.Member = await self.team_manager_cog._get_gm(franchise_role)
-
-                # performs role updates
-                await member.remove_roles(*removable_roles)
-                await member.add_roles(*add_roles)
-
-                # Updates Name
-                prefix, name, awards = self._get_name_components(member)
-                new_name = self._generate_new_name("FA", name, awards)
-
-                if member.nick != new_name:
-                    try:
-                        await member.edit(nick=new_name)
-                    except Exception:
-                        pass
-
-                transaction_msg = f"Contract with {member.mention} and {team} has expired ({gm.mention} - {tier_role.name})"
-
-                await trans_channel.send(transaction_msg)
-                # await self.send_player_expire_contract_message(ctx, member, franchise_role, team, gm)
-
-                empty = False
-
-        expireCount = len(userList) - len(not_found_list) - len(no_franchise_list)
         if not not_found_list:
             not_found_list.append("None")
         if not no_franchise_list:
@@ -190,8 +198,22 @@ class Transactions(commands.Cog):
         message.add_field(
             name="No Franchise Role", value="\n".join(no_franchise_list), inline=True
         )
+        if no_tier_list:
+            message.add_field(
+                name="No Tier Role", value="\n".join(no_tier_list), inline=True
+            )
+        if ambiguous:
+            message.add_field(name="Ambiguous", value="\n".join(ambiguous), inline=True)
+        if failed_list:
+            message.add_field(name="Failed", value="\n".join(failed_list), inline=True)
+        if nick_forbidden_list:
+            message.add_field(
+                name="Nickname Change Forbidden",
+                value="\n".join(nick_forbidden_list),
+                inline=True,
+            )
 
-        if empty:
+        if not expireCount:
             message.description = "No users have been set as a free agent."
             message.colour = discord.Colour.red()
         else:
@@ -200,7 +222,7 @@ class Transactions(commands.Cog):
         message.set_footer(
             text=f"{expireCount}/{len(userList)} users have been set as a free agent."
         )
-        await ctx.send(embed=message)
+        await runner.finish(message)
 
     @commands.guild_only()
     @commands.command()
@@ -219,10 +241,12 @@ class Transactions(commands.Cog):
         )
         gm_name = await self._get_gm_name(franchise_role)
         if franchise_role in user.roles:
+            action = "keep"
             message = "Round {0} Pick {1}: {2} was kept by {3} ({4} - {5})".format(
                 round, pick, user.mention, team_name, gm_name, tier_role.name
             )
         else:
+            action = "draft"
             message = "Round {0} Pick {1}: {2} was drafted by {3} ({4} - {5})".format(
                 round, pick, user.mention, team_name, gm_name, tier_role.name
             )
@@ -230,19 +254,26 @@ class Transactions(commands.Cog):
         trans_channel = await self._trans_channel(ctx.guild)
         if trans_channel is not None:
             try:
-                await self.add_player_to_team(ctx, user, team_name)
+                edit = MemberEdit(user)
+                await self.add_player_to_team(ctx, user, team_name, edit=edit)
                 free_agent_roles = await self.find_user_free_agent_roles(ctx, user)
-                await trans_channel.send(message)
                 draftEligibleRole = None
                 for role in user.roles:
                     if role.name == "Draft Eligible":
                         draftEligibleRole = role
                         break
-                if len(free_agent_roles) > 0:
-                    for role in free_agent_roles:
-                        await user.remove_roles(role)
-                if draftEligibleRole is not None:
-                    await user.remove_roles(draftEligibleRole)
+                edit.remove_roles(*free_agent_roles, draftEligibleRole)
+                await self._apply_edit(ctx, edit)
+                self.announcer.announce(trans_channel, message)
+                await self._record_transaction(
+                    ctx,
+                    action,
+                    user,
+                    team_name,
+                    franchise_role,
+                    tier_role,
+                    details=f"Round {round} Pick {pick}",
+                )
                 await ctx.send("Done")
             except KeyError:
                 await ctx.send(":x: Free agent role not found in dictionary")
@@ -280,16 +311,19 @@ class Transactions(commands.Cog):
         trans_channel = await self._trans_channel(ctx.guild)
         if trans_channel is not None:
             try:
-                await self.add_player_to_team(ctx, user, team_name)
+                edit = MemberEdit(user)
+                await self.add_player_to_team(ctx, user, team_name, edit=edit)
                 free_agent_roles = await self.find_user_free_agent_roles(ctx, user)
-                if len(free_agent_roles) > 0:
-                    for role in free_agent_roles:
-                        await user.remove_roles(role)
+                edit.remove_roles(*free_agent_roles)
+                await self._apply_edit(ctx, edit)
                 gm_name = await self._get_gm_name(franchise_role)
                 message = "{0} was signed by {1} ({2} - {3})".format(
                     user.mention, team_name, gm_name, tier_role.name
                 )
-                await trans_channel.send(message)
+                self.announcer.announce(trans_channel, message)
+                await self._record_transaction(
+                    ctx, "sign", user, team_name, franchise_role, tier_role
+                )
                 await ctx.send("Done")
             except Exception as e:
                 await ctx.send(e)
@@ -320,16 +354,19 @@ class Transactions(commands.Cog):
 
         if franchise_role not in user.roles or tier_role not in user.roles:
             try:
-                await self.add_player_to_team(ctx, user, team_name)
+                edit = MemberEdit(user)
+                await self.add_player_to_team(ctx, user, team_name, edit=edit)
                 free_agent_roles = await self.find_user_free_agent_roles(ctx, user)
-                if len(free_agent_roles) > 0:
-                    for role in free_agent_roles:
-                        await user.remove_roles(role)
+                edit.remove_roles(*free_agent_roles)
+                await self._apply_edit(ctx, edit)
             except Exception as e:
                 await ctx.send(e)
 
         if trans_channel:
-            await trans_channel.send(message)
+            self.announcer.announce(trans_channel, message)
+            await self._record_transaction(
+                ctx, "resign", user, team_name, franchise_role, tier_role
+            )
             await ctx.send("Done")
         else:
             await ctx.send(
@@ -356,7 +393,8 @@ class Transactions(commands.Cog):
             return
 
         try:
-            await self.remove_player_from_team(ctx, user, team_name)
+            edit = MemberEdit(user)
+            await self.remove_player_from_team(ctx, user, team_name, edit=edit)
             # Add FA role is user is not a GM.
             if not self.team_manager_cog.is_gm(user):
                 if tier_fa_role is None:
@@ -374,16 +412,17 @@ class Transactions(commands.Cog):
                 dev_league_role = self.team_manager_cog._find_role_by_name(
                     ctx, self.DEV_LEAGUE_ROLE
                 )
-                if dev_league_role is not None:
-                    await user.add_roles(dev_league_role)
-
-                await self.team_manager_cog._set_user_nickname_prefix(ctx, "FA", user)
-                await user.add_roles(tier_fa_role, fa_role)
+                edit.add_roles(dev_league_role, tier_fa_role, fa_role)
+                edit.set_nick(self._prefixed_nickname("FA", user))
+            await self._apply_edit(ctx, edit)
             gm_name = await self._get_gm_name(franchise_role)
             message = (
                 f"{user.mention} was cut by {team_name} ({gm_name} - {tier_role.name})"
             )
-            await trans_channel.send(message)
+            self.announcer.announce(trans_channel, message)
+            await self._record_transaction(
+                ctx, "cut", user, team_name, franchise_role, tier_role
+            )
 
             franchise_name = self.team_manager_cog.get_franchise_name_from_role(
                 franchise_role
@@ -392,7 +431,9 @@ class Transactions(commands.Cog):
                 ctx, ctx.author, gm_name, franchise_name, team_name, tier_role.name
             )
             if cut_embed:
-                await self.dm_helper_cog.add_to_dm_queue(user, embed=cut_embed)
+                await self.dm_helper_cog.add_to_dm_queue(
+                    user, embed=cut_embed, priority=True
+                )
 
             await ctx.send("Done")
         except KeyError:
@@ -433,10 +474,14 @@ class Transactions(commands.Cog):
 
         trans_channel = await self._trans_channel(ctx.guild)
         if trans_channel is not None:
-            await self.remove_player_from_team(ctx, user, new_team_name_2)
-            await self.remove_player_from_team(ctx, user_2, new_team_name)
-            await self.add_player_to_team(ctx, user, new_team_name)
-            await self.add_player_to_team(ctx, user_2, new_team_name_2)
+            edit = MemberEdit(user)
+            edit_2 = MemberEdit(user_2)
+            await self.remove_player_from_team(ctx, user, new_team_name_2, edit=edit)
+            await self.remove_player_from_team(ctx, user_2, new_team_name, edit=edit_2)
+            await self.add_player_to_team(ctx, user, new_team_name, edit=edit)
+            await self.add_player_to_team(ctx, user_2, new_team_name_2, edit=edit_2)
+            await self._apply_edit(ctx, edit)
+            await self._apply_edit(ctx, edit_2)
             message = (
                 "{0} was traded by {1} ({4} - {5}) to {2} ({6} - {7}) for {3}".format(
                     user.mention,
@@ -449,7 +494,25 @@ class Transactions(commands.Cog):
                     tier_role_1.name,
                 )
             )
-            await trans_channel.send(message)
+            self.announcer.announce(trans_channel, message)
+            await self._record_transaction(
+                ctx,
+                "trade",
+                user,
+                new_team_name,
+                franchise_role_1,
+                tier_role_1,
+                details=f"Traded for {user_2.display_name} ({user_2.id})",
+            )
+            await self._record_transaction(
+                ctx,
+                "trade",
+                user_2,
+                new_team_name_2,
+                franchise_role_2,
+                tier_role_2,
+                details=f"Traded for {user.display_name} ({user.id})",
+            )
             await ctx.send("Done")
 
     @commands.guild_only()
@@ -489,21 +552,24 @@ class Transactions(commands.Cog):
         franchise_role, team_tier_role = await self.team_manager_cog._roles_for_team(
             ctx, team_name
         )
+        edit = MemberEdit(user)
         # End Substitution
         if franchise_role in user.roles and team_tier_role in user.roles:
             if list(set([free_agent_role, perm_fa_role]) & set(user.roles)):
-                await user.remove_roles(franchise_role)
+                edit.remove_roles(franchise_role)
                 team_tier_fa_role = self.team_manager_cog._find_role_by_name(
                     ctx, "{0}FA".format(team_tier_role)
                 )
                 if team_tier_fa_role not in user.roles:
                     player_tier = await self.get_tier_role_for_fa(ctx, user)
-                    await user.remove_roles(team_tier_role)
-                    await user.add_roles(player_tier)
+                    edit.remove_roles(team_tier_role).add_roles(player_tier)
             else:
-                await user.remove_roles(team_tier_role)
+                edit.remove_roles(team_tier_role)
+            await self._apply_edit(ctx, edit)
             gm = await self._get_gm_name(franchise_role)
             message = f"{user.mention} has finished their time as a substitute for {team_name} ({gm} - {team_tier_role.name})"
+            action = "sub_end"
+            details = None
             # Removed subbed out role from all team members on team
             subbed_out_role = self.team_manager_cog._find_role_by_name(
                 ctx, self.SUBBED_OUT_ROLE
@@ -523,10 +589,16 @@ class Transactions(commands.Cog):
         else:
             if list(set([free_agent_role, perm_fa_role]) & set(user.roles)):
                 player_tier = await self.get_tier_role_for_fa(ctx, user)
-                await user.remove_roles(player_tier)
-            await user.add_roles(franchise_role, team_tier_role, leagueRole)
+                edit.remove_roles(player_tier)
+            edit.add_roles(franchise_role, team_tier_role, leagueRole)
+            await self._apply_edit(ctx, edit)
             gm = await self._get_gm_name(franchise_role)
+            action = "sub"
+            details = None
             if subbed_out_user:
+                details = (
+                    f"Subbing for {subbed_out_user.display_name} ({subbed_out_user.id})"
+                )
                 message = f"{user.mention} was signed to a temporary contract by {team_name}, subbing for {subbed_out_user.mention} ({gm} - {team_tier_role.name})"
             else:
                 message = f"{user.mention} was signed to a temporary contract by {team_name} ({gm} - {team_tier_role.name})"
@@ -547,7 +619,16 @@ class Transactions(commands.Cog):
                         description="The subbed out role is not configured in this server."
                     )
                 )
-        await trans_channel.send(message)
+        self.announcer.announce(trans_channel, message)
+        await self._record_transaction(
+            ctx,
+            action,
+            user,
+            team_name,
+            franchise_role,
+            team_tier_role,
+            details=details,
+        )
         await ctx.send("Done")
 
     @commands.guild_only()
@@ -569,8 +650,10 @@ class Transactions(commands.Cog):
 
             trans_channel = await self._trans_channel(ctx.guild)
             if trans_channel:
-                await self.remove_player_from_team(ctx, user, old_team_name)
-                await self.add_player_to_team(ctx, user, team_name)
+                edit = MemberEdit(user)
+                await self.remove_player_from_team(ctx, user, old_team_name, edit=edit)
+                await self.add_player_to_team(ctx, user, team_name, edit=edit)
+                await self._apply_edit(ctx, edit)
                 franchise_role, tier_role = await self.team_manager_cog._roles_for_team(
                     ctx, team_name
                 )
@@ -578,7 +661,16 @@ class Transactions(commands.Cog):
                 message = "{0} was promoted to the {1} ({2} - {3})".format(
                     user.mention, team_name, gm_name, tier_role.name
                 )
-                await trans_channel.send(message)
+                self.announcer.announce(trans_channel, message)
+                await self._record_transaction(
+                    ctx,
+                    "promote",
+                    user,
+                    team_name,
+                    franchise_role,
+                    tier_role,
+                    details=f"Promoted from {old_team_name}",
+                )
                 await ctx.send("Done")
         else:
             await ctx.send(
@@ -950,6 +1042,89 @@ class Transactions(commands.Cog):
                 )
             )
 
+    @commands.guild_only()
+    @commands.group(name="ledger", aliases=["transactionLedger"])
+    async def _ledger(self, ctx: commands.Context) -> None:
+        """Search the transaction ledger"""
+        pass
+
+    @_ledger.command(name="player")
+    async def _ledger_player(
+        self,
+        ctx: commands.Context,
+        player: discord.Member,
+        action: Optional[str] = None,
+        days: Optional[int] = None,
+    ):
+        """Show transactions for a player, optionally filtered by action (sign, cut, trade, ...) and the last number of days"""
+        action, days = self._ledger_filters(action, days)
+        rows = await self.ledger.query(
+            ctx.guild.id,
+            player_id=player.id,
+            action=action,
+            since=self._ledger_since(days),
+        )
+        await self._send_ledger_results(
+            ctx, f"Transactions: {player.display_name}", rows
+        )
+
+    @_ledger.command(name="franchise")
+    async def _ledger_franchise(
+        self,
+        ctx: commands.Context,
+        franchise: str,
+        action: Optional[str] = None,
+        days: Optional[int] = None,
+    ):
+        """Show transactions for a franchise, optionally filtered by action and the last number of days"""
+        action, days = self._ledger_filters(action, days)
+        rows = await self.ledger.query(
+            ctx.guild.id,
+            franchise=franchise,
+            action=action,
+            since=self._ledger_since(days),
+        )
+        await self._send_ledger_results(ctx, f"Transactions: {franchise}", rows)
+
+    @_ledger.command(name="tier")
+    async def _ledger_tier(
+        self,
+        ctx: commands.Context,
+        tier: str,
+        action: Optional[str] = None,
+        days: Optional[int] = None,
+    ):
+        """Show transactions for a tier, optionally filtered by action and the last number of days"""
+        action, days = self._ledger_filters(action, days)
+        rows = await self.ledger.query(
+            ctx.guild.id, tier=tier, action=action, since=self._ledger_since(days)
+        )
+        await self._send_ledger_results(ctx, f"Transactions: {tier}", rows)
+
+    @_ledger.command(name="recent")
+    async def _ledger_recent(self, ctx: commands.Context, days: int = 7):
+        """Show transactions from the last number of days (Default: 7)"""
+        rows = await self.ledger.query(ctx.guild.id, since=self._ledger_since(days))
+        await self._send_ledger_results(ctx, f"Transactions: Last {days} Day(s)", rows)
+
+    @_ledger.command(name="export")
+    @checks.admin_or_permissions(manage_roles=True)
+    async def _ledger_export(self, ctx: commands.Context, days: Optional[int] = None):
+        """Export the transaction ledger as a CSV file, optionally limited to the last number of days"""
+        rows = await self.ledger.query(
+            ctx.guild.id, since=self._ledger_since(days), limit=None
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(LEDGER_COLUMNS)
+        for row in reversed(rows):
+            writer.writerow([row[column] for column in LEDGER_COLUMNS])
+        data = io.BytesIO(buffer.getvalue().encode("utf-8"))
+        await ctx.send(
+            f"Exported {len(rows)} transaction(s).",
+            file=discord.File(data, filename="transaction_ledger.csv"),
+        )
+
     async def get_audit_log_reason(
         self,
         guild: discord.Guild,
@@ -957,22 +1132,14 @@ class Transactions(commands.Cog):
         action: discord.AuditLogAction,
     ) -> Tuple[Optional[discord.abc.User], Optional[str]]:
         """Retrieve audit log reason for `discord.AuditLogAction`"""
-        perp = None
-        reason = None
         if not isinstance(target, int):
             target_id = target.id
         else:
             target_id = target
-        if guild.me.guild_permissions.view_audit_log:
-            async for log in guild.audit_logs(limit=5, action=action):
-                if not log.target:
-                    continue
-                if log.target.id == target_id:
-                    perp = log.user
-                    if log.reason:
-                        reason = log.reason
-                    break
-        return perp, reason
+        entry = await audit_log_cache.lookup(guild, target_id, action)
+        if not entry:
+            return None, None
+        return entry.user, entry.reason or None
 
     # Settings
 
@@ -1258,10 +1425,110 @@ class Transactions(commands.Cog):
 
         return embed
 
-    async def add_player_to_team(self, ctx, user, team_name):
+    async def _record_transaction(
+        self,
+        ctx: commands.Context,
+        action: str,
+        user: discord.Member,
+        team_name: Optional[str] = None,
+        franchise_role: Optional[discord.Role] = None,
+        tier_role: Optional[discord.Role] = None,
+        details: Optional[str] = None,
+    ):
+        """Append a transaction to the ledger. Failures are logged, never raised."""
+        franchise = None
+        if franchise_role:
+            franchise = self.team_manager_cog.get_franchise_name_from_role(
+                franchise_role
+            )
+        try:
+            await self.ledger.record(
+                ctx.guild.id,
+                action,
+                user.id,
+                self.team_manager_cog.get_player_nickname(user),
+                team=team_name,
+                franchise=franchise,
+                tier=tier_role.name if tier_role else None,
+                details=details,
+                actor_id=ctx.author.id,
+            )
+        except Exception as exc:
+            log.error(f"Failed to record {action} for {user.id}: {type(exc)} {exc}")
+
+    def _format_ledger_rows(self, rows) -> str:
+        lines = []
+        for row in rows:
+            line = (
+                f"`{row['created_at'][:10]}` **{row['action']}** {row['player_name']}"
+            )
+            if row["team"]:
+                line += f" - {row['team']}"
+            if row["tier"]:
+                line += f" ({row['tier']})"
+            if row["details"]:
+                line += f" - {row['details']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    async def _send_ledger_results(self, ctx: commands.Context, title: str, rows):
+        if not rows:
+            await ctx.send(
+                embed=discord.Embed(
+                    title=title,
+                    description="No transactions found.",
+                    color=discord.Color.orange(),
+                )
+            )
+            return
+
+        shown = rows[:ledger_display_limit]
+        description = self._format_ledger_rows(shown)
+        while len(description) > 4096:
+            shown = shown[:-1]
+            description = self._format_ledger_rows(shown)
+        embed = discord.Embed(
+            title=title, description=description, color=discord.Color.blue()
+        )
+        total = f"{len(rows)}+" if len(rows) >= ledger_query_limit else len(rows)
+        embed.set_footer(text=f"Showing {len(shown)} of {total} transaction(s).")
+        await ctx.send(embed=embed)
+
+    async def _apply_edit(self, ctx, edit: MemberEdit) -> discord.Member:
+        member = await edit.apply()
+        if edit.nick_failed:
+            await ctx.send(
+                f"Changing nickname forbidden for user: **{edit.member.name}**"
+            )
+        return member
+
+    def _ledger_filters(
+        self, action: Optional[str], days: Optional[int]
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """Treat a lone number given in place of the action as the number of days"""
+        if action and action.isdigit() and days is None:
+            return None, int(action)
+        return action, days
+
+    def _ledger_since(self, days: Optional[int]) -> Optional[datetime.datetime]:
+        if not days:
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        return now - datetime.timedelta(days=days)
+
+    async def add_player_to_team(
+        self, ctx, user, team_name, edit: Optional[MemberEdit] = None
+    ):
+        """Add the team roles and franchise prefix to a user.
+
+        If `edit` is provided the changes are only staged on it, otherwise they
+        are applied immediately.
+        """
         franchise_role, tier_role = await self.team_manager_cog._roles_for_team(
             ctx, team_name
         )
+        apply = edit is None
+        edit = edit or MemberEdit(user)
         leagueRole = self.team_manager_cog._find_role_by_name(ctx, "League")
         if leagueRole is not None:
             prefix = await self.prefix_cog._get_franchise_prefix(ctx, franchise_role)
@@ -1270,11 +1537,24 @@ class Transactions(commands.Cog):
                     ctx, user
                 )
                 if currentTier is not None and currentTier != tier_role:
-                    await user.remove_roles(currentTier)
-                await self.team_manager_cog._set_user_nickname_prefix(ctx, prefix, user)
-                await user.add_roles(tier_role, leagueRole, franchise_role)
+                    edit.remove_roles(currentTier)
+                edit.set_nick(self._prefixed_nickname(prefix, user))
+                edit.add_roles(tier_role, leagueRole, franchise_role)
+        if apply:
+            await self._apply_edit(ctx, edit)
 
-    async def remove_player_from_team(self, ctx, user: discord.Member, team_name: str):
+    async def remove_player_from_team(
+        self,
+        ctx,
+        user: discord.Member,
+        team_name: str,
+        edit: Optional[MemberEdit] = None,
+    ):
+        """Remove a user from a team.
+
+        If `edit` is provided the changes are only staged on it, otherwise they
+        are applied immediately.
+        """
         franchise_role, tier_role = await self.team_manager_cog._roles_for_team(
             ctx, team_name
         )
@@ -1287,12 +1567,16 @@ class Transactions(commands.Cog):
             await ctx.send(embed=errorEmbed)
             return
 
+        apply = edit is None
+        edit = edit or MemberEdit(user)
         if self.team_manager_cog.is_gm(user):
             # For GMs remove the tier role
-            await user.remove_roles(tier_role)
+            edit.remove_roles(tier_role)
         elif franchise_role is not None:
             # For regular players remove the franchise role
-            await user.remove_roles(franchise_role)
+            edit.remove_roles(franchise_role)
+        if apply:
+            await self._apply_edit(ctx, edit)
 
     async def find_user_free_agent_roles(self, ctx, user):
         free_agent_roles = await self.get_free_agent_roles(ctx)
@@ -1318,6 +1602,12 @@ class Transactions(commands.Cog):
     async def set_user_nickname_prefix(self, ctx, prefix: str, user: discord.member):
         return self.team_manager_cog._set_user_nickname_prefix(ctx, prefix, user)
 
+    def _prefixed_nickname(self, prefix: Optional[str], user: discord.Member) -> str:
+        """Nickname for the user with the given prefix (same format as teamManager)"""
+        if prefix:
+            return f"{prefix} | {self.get_player_nickname(user)}"
+        return self.get_player_nickname(user)
+
     async def get_tier_role_for_fa(self, ctx, user: discord.Member):
         fa_roles = await self.find_user_free_agent_roles(ctx, user)
         standard_fa_role = self.team_manager_cog._find_role_by_name(ctx, "Free Agent")
@@ -1345,7 +1635,9 @@ class Transactions(commands.Cog):
         message = message.replace("[p]", command_prefix)
         message = message_title + message
 
-        await self.dm_helper_cog.add_to_dm_queue(member, content=message, ctx=ctx)
+        await self.dm_helper_cog.add_to_dm_queue(
+            member, content=message, ctx=ctx, priority=True
+        )
 
     async def send_player_expire_contract_message(
         self,
@@ -1374,7 +1666,9 @@ class Transactions(commands.Cog):
         if ctx.guild.icon.url:
             embed.set_thumbnail(url=ctx.guild.icon.url)
 
-        await self.dm_helper_cog.add_to_dm_queue(member=player, embed=embed, ctx=ctx)
+        await self.dm_helper_cog.add_to_dm_queue(
+            member=player, embed=embed, ctx=ctx, priority=True
+        )
 
     def _get_name_components(self, member: discord.Member):
         if member.nick:
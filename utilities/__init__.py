@@ -1,5 +1,33 @@
 import discord
 
+from .audit_log import AuditLogCache, audit_log_cache
+from .bulk import BulkResult, BulkRunner
+from .jobs import Job, JobRegistry, job_registry
+from .member_edit import MemberEdit
+from .member_index import MemberIndex, MemberResolution, player_name
+from .mutual_guilds import MutualGuildCache, mutual_guild_cache
+from .nicknames import NicknameChange, apply_nicknames, plan_nicknames
+
+__all__ = [
+    "AuditLogCache",
+    "BulkResult",
+    "BulkRunner",
+    "Job",
+    "JobRegistry",
+    "MemberEdit",
+    "MemberIndex",
+    "MemberResolution",
+    "MutualGuildCache",
+    "NicknameChange",
+    "apply_nicknames",
+    "audit_log_cache",
+    "job_registry",
+    "mutual_guild_cache",
+    "plan_nicknames",
+    "player_name",
+    "remove_prefix",
+]
+
 
 async def remove_prefix(member: discord.Member) -> str:
     """Remove team prefix from guild members display name"""
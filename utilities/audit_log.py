@@ -0,0 +1,107 @@
+import asyncio
+import discord
+import logging
+import time
+
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+log = logging.getLogger("red.RSCBot.utilities.audit_log")
+
+# Entries requested when a guild/action tail is fetched for the first time
+audit_log_limit = 50
+# Minimum seconds between two fetches of the same guild/action tail; a miss
+# within this window waits for it to pass and fetches again
+audit_log_refresh = 1.0
+# Entries older than this are dropped from the cache
+audit_log_retention = timedelta(minutes=10)
+
+CacheKey = Tuple[int, discord.AuditLogAction]
+
+
+class AuditLogCache:
+    """Shared cache of the most recent audit log entries per guild and action.
+
+    A burst of events (e.g. a mass kick) costs at most one audit log request
+    per `audit_log_refresh` seconds: the first lookup fetches the tail of the
+    log, later lookups are answered from the index by target id, and a miss
+    only fetches entries newer than the newest one already cached.
+    """
+
+    def __init__(self):
+        self._entries: Dict[CacheKey, Dict[int, discord.AuditLogEntry]] = {}
+        self._latest: Dict[CacheKey, int] = {}
+        self._fetched_at: Dict[CacheKey, float] = {}
+        self._locks: Dict[CacheKey, asyncio.Lock] = {}
+
+    async def lookup(
+        self, guild: discord.Guild, target_id: int, action: discord.AuditLogAction
+    ) -> Optional[discord.AuditLogEntry]:
+        """Return the newest entry for `action` against `target_id`, if any.
+
+        A miss is only trusted once the audit log has been fetched after the
+        lookup started. Misses within `audit_log_refresh` of the last fetch
+        wait out the rest of that window and fetch again.
+        """
+        if not guild.me.guild_permissions.view_audit_log:
+            return None
+
+        requested_at = time.monotonic()
+        key = (guild.id, action)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entries = self._entries.get(key, {})
+            entry = entries.get(target_id)
+            if (
+                entry
+                and entry.created_at < discord.utils.utcnow() - audit_log_retention
+            ):
+                del entries[target_id]
+                entry = None
+            fetched_at = self._fetched_at.get(key, 0.0)
+            if entry or fetched_at >= requested_at:
+                return entry
+
+            wait = fetched_at + audit_log_refresh - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self._refresh(guild, key)
+            except discord.HTTPException as exc:
+                log.warning(f"Unable to fetch audit log for {guild.name}: {exc}")
+                return None
+            return self._entries[key].get(target_id)
+
+    def clear(self, guild: Optional[discord.Guild] = None):
+        for key in list(self._entries):
+            if guild is None or key[0] == guild.id:
+                del self._entries[key]
+                self._latest.pop(key, None)
+                self._fetched_at.pop(key, None)
+
+    async def _refresh(self, guild: discord.Guild, key: CacheKey):
+        started_at = time.monotonic()
+        entries = self._entries.setdefault(key, {})
+        latest = self._latest.get(key)
+        if latest:
+            history = guild.audit_logs(
+                limit=None, action=key[1], after=discord.Object(id=latest)
+            )
+        else:
+            history = guild.audit_logs(limit=audit_log_limit, action=key[1])
+
+        async for entry in history:
+            if not entry.target:
+                continue
+            current = entries.get(entry.target.id)
+            if not current or entry.id > current.id:
+                entries[entry.target.id] = entry
+            self._latest[key] = max(self._latest.get(key, 0), entry.id)
+        self._fetched_at[key] = started_at
+
+        cutoff = discord.utils.utcnow() - audit_log_retention
+        for target_id, entry in list(entries.items()):
+            if entry.created_at < cutoff:
+                del entries[target_id]
+
+
+audit_log_cache = AuditLogCache()
@@ -0,0 +1,176 @@
+import asyncio
+import discord
+import logging
+import time
+
+from .jobs import job_registry
+
+from typing import Any, Awaitable, Callable, Iterable, List, NamedTuple, Optional
+
+log = logging.getLogger("red.RSCBot.utilities.bulk")
+
+# Member edits share the per-guild members route bucket, so more than a handful
+# of requests in flight only queues up inside discord.py's rate limiter.
+bulk_concurrency = 5
+# Minimum seconds between edits of the live progress embed
+progress_interval = 2.0
+# Attempts for a single item that keeps hitting 429 responses
+max_attempts = 3
+# Items processed between two checkpoints of a resumable run
+checkpoint_size = 50
+
+
+class BulkResult(NamedTuple):
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class BulkRunner:
+    """Runs one coroutine per item with bounded concurrency.
+
+    Progress is reported by editing a single embed in the destination channel
+    (usually the invoking context), which can be replaced by the final result
+    embed with `finish`.
+
+    Long runs can pass a `checkpoint` coroutine, which is awaited with each
+    completed chunk of items so the caller can persist a resume cursor, and
+    can be stopped between items with `cancel`.
+
+    Example:
+        runner = BulkRunner(ctx, "Retiring Players")
+        results = await runner.run(members, self._retire_member)
+        await runner.finish(result_embed)
+    """
+
+    def __init__(
+        self,
+        destination: discord.abc.Messageable,
+        title: str,
+        concurrency: int = bulk_concurrency,
+        update_interval: float = progress_interval,
+    ):
+        self.destination = destination
+        self.title = title
+        self.concurrency = concurrency
+        self.update_interval = update_interval
+        self.message: Optional[discord.Message] = None
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.cancelled = False
+        # Mirror progress onto the tracked job this runner executes in, if any
+        self.job = job_registry.current()
+        self._last_update = 0.0
+        self._updating = False
+
+    def cancel(self):
+        """Stop the run; items already in flight are allowed to finish"""
+        self.cancelled = True
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        worker: Callable[[Any], Awaitable[Any]],
+        checkpoint: Optional[Callable[[List[Any]], Awaitable[None]]] = None,
+        already_done: int = 0,
+        already_failed: int = 0,
+    ) -> List[BulkResult]:
+        """Process every item, returning one result per item that was started.
+
+        `already_done`/`already_failed` seed the progress counts when resuming
+        a run that was checkpointed earlier.
+        """
+        items = list(items)
+        self.total = already_done + len(items)
+        self.done = already_done
+        self.failed = already_failed
+        await self._update_progress(force=True)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(item) -> Optional[BulkResult]:
+            async with semaphore:
+                if self.cancelled:
+                    return None
+                result = await self._attempt(item, worker)
+            self.done += 1
+            if result.error:
+                self.failed += 1
+            if self.job:
+                self.job.progress = f"{self.done}/{self.total}"
+            await self._update_progress()
+            return result
+
+        chunk_size = checkpoint_size if checkpoint else max(len(items), 1)
+        results = []
+        for idx in range(0, len(items), chunk_size):
+            if self.cancelled:
+                break
+            chunk = items[idx : idx + chunk_size]
+            chunk_results = await asyncio.gather(*(run_one(item) for item in chunk))
+            results += [r for r in chunk_results if r is not None]
+            if checkpoint and not self.cancelled:
+                await checkpoint(chunk)
+        return results
+
+    async def finish(self, embed: Optional[discord.Embed] = None):
+        """Replace the progress embed with the final result (or final counts)"""
+        if embed is None:
+            embed = self._progress_embed(final=True)
+        if self.message:
+            try:
+                await self.message.edit(embed=embed)
+                return
+            except discord.HTTPException:
+                pass
+        await self.destination.send(embed=embed)
+
+    async def _attempt(self, item, worker) -> BulkResult:
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return BulkResult(item, await worker(item))
+            except discord.HTTPException as exc:
+                # discord.py already retries 429s internally; back off further if
+                # the route is still exhausted rather than failing the item.
+                if exc.status == 429 and attempt < max_attempts:
+                    await asyncio.sleep(attempt * 2)
+                    continue
+                log.error(f"{self.title}: failed for {item}. {type(exc)} {exc}")
+                return BulkResult(item, error=exc)
+            except Exception as exc:
+                log.error(f"{self.title}: failed for {item}. {type(exc)} {exc}")
+                return BulkResult(item, error=exc)
+
+    def _progress_embed(self, final: bool = False) -> discord.Embed:
+        description = f"Processed **{self.done}/{self.total}** member(s)."
+        if final and self.cancelled:
+            description += " Cancelled."
+        elif not final:
+            description += " This can take a bit..."
+        embed = discord.Embed(
+            title=self.title,
+            description=description,
+            color=discord.Color.blue() if final else discord.Color.yellow(),
+        )
+        if self.failed:
+            embed.set_footer(text=f"{self.failed} failure(s)")
+        return embed
+
+    async def _update_progress(self, force: bool = False):
+        now = time.monotonic()
+        if not force and (
+            self._updating or now - self._last_update < self.update_interval
+        ):
+            return
+        self._updating = True
+        self._last_update = now
+        try:
+            if self.message:
+                await self.message.edit(embed=self._progress_embed())
+            else:
+                self.message = await self.destination.send(embed=self._progress_embed())
+        except discord.HTTPException as exc:
+            log.debug(f"Unable to update progress for {self.title}: {exc}")
+        finally:
+            self._updating = False
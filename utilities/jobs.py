@@ -0,0 +1,131 @@
+import asyncio
+import discord
+import itertools
+import logging
+import time
+
+from collections import deque
+from typing import Coroutine, Deque, Dict, List, Optional
+
+log = logging.getLogger("red.RSCBot.utilities.jobs")
+
+# Finished jobs kept around so failures can still be inspected
+finished_job_history = 25
+
+
+class Job:
+    """A tracked background task"""
+
+    def __init__(
+        self,
+        job_id: int,
+        name: str,
+        owner: str,
+        task: asyncio.Task,
+        guild: Optional[discord.Guild] = None,
+    ):
+        self.id = job_id
+        self.name = name
+        self.owner = owner
+        self.task = task
+        self.guild_id = guild.id if guild else None
+        self.progress: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "running"
+        if self.task.cancelled():
+            return "cancelled"
+        return "failed" if self.error else "done"
+
+    def cancel(self) -> bool:
+        return self.task.cancel()
+
+
+class JobRegistry:
+    """Shared registry of long-running background tasks across cogs.
+
+    Cogs start tasks through `start` instead of `asyncio.create_task` so that
+    operators can see what is running, how long it has taken and why it
+    failed, and cogs can cancel everything they own in `cog_unload`.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._running: Dict[int, Job] = {}
+        self._by_task: Dict[asyncio.Task, Job] = {}
+        self._finished: Deque[Job] = deque(maxlen=finished_job_history)
+
+    def start(
+        self,
+        coro: Coroutine,
+        name: str,
+        owner: str,
+        guild: Optional[discord.Guild] = None,
+    ) -> Job:
+        task = asyncio.create_task(coro)
+        job = Job(next(self._ids), name, owner, task, guild=guild)
+        self._running[job.id] = job
+        self._by_task[task] = job
+        task.add_done_callback(self._on_done)
+        return job
+
+    def current(self) -> Optional[Job]:
+        """The job wrapping the running task, if it is tracked"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return None
+        return self._by_task.get(task)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        job = self._running.get(job_id)
+        if job:
+            return job
+        return next((j for j in self._finished if j.id == job_id), None)
+
+    def running(
+        self, owner: Optional[str] = None, guild: Optional[discord.Guild] = None
+    ) -> List[Job]:
+        return [
+            job
+            for job in self._running.values()
+            if (owner is None or job.owner == owner)
+            and (guild is None or job.guild_id in (None, guild.id))
+        ]
+
+    def finished(self) -> List[Job]:
+        return list(self._finished)
+
+    def cancel(self, job_id: int) -> bool:
+        job = self._running.get(job_id)
+        return job.cancel() if job else False
+
+    def cancel_owner(self, owner: str):
+        """Cancel every running job of a cog. Call from `cog_unload`."""
+        for job in self.running(owner=owner):
+            job.cancel()
+
+    def _on_done(self, task: asyncio.Task):
+        job = self._by_task.pop(task, None)
+        if not job:
+            return
+        self._running.pop(job.id, None)
+        job.finished = time.monotonic()
+        if not task.cancelled() and task.exception():
+            job.error = task.exception()
+            log.error(
+                f"Job {job.id} ({job.owner}: {job.name}) failed.", exc_info=job.error
+            )
+        self._finished.append(job)
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,86 @@
+import discord
+import logging
+
+from typing import Optional
+
+log = logging.getLogger("red.RSCBot.utilities.member_edit")
+
+
+class MemberEdit:
+    """Collects role and nickname changes for a member and applies them in one request.
+
+    Changes are applied in the order they are made, so removing and then adding
+    the same role leaves the member with that role.
+
+    Example:
+        edit = MemberEdit(member)
+        edit.remove_roles(franchise_role).add_roles(fa_role, tier_fa_role)
+        edit.set_nick("FA | Player")
+        await edit.apply()
+    """
+
+    def __init__(self, member: discord.Member):
+        self.member = member
+        self.roles = {role.id: role for role in member.roles if not role.is_default()}
+        self.nick = member.nick
+        self.nick_failed = False
+
+    def add_roles(self, *roles: Optional[discord.Role]) -> "MemberEdit":
+        for role in roles:
+            if role is not None:
+                self.roles[role.id] = role
+        return self
+
+    def remove_roles(self, *roles: Optional[discord.Role]) -> "MemberEdit":
+        for role in roles:
+            if role is not None:
+                self.roles.pop(role.id, None)
+        return self
+
+    def has_role(self, role: Optional[discord.Role]) -> bool:
+        return role is not None and role.id in self.roles
+
+    def set_nick(self, nick: Optional[str]) -> "MemberEdit":
+        self.nick = nick
+        return self
+
+    @property
+    def roles_changed(self) -> bool:
+        current = {role.id for role in self.member.roles if not role.is_default()}
+        return current != set(self.roles)
+
+    @property
+    def nick_changed(self) -> bool:
+        return self.nick != self.member.nick
+
+    @property
+    def changed(self) -> bool:
+        return self.roles_changed or self.nick_changed
+
+    async def apply(self, reason: Optional[str] = None) -> discord.Member:
+        """Apply all pending changes with a single `member.edit` call.
+
+        If the bot is not allowed to change the nickname (e.g. the guild owner),
+        the role changes are still applied and `nick_failed` is set.
+        """
+        kwargs = {}
+        if self.roles_changed:
+            kwargs["roles"] = list(self.roles.values())
+        if self.nick_changed:
+            kwargs["nick"] = self.nick
+        if not kwargs:
+            return self.member
+
+        try:
+            member = await self.member.edit(reason=reason, **kwargs)
+        except discord.Forbidden:
+            if "nick" not in kwargs:
+                raise
+            log.debug(f"Changing nickname forbidden for {self.member}")
+            self.nick_failed = True
+            del kwargs["nick"]
+            member = await self.member.edit(reason=reason, **kwargs) if kwargs else None
+
+        if member:
+            self.member = member
+        return self.member
@@ -0,0 +1,90 @@
+import discord
+import logging
+import re
+
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+log = logging.getLogger("red.RSCBot.utilities.member_index")
+
+MENTION_RE = re.compile(r"<@!?([0-9]{15,20})>$")
+
+
+def player_name(member: discord.Member) -> str:
+    """Display name without a team prefix ("FA | Name" -> "Name")"""
+    return member.display_name.split(" | ", 1)[-1].strip()
+
+
+class MemberResolution(NamedTuple):
+    found: List[discord.Member]
+    not_found: List[str]
+    ambiguous: Dict[str, List[discord.Member]]
+
+    def ambiguous_lines(self) -> List[str]:
+        """One line per ambiguous query listing the candidate members"""
+        return [
+            f"{query} ({', '.join(m.name for m in candidates)})"
+            for query, candidates in self.ambiguous.items()
+        ]
+
+
+class MemberIndex:
+    """Lookup table for resolving many user arguments against one guild.
+
+    Resolves the same forms as `commands.MemberConverter` (id, mention,
+    name#discriminator, username, nickname) plus the nickname without its
+    team prefix. The guild members are indexed once, so a whole user list
+    resolves in a single pass. Names are matched case-insensitively; a name
+    shared by more than one member is reported as ambiguous instead of
+    silently picking one of them.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.by_tag: Dict[str, List[discord.Member]] = {}
+        self.by_name: Dict[str, List[discord.Member]] = {}
+        self.by_display: Dict[str, List[discord.Member]] = {}
+        self.by_player_name: Dict[str, List[discord.Member]] = {}
+        for member in guild.members:
+            tag = f"{member.name}#{member.discriminator}".casefold()
+            self.by_tag.setdefault(tag, []).append(member)
+            self.by_name.setdefault(member.name.casefold(), []).append(member)
+            display = member.display_name.casefold()
+            self.by_display.setdefault(display, []).append(member)
+            name = player_name(member).casefold()
+            if name != display:
+                self.by_player_name.setdefault(name, []).append(member)
+
+    def candidates(self, query: str) -> List[discord.Member]:
+        """Members matching the query at the most specific level that matches"""
+        query = query.strip()
+        match = MENTION_RE.match(query)
+        if match or query.isdigit():
+            member = self.guild.get_member(int(match.group(1) if match else query))
+            return [member] if member else []
+
+        key = query.casefold()
+        for index in (self.by_tag, self.by_name, self.by_display):
+            members = index.get(key)
+            if members:
+                return members
+        # "Name" matches both "Name" and "FA | Name"
+        return self.by_player_name.get(key, [])
+
+    def resolve(self, query: str) -> Optional[discord.Member]:
+        members = self.candidates(query)
+        return members[0] if len(members) == 1 else None
+
+    def resolve_all(self, queries: Iterable[str]) -> MemberResolution:
+        """Resolve every query, returning unique members in input order"""
+        found: Dict[int, discord.Member] = {}
+        not_found = []
+        ambiguous = {}
+        for query in queries:
+            members = self.candidates(query)
+            if len(members) == 1:
+                found.setdefault(members[0].id, members[0])
+            elif members:
+                ambiguous[query] = members
+            else:
+                not_found.append(query)
+        return MemberResolution(list(found.values()), not_found, ambiguous)
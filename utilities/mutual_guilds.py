@@ -0,0 +1,52 @@
+import discord
+import logging
+
+from collections import OrderedDict
+from typing import List, Optional
+
+log = logging.getLogger("red.RSCBot.utilities.mutual_guilds")
+
+# Users whose mutual guilds are remembered at once
+mutual_guild_cache_size = 5000
+
+
+class MutualGuildCache:
+    """Per-user cache of the guilds a user shares with the bot.
+
+    Lookups use `guild.get_member` (a dictionary lookup) rather than scanning
+    `guild.members`. Entries hold guild ids and are re-checked on every read,
+    so a stale entry can only miss a guild the user joined since it was
+    cached. Cogs call `invalidate` from their `on_member_join`,
+    `on_member_remove` and guild join/remove listeners to avoid that.
+    """
+
+    def __init__(self, size: int = mutual_guild_cache_size):
+        self.size = size
+        self._guild_ids: OrderedDict[int, List[int]] = OrderedDict()
+
+    def guilds(self, bot: discord.Client, user_id: int) -> List[discord.Guild]:
+        guild_ids = self._guild_ids.get(user_id)
+        if guild_ids is None:
+            guild_ids = [g.id for g in bot.guilds if g.get_member(user_id)]
+            self._guild_ids[user_id] = guild_ids
+            if len(self._guild_ids) > self.size:
+                self._guild_ids.popitem(last=False)
+        else:
+            self._guild_ids.move_to_end(user_id)
+
+        guilds = []
+        for guild_id in guild_ids:
+            guild = bot.get_guild(guild_id)
+            if guild and guild.get_member(user_id):
+                guilds.append(guild)
+        return guilds
+
+    def invalidate(self, user_id: Optional[int] = None):
+        """Forget one user, or everyone when no user is given"""
+        if user_id is None:
+            self._guild_ids.clear()
+        else:
+            self._guild_ids.pop(user_id, None)
+
+
+mutual_guild_cache = MutualGuildCache()
@@ -0,0 +1,45 @@
+import discord
+import logging
+
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from .bulk import BulkRunner
+
+log = logging.getLogger("red.RSCBot.utilities.nicknames")
+
+
+class NicknameChange(NamedTuple):
+    member: discord.Member
+    nick: Optional[str]
+
+
+def plan_nicknames(
+    members: Iterable[discord.Member],
+    rename: Callable[[discord.Member], Optional[str]],
+) -> List[NicknameChange]:
+    """Target nicknames for every member whose nickname would actually change.
+
+    `rename` returns the new nickname for a member. Members whose nickname is
+    already the target (or who have no nickname and would be renamed to their
+    username) are left out, so applying the plan costs one request per real
+    change.
+    """
+    changes = []
+    for member in members:
+        nick = rename(member)
+        if nick == member.nick or (member.nick is None and nick == member.name):
+            continue
+        changes.append(NicknameChange(member, nick))
+    return changes
+
+
+async def apply_nicknames(
+    runner: BulkRunner, changes: List[NicknameChange]
+) -> Tuple[List[discord.Member], List[discord.Member]]:
+    """Apply planned nicknames concurrently, returning (updated, failed) members"""
+    results = await runner.run(
+        changes, lambda change: change.member.edit(nick=change.nick)
+    )
+    updated = [r.item.member for r in results if not r.error]
+    failed = [r.item.member for r in results if r.error]
+    return updated, failed